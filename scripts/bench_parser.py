@@ -0,0 +1,182 @@
+from __future__ import annotations
+
+import argparse
+import copy
+import json
+import sys
+import time
+from dataclasses import asdict
+from pathlib import Path
+from typing import Callable, Dict, List, Tuple
+
+import load_2025_questions as parser_module
+from load_2025_questions import ParsedLine, ParsedTable, extract_pdf_lines_and_tables, parse_extracted_questions
+
+
+BENCH_FUNCTIONS = (
+    "parse_question_block",
+    "collapse_wrapped_lines",
+    "split_box_list_segments",
+    "detect_inset_box_groups",
+    "render_rich_section_html",
+)
+FIXTURE_SUFFIX = ".fixture.json"
+GOLDEN_SUFFIX = ".golden.json"
+BASELINE_FILENAME = "baseline.json"
+
+
+def capture_fixture(pdf_path: Path, fixture_dir: Path) -> Path:
+    lines, tables = extract_pdf_lines_and_tables(pdf_path)
+    fixture_dir.mkdir(parents=True, exist_ok=True)
+    out_path = fixture_dir / f"{pdf_path.stem}{FIXTURE_SUFFIX}"
+    payload = {
+        "source": pdf_path.name,
+        "lines": [asdict(line) for line in lines],
+        "tables": [asdict(table) for table in tables],
+    }
+    out_path.write_text(json.dumps(payload, ensure_ascii=False), encoding="utf-8")
+    return out_path
+
+
+def load_fixture(path: Path) -> Tuple[List[ParsedLine], List[ParsedTable]]:
+    payload = json.loads(path.read_text(encoding="utf-8"))
+    lines = [ParsedLine(**item) for item in payload.get("lines", [])]
+    tables = [ParsedTable(**item) for item in payload.get("tables", [])]
+    return lines, tables
+
+
+def golden_path_for(fixture_path: Path) -> Path:
+    return fixture_path.with_name(fixture_path.name[: -len(FIXTURE_SUFFIX)] + GOLDEN_SUFFIX)
+
+
+def run_with_recorded_calls(
+    lines: List[ParsedLine],
+    tables: List[ParsedTable],
+) -> Tuple[Dict[str, dict], Dict[str, List[Tuple[tuple, dict]]]]:
+    recorded: Dict[str, List[Tuple[tuple, dict]]] = {name: [] for name in BENCH_FUNCTIONS}
+    originals: Dict[str, Callable] = {name: getattr(parser_module, name) for name in BENCH_FUNCTIONS}
+
+    def recorder(name: str, func: Callable) -> Callable:
+        def wrapped(*args, **kwargs):
+            recorded[name].append(copy.deepcopy((args, kwargs)))
+            return func(*args, **kwargs)
+
+        return wrapped
+
+    for name, func in originals.items():
+        setattr(parser_module, name, recorder(name, func))
+    try:
+        parsed = parse_extracted_questions(lines, tables)
+    finally:
+        for name, func in originals.items():
+            setattr(parser_module, name, func)
+
+    output = {str(number): parsed[number] for number in sorted(parsed)}
+    return output, recorded
+
+
+def time_calls(func: Callable, calls: List[Tuple[tuple, dict]], repeat: int) -> float:
+    best = float("inf")
+    for _ in range(max(1, repeat)):
+        started = time.perf_counter()
+        for args, kwargs in calls:
+            func(*args, **kwargs)
+        best = min(best, time.perf_counter() - started)
+    return best
+
+
+def diff_outputs(expected: Dict[str, dict], actual: Dict[str, dict]) -> List[str]:
+    problems: List[str] = []
+    for number in sorted(set(expected) | set(actual), key=int):
+        if number not in actual:
+            problems.append(f"{number}: missing from output")
+            continue
+        if number not in expected:
+            problems.append(f"{number}: not in golden")
+            continue
+        for field in ("stem", "options", "stem_html", "options_html"):
+            if expected[number].get(field) != actual[number].get(field):
+                problems.append(f"{number}: {field} differs")
+    return problems
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Run the question parser over cached PDF extraction fixtures, check golden output and throughput."
+    )
+    parser.add_argument("--fixtures-dir", default="data/parser_bench")
+    parser.add_argument("--capture", nargs="*", default=[], help="PDF files to extract into fixtures (needs pdfplumber)")
+    parser.add_argument("--update-golden", action="store_true", help="Rewrite golden outputs and throughput baseline")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--tolerance", type=float, default=0.25, help="Allowed throughput drop vs baseline (0.25 = 25%%)")
+    args = parser.parse_args()
+
+    fixtures_dir = Path(args.fixtures_dir)
+    for pdf in args.capture:
+        print(f"captured={capture_fixture(Path(pdf), fixtures_dir)}")
+
+    fixture_paths = sorted(fixtures_dir.glob(f"*{FIXTURE_SUFFIX}"))
+    if not fixture_paths:
+        print(f"No fixtures found under {fixtures_dir}; create them with --capture <pdf>.")
+        sys.exit(1)
+
+    failures: List[str] = []
+    all_calls: Dict[str, List[Tuple[tuple, dict]]] = {name: [] for name in BENCH_FUNCTIONS}
+    for fixture_path in fixture_paths:
+        lines, tables = load_fixture(fixture_path)
+        output, recorded = run_with_recorded_calls(lines, tables)
+        for name, calls in recorded.items():
+            all_calls[name].extend(calls)
+
+        golden_path = golden_path_for(fixture_path)
+        if args.update_golden:
+            golden_path.write_text(json.dumps(output, ensure_ascii=False, indent=1), encoding="utf-8")
+            print(f"golden={golden_path} questions={len(output)}")
+            continue
+        if not golden_path.exists():
+            failures.append(f"{fixture_path.name}: golden file missing")
+            continue
+        expected = json.loads(golden_path.read_text(encoding="utf-8"))
+        problems = diff_outputs(expected, output)
+        status = "ok" if not problems else "DIFF"
+        print(f"[{status}] {fixture_path.name}: {len(output)} questions")
+        for problem in problems[:20]:
+            print(f"  {problem}")
+        if problems:
+            failures.append(f"{fixture_path.name}: {len(problems)} output differences")
+
+    throughput: Dict[str, float] = {}
+    for name in BENCH_FUNCTIONS:
+        calls = all_calls[name]
+        if not calls:
+            continue
+        elapsed = time_calls(getattr(parser_module, name), calls, args.repeat)
+        throughput[name] = len(calls) / elapsed if elapsed > 0 else float("inf")
+
+    baseline_path = fixtures_dir / BASELINE_FILENAME
+    baseline: Dict[str, float] = {}
+    if args.update_golden:
+        baseline_path.write_text(json.dumps(throughput, indent=2), encoding="utf-8")
+    elif baseline_path.exists():
+        baseline = json.loads(baseline_path.read_text(encoding="utf-8"))
+
+    for name, calls_per_sec in throughput.items():
+        line = f"{name}: calls={len(all_calls[name])} throughput={calls_per_sec:,.0f}/s"
+        reference = float(baseline.get(name) or 0.0)
+        if reference > 0:
+            ratio = calls_per_sec / reference
+            line += f" baseline={reference:,.0f}/s ratio={ratio:.2f}"
+            if ratio < 1.0 - args.tolerance:
+                failures.append(f"{name}: throughput {ratio:.2f}x of baseline")
+        print(line)
+
+    if failures:
+        print("FAILED")
+        for failure in failures:
+            print(f"  {failure}")
+        sys.exit(1)
+    print("OK")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,153 @@
+from __future__ import annotations
+
+import argparse
+import random
+import sqlite3
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import List
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT / "webapp"))
+
+import server
+from load_2025_questions import ensure_schema
+from server import (
+    COL_NOTE_COMMENT,
+    COL_NOTE_IMPORTANCE,
+    COL_NOTE_SOURCE,
+    COL_NOTE_UPDATED,
+    COL_NOTE_USER,
+    COL_QNO,
+    COL_SUBJECT,
+    COL_YEAR,
+    IMPORTANCE_LEVELS,
+    NOTE_SOURCE_OX,
+    NOTE_SOURCE_QUESTION,
+    SUBJECTS,
+    TABLE_WRONG_NOTE,
+    WRONG_NOTE_MAX_PAGE_SIZE,
+    ensure_app_tables,
+    fetch_wrong_notes,
+)
+
+
+BENCH_USER = "bench-user"
+COMMENT_WORDS = (
+    "부가가치세", "면세", "과세표준", "세액공제", "납세의무자", "원천징수", "가산세", "경정청구",
+    "손해배상", "해제", "취소소송", "처분", "주주총회", "이사회", "감가상각", "충당부채",
+    "헷갈림", "다시", "암기", "판례", "조문", "예외", "기간", "요건",
+)
+DEFAULT_QUERIES = ("부가가치세", "경정청구 기간", "판례", "세액", "면세", "없는검색어")
+
+
+def make_comment(rng: random.Random) -> str:
+    return " ".join(rng.choice(COMMENT_WORDS) for _ in range(rng.randint(3, 12)))
+
+
+def seed_notes(conn: sqlite3.Connection, *, notes: int, other_users: int, seed: int) -> None:
+    rng = random.Random(seed)
+    users = [BENCH_USER] + [f"user-{index}" for index in range(other_users)]
+    rows = []
+    for user in users:
+        for index in range(notes):
+            source = NOTE_SOURCE_OX if index % 3 == 0 else NOTE_SOURCE_QUESTION
+            rows.append(
+                (
+                    user,
+                    source,
+                    2016 + index % 10,
+                    SUBJECTS[(index // 10) % len(SUBJECTS)],
+                    index // (10 * len(SUBJECTS)) + 1,
+                    rng.choice(IMPORTANCE_LEVELS),
+                    make_comment(rng),
+                    f"2025-{1 + index % 12:02d}-{1 + index % 28:02d} 12:00:{index % 60:02d}",
+                )
+            )
+    conn.executemany(
+        f"""
+        INSERT INTO "{TABLE_WRONG_NOTE}"
+        ("{COL_NOTE_USER}", "{COL_NOTE_SOURCE}", "{COL_YEAR}", "{COL_SUBJECT}", "{COL_QNO}", "{COL_NOTE_IMPORTANCE}", "{COL_NOTE_COMMENT}", "{COL_NOTE_UPDATED}")
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+        """,
+        rows,
+    )
+    conn.commit()
+
+
+def like_comment_filter(comment: str) -> tuple[str, object]:
+    return f'n."{COL_NOTE_COMMENT}" LIKE ?', f"%{comment}%"
+
+
+def fetch_with_like(comment: str) -> List[dict]:
+    """fetch_wrong_notes with the pre-index LIKE '%…%' comment filter, as the baseline."""
+    indexed_filter = server.wrong_note_comment_filter
+    server.wrong_note_comment_filter = like_comment_filter
+    try:
+        return fetch_wrong_notes(user_id=BENCH_USER, comment=comment, limit=WRONG_NOTE_MAX_PAGE_SIZE)["items"]
+    finally:
+        server.wrong_note_comment_filter = indexed_filter
+
+
+def best_of(func, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(max(1, repeat)):
+        started = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - started)
+    return best
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Benchmark wrong-note comment search (trigram index vs. LIKE) on a synthetic note table."
+    )
+    parser.add_argument("--notes", type=int, default=12000, help="벤치 사용자 1명의 오답노트 수")
+    parser.add_argument("--other-users", type=int, default=4, help="같은 수의 노트를 가진 다른 사용자 수")
+    parser.add_argument("--query", action="append", default=[], help="검색할 코멘트 (여러 번 지정 가능)")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    queries = args.query or list(DEFAULT_QUERIES)
+    failures: List[str] = []
+    with tempfile.TemporaryDirectory() as workdir:
+        db_path = Path(workdir) / "bench.db"
+        conn = sqlite3.connect(db_path)
+        try:
+            ensure_schema(conn)
+            ensure_app_tables(conn)
+            started = time.perf_counter()
+            seed_notes(conn, notes=max(1, args.notes), other_users=max(0, args.other_users), seed=args.seed)
+            print(f"seeded notes={args.notes * (1 + max(0, args.other_users))} seconds={time.perf_counter() - started:.2f}")
+        finally:
+            conn.close()
+        server.DB_PATH = db_path
+
+        for query in queries:
+            expected = fetch_with_like(query)
+            actual = fetch_wrong_notes(user_id=BENCH_USER, comment=query, limit=WRONG_NOTE_MAX_PAGE_SIZE)["items"]
+            if actual != expected:
+                failures.append(f"{query!r}: index returned {len(actual)} notes, LIKE returned {len(expected)}")
+            like_ms = best_of(lambda: fetch_with_like(query), args.repeat) * 1000
+            index_ms = best_of(
+                lambda: fetch_wrong_notes(user_id=BENCH_USER, comment=query, limit=WRONG_NOTE_MAX_PAGE_SIZE), args.repeat
+            ) * 1000
+            indexed = len(query) >= server.SEARCH_MIN_INDEXED_TERM
+            print(
+                f"query={query!r} hits={len(actual)} indexed={int(indexed)} "
+                f"like_ms={like_ms:.2f} index_ms={index_ms:.2f} speedup={like_ms / max(index_ms, 1e-6):.1f}x"
+            )
+
+    if failures:
+        print("FAILED")
+        for failure in failures:
+            print(f"  {failure}")
+        sys.exit(1)
+    print("OK")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,62 @@
+from __future__ import annotations
+
+import argparse
+import sqlite3
+import sys
+from pathlib import Path
+from typing import Optional
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT / "webapp"))
+
+from load_2025_questions import ensure_schema
+from question_text import answer_mask
+
+
+TABLE_QUESTIONS = "문제"
+COL_YEAR = "출제연도"
+COL_ANSWER = "답"
+COL_DISTRIBUTED = "답_배포"
+COL_ANSWER_MASK = "정답_비트"
+
+
+def rebuild_answer_masks(conn: sqlite3.Connection, year: Optional[int] = None) -> dict[str, int]:
+    ensure_schema(conn)
+    where_clause = f'WHERE "{COL_YEAR}" = ?' if year is not None else ""
+    params = (year,) if year is not None else ()
+    rows = conn.execute(
+        f'SELECT rowid, "{COL_ANSWER}", "{COL_DISTRIBUTED}", "{COL_ANSWER_MASK}" FROM "{TABLE_QUESTIONS}" {where_clause}',
+        params,
+    ).fetchall()
+    updates = []
+    missing = 0
+    for rowid, answer, distributed, stored in rows:
+        mask = answer_mask(answer, distributed)
+        if mask == 0:
+            missing += 1
+        if mask != stored:
+            updates.append((mask, rowid))
+    conn.executemany(f'UPDATE "{TABLE_QUESTIONS}" SET "{COL_ANSWER_MASK}" = ? WHERE rowid = ?', updates)
+    return {"questions": len(rows), "updated": len(updates), "missing": missing}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Store each question's answer key as a choice bitmask (bit 0 = ①) for server-side grading."
+    )
+    parser.add_argument("--db-path", default="data/questions.db")
+    parser.add_argument("--year", type=int, default=None, help="지정하면 해당 연도만 갱신")
+    args = parser.parse_args()
+
+    conn = sqlite3.connect(Path(args.db_path))
+    try:
+        with conn:
+            result = rebuild_answer_masks(conn, year=args.year)
+    finally:
+        conn.close()
+    for key, value in result.items():
+        print(f"{key}={value}")
+
+
+if __name__ == "__main__":
+    main()
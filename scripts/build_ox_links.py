@@ -0,0 +1,109 @@
+from __future__ import annotations
+
+import argparse
+import sqlite3
+import sys
+from pathlib import Path
+
+from build_ox_similarity import jaccard, shingle_set
+from import_ox_text import ensure_ox_table
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT / "webapp"))
+
+from ox_tables import TABLE_OX_LINK, ensure_ox_link_table, ox_question_subject_sql
+
+
+TABLE_QUESTIONS = "문제"
+TABLE_OX = "OX"
+COL_YEAR = "출제연도"
+COL_SUBJECT = "과목"
+COL_QNO = "문제번호"
+COL_SOURCE_QNO = "원문번호"
+COL_OPTION_NO = "보기번호"
+COL_STABLE_ID = "stable_id"
+COL_OX_QUESTION = "문제"
+COL_STEM = "문제지문"
+OPTION_COLUMNS = ("보기_1", "보기_2", "보기_3", "보기_4", "보기_5")
+
+# Below this 3-gram Jaccard the statement is treated as derived from the stem, not one option.
+MIN_OPTION_JACCARD = 0.3
+
+
+def best_option(statement: str, options: list[str]) -> tuple[int, float]:
+    shingles = shingle_set(statement)
+    best_no, best_score = 0, 0.0
+    for option_no, option in enumerate(options, start=1):
+        score = jaccard(shingles, shingle_set(option or ""))
+        if score > best_score:
+            best_no, best_score = option_no, score
+    if best_score < MIN_OPTION_JACCARD:
+        return 0, best_score
+    return best_no, best_score
+
+
+def rebuild_ox_links(conn: sqlite3.Connection, *, year: int | None = None) -> dict[str, int]:
+    """Link every OX row to the 문제 row its 원문번호 points at, plus the option it was rewritten from.
+
+    The 문제 row is looked up under ox_question_subject_sql(과목), so per-law OX subjects
+    (국세기본법, 소득세법, ...) resolve to their 세법학개론 question.
+    """
+    ensure_ox_table(conn)
+    ensure_ox_link_table(conn)
+    option_cols = ", ".join(f'q."{col}"' for col in OPTION_COLUMNS)
+    year_filter = f'AND ox."{COL_YEAR}" = ?' if year is not None else ""
+    params = (year,) if year is not None else ()
+    rows = conn.execute(
+        f"""
+        SELECT ox."{COL_YEAR}", ox."{COL_SUBJECT}", ox."{COL_STABLE_ID}", ox."{COL_OX_QUESTION}", q."{COL_QNO}", {option_cols}
+        FROM "{TABLE_OX}" ox
+        JOIN "{TABLE_QUESTIONS}" q
+          ON q."{COL_YEAR}" = ox."{COL_YEAR}"
+         AND q."{COL_SUBJECT}" = {ox_question_subject_sql(f'ox."{COL_SUBJECT}"')}
+         AND q."{COL_QNO}" = ox."{COL_SOURCE_QNO}"
+        WHERE ox."{COL_STABLE_ID}" <> '' {year_filter}
+        """,
+        params,
+    ).fetchall()
+
+    links: list[tuple[int, str, str, int, int, float]] = []
+    option_linked = 0
+    for ox_year, subject, stable_id, statement, qno, *options in rows:
+        option_no, score = best_option(statement or "", options)
+        option_linked += 1 if option_no else 0
+        links.append((int(ox_year), str(subject), str(stable_id), int(qno), option_no, round(score, 4)))
+
+    if year is None:
+        conn.execute(f'DELETE FROM "{TABLE_OX_LINK}"')
+    else:
+        conn.execute(f'DELETE FROM "{TABLE_OX_LINK}" WHERE "{COL_YEAR}" = ?', (year,))
+    conn.executemany(
+        f"""
+        INSERT INTO "{TABLE_OX_LINK}" ("{COL_YEAR}", "{COL_SUBJECT}", "{COL_STABLE_ID}", "{COL_QNO}", "{COL_OPTION_NO}", "score")
+        VALUES (?, ?, ?, ?, ?, ?)
+        """,
+        links,
+    )
+    total_sql = f'SELECT COUNT(*) FROM "{TABLE_OX}" ox WHERE ox."{COL_STABLE_ID}" <> \'\' {year_filter}'
+    total = int(conn.execute(total_sql, params).fetchone()[0])
+    return {"ox": total, "linked": len(links), "option_linked": option_linked, "unlinked": total - len(links)}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Build the OX → 문제 source link table (ox_source_link).")
+    parser.add_argument("--db-path", default="data/questions.db")
+    parser.add_argument("--year", type=int, default=None, help="기본값: 전체 연도")
+    args = parser.parse_args()
+
+    conn = sqlite3.connect(Path(args.db_path))
+    try:
+        with conn:
+            result = rebuild_ox_links(conn, year=args.year)
+    finally:
+        conn.close()
+    for key, value in result.items():
+        print(f"{key}={value}")
+
+
+if __name__ == "__main__":
+    main()
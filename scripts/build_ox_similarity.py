@@ -0,0 +1,226 @@
+from __future__ import annotations
+
+import argparse
+import random
+import sqlite3
+import sys
+import zlib
+from collections import defaultdict
+from dataclasses import dataclass
+from pathlib import Path
+
+from import_ox_text import canonicalize_question, ensure_ox_table
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT / "webapp"))
+
+from ox_tables import OX_SIMILAR_KIND_OPTION, OX_SIMILAR_KIND_OX, TABLE_OX_SIMILAR, ensure_ox_similar_table
+
+
+TABLE_QUESTIONS = "문제"
+TABLE_OX = "OX"
+COL_YEAR = "출제연도"
+COL_SUBJECT = "과목"
+COL_QNO = "문제번호"
+COL_OPTION_NO = "보기번호"
+COL_STABLE_ID = "stable_id"
+COL_OX_QUESTION = "문제"
+OPTION_COLUMNS = ("보기_1", "보기_2", "보기_3", "보기_4", "보기_5")
+
+SHINGLE_SIZE = 3
+# Shorter texts ("ㄱ, ㄴ", "옳다") are combinatorial choices, not statements worth de-duplicating.
+MIN_SHINGLES = 8
+NUM_BANDS = 16
+ROWS_PER_BAND = 4
+MIN_JACCARD = 0.5
+HASH_PRIME = (1 << 61) - 1
+HASH_SEED = 20250
+
+
+@dataclass
+class SimilarItem:
+    kind: str
+    year: int
+    subject: str
+    item_id: str
+    qno: int
+    option_no: int
+    shingles: frozenset
+
+
+def shingle_set(text: str, size: int = SHINGLE_SIZE) -> frozenset:
+    canonical = canonicalize_question(text)
+    if len(canonical) < size:
+        return frozenset()
+    return frozenset(canonical[i : i + size] for i in range(len(canonical) - size + 1))
+
+
+def make_permutations(count: int, seed: int = HASH_SEED) -> list[tuple[int, int]]:
+    rng = random.Random(seed)
+    return [(rng.randrange(1, HASH_PRIME), rng.randrange(0, HASH_PRIME)) for _ in range(count)]
+
+
+def minhash_signature(shingles: frozenset, permutations: list[tuple[int, int]]) -> tuple[int, ...]:
+    values = [zlib.crc32(shingle.encode("utf-8")) for shingle in shingles]
+    return tuple(min((a * x + b) % HASH_PRIME for x in values) for a, b in permutations)
+
+
+def jaccard(left: frozenset, right: frozenset) -> float:
+    if not left or not right:
+        return 0.0
+    return len(left & right) / len(left | right)
+
+
+def load_items(conn: sqlite3.Connection) -> list[SimilarItem]:
+    items: list[SimilarItem] = []
+    ox_rows = conn.execute(
+        f"""
+        SELECT "{COL_YEAR}", "{COL_SUBJECT}", "{COL_STABLE_ID}", "{COL_OX_QUESTION}"
+        FROM "{TABLE_OX}"
+        WHERE "{COL_STABLE_ID}" <> ''
+        ORDER BY "{COL_YEAR}", "{COL_SUBJECT}", "{COL_QNO}"
+        """
+    )
+    for year, subject, stable_id, question in ox_rows:
+        shingles = shingle_set(question or "")
+        if len(shingles) >= MIN_SHINGLES:
+            items.append(SimilarItem(OX_SIMILAR_KIND_OX, int(year), str(subject), str(stable_id), 0, 0, shingles))
+
+    option_cols = ", ".join(f'"{col}"' for col in OPTION_COLUMNS)
+    question_rows = conn.execute(
+        f"""
+        SELECT "{COL_YEAR}", "{COL_SUBJECT}", "{COL_QNO}", {option_cols}
+        FROM "{TABLE_QUESTIONS}"
+        ORDER BY "{COL_YEAR}", "{COL_SUBJECT}", "{COL_QNO}"
+        """
+    )
+    for year, subject, qno, *options in question_rows:
+        for option_no, option in enumerate(options, start=1):
+            shingles = shingle_set(option or "")
+            if len(shingles) >= MIN_SHINGLES:
+                items.append(
+                    SimilarItem(OX_SIMILAR_KIND_OPTION, int(year), str(subject), f"{int(qno)}-{option_no}", int(qno), option_no, shingles)
+                )
+    return items
+
+
+def find_clusters(
+    items: list[SimilarItem],
+    *,
+    bands: int = NUM_BANDS,
+    rows_per_band: int = ROWS_PER_BAND,
+    min_jaccard: float = MIN_JACCARD,
+) -> tuple[list[list[int]], int]:
+    """LSH over MinHash signatures: items sharing any band bucket become candidates,
+    candidates are confirmed by exact shingle Jaccard, confirmed pairs are merged with union-find."""
+    permutations = make_permutations(bands * rows_per_band)
+    buckets: dict[tuple[int, tuple[int, ...]], list[int]] = defaultdict(list)
+    for index, item in enumerate(items):
+        signature = minhash_signature(item.shingles, permutations)
+        for band in range(bands):
+            buckets[(band, signature[band * rows_per_band : (band + 1) * rows_per_band])].append(index)
+
+    parent = list(range(len(items)))
+
+    def find(index: int) -> int:
+        while parent[index] != index:
+            parent[index] = parent[parent[index]]
+            index = parent[index]
+        return index
+
+    checked: set[tuple[int, int]] = set()
+    for members in buckets.values():
+        if len(members) < 2:
+            continue
+        for pos, left in enumerate(members):
+            for right in members[pos + 1 :]:
+                pair = (left, right)
+                if pair in checked:
+                    continue
+                checked.add(pair)
+                # Options within one question are siblings, not duplicates of each other.
+                if items[left].kind == items[right].kind == OX_SIMILAR_KIND_OPTION and (
+                    items[left].year, items[left].subject, items[left].qno
+                ) == (items[right].year, items[right].subject, items[right].qno):
+                    continue
+                if jaccard(items[left].shingles, items[right].shingles) >= min_jaccard:
+                    root_left, root_right = find(left), find(right)
+                    if root_left != root_right:
+                        parent[max(root_left, root_right)] = min(root_left, root_right)
+
+    groups: dict[int, list[int]] = defaultdict(list)
+    for index in range(len(items)):
+        groups[find(index)].append(index)
+    clusters = [members for members in groups.values() if len(members) > 1]
+    clusters.sort(key=lambda members: members[0])
+    return clusters, len(checked)
+
+
+def rebuild_similarity(
+    conn: sqlite3.Connection,
+    *,
+    bands: int = NUM_BANDS,
+    rows_per_band: int = ROWS_PER_BAND,
+    min_jaccard: float = MIN_JACCARD,
+) -> dict[str, int]:
+    ensure_ox_table(conn)
+    ensure_ox_similar_table(conn)
+    items = load_items(conn)
+    clusters, candidates = find_clusters(items, bands=bands, rows_per_band=rows_per_band, min_jaccard=min_jaccard)
+
+    rows: list[tuple] = []
+    for cluster_id, members in enumerate(clusters, start=1):
+        anchor = next((index for index in members if items[index].kind == OX_SIMILAR_KIND_OX), members[0])
+        for index in members:
+            item = items[index]
+            similarity = 1.0 if index == anchor else jaccard(items[anchor].shingles, item.shingles)
+            rows.append(
+                (cluster_id, item.kind, item.year, item.subject, item.item_id, item.qno, item.option_no, round(similarity, 4))
+            )
+
+    conn.execute(f'DELETE FROM "{TABLE_OX_SIMILAR}"')
+    conn.executemany(
+        f"""
+        INSERT INTO "{TABLE_OX_SIMILAR}"
+        ("cluster_id", "kind", "{COL_YEAR}", "{COL_SUBJECT}", "item_id", "{COL_QNO}", "{COL_OPTION_NO}", "similarity")
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+        """,
+        rows,
+    )
+    ox_clusters = sum(1 for members in clusters if sum(items[index].kind == OX_SIMILAR_KIND_OX for index in members) > 1)
+    return {
+        "items": len(items),
+        "candidates": candidates,
+        "clusters": len(clusters),
+        "ox_clusters": ox_clusters,
+        "clustered_items": len(rows),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Cluster near-duplicate OX statements and 5-choice options (MinHash/LSH) into the ox_similar table."
+    )
+    parser.add_argument("--db-path", default="data/questions.db")
+    parser.add_argument("--bands", type=int, default=NUM_BANDS)
+    parser.add_argument("--rows-per-band", type=int, default=ROWS_PER_BAND)
+    parser.add_argument("--min-jaccard", type=float, default=MIN_JACCARD, help="후보 쌍을 같은 군으로 묶을 최소 3-gram Jaccard")
+    args = parser.parse_args()
+
+    conn = sqlite3.connect(Path(args.db_path))
+    try:
+        with conn:
+            result = rebuild_similarity(
+                conn,
+                bands=max(1, int(args.bands)),
+                rows_per_band=max(1, int(args.rows_per_band)),
+                min_jaccard=float(args.min_jaccard),
+            )
+    finally:
+        conn.close()
+    for key, value in result.items():
+        print(f"{key}={value}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,69 @@
+from __future__ import annotations
+
+import argparse
+import sqlite3
+import sys
+from pathlib import Path
+from typing import Optional
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT / "webapp"))
+
+from import_ox_text import ensure_ox_table
+from load_2025_questions import ensure_schema
+from question_text import NOTE_PREVIEW_CHARS, build_note_preview
+
+
+TABLE_QUESTIONS = "문제"
+TABLE_OX = "OX"
+COL_YEAR = "출제연도"
+COL_STEM = "문제지문"
+COL_OX_QUESTION = "문제"
+COL_PREVIEW = "미리보기"
+
+
+def refresh_table(conn: sqlite3.Connection, table: str, text_column: str, year: Optional[int]) -> int:
+    where_clause = f'WHERE "{COL_YEAR}" = ?' if year is not None else ""
+    params = (year,) if year is not None else ()
+    rows = conn.execute(
+        f'SELECT rowid, "{text_column}", "{COL_PREVIEW}" FROM "{table}" {where_clause}', params
+    ).fetchall()
+    # Only rewrite rows whose text changed, so a re-run after a partial ingest touches a handful of pages.
+    updates = []
+    for rowid, text, stored in rows:
+        preview = build_note_preview(text or "")
+        if preview != stored:
+            updates.append((preview, rowid))
+    conn.executemany(f'UPDATE "{table}" SET "{COL_PREVIEW}" = ? WHERE rowid = ?', updates)
+    return len(updates)
+
+
+def rebuild_previews(conn: sqlite3.Connection, year: Optional[int] = None) -> dict[str, int]:
+    ensure_schema(conn)
+    ensure_ox_table(conn)
+    return {
+        "questions": refresh_table(conn, TABLE_QUESTIONS, COL_STEM, year),
+        "ox": refresh_table(conn, TABLE_OX, COL_OX_QUESTION, year),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description=f"Store the wrong-note list preview (normalized stem, first {NOTE_PREVIEW_CHARS} chars) on 문제 and OX."
+    )
+    parser.add_argument("--db-path", default="data/questions.db")
+    parser.add_argument("--year", type=int, default=None, help="지정하면 해당 연도만 갱신")
+    args = parser.parse_args()
+
+    conn = sqlite3.connect(Path(args.db_path))
+    try:
+        with conn:
+            result = rebuild_previews(conn, year=args.year)
+    finally:
+        conn.close()
+    for key, value in result.items():
+        print(f"updated_{key}={value}")
+
+
+if __name__ == "__main__":
+    main()
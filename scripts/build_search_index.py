@@ -0,0 +1,98 @@
+from __future__ import annotations
+
+import argparse
+import sqlite3
+from pathlib import Path
+
+from import_ox_text import ensure_ox_table
+
+
+TABLE_SEARCH = "search_index"
+TABLE_QUESTIONS = "문제"
+TABLE_OX = "OX"
+COL_YEAR = "출제연도"
+COL_SUBJECT = "과목"
+COL_QNO = "문제번호"
+COL_STEM = "문제지문"
+COL_EXPLANATION = "해설"
+COL_OX_QUESTION = "문제"
+COL_STABLE_ID = "stable_id"
+OPTION_COLUMNS = ("보기_1", "보기_2", "보기_3", "보기_4", "보기_5")
+
+# Column weights for stem, options, explanation; stored as the table's rank function so
+# "ORDER BY rank" stays inside FTS5 and snippet() only runs for the returned page.
+RANK_FUNCTION = "bm25(3.0, 2.0, 1.0)"
+
+SOURCE_QUESTION = "question"
+SOURCE_OX = "ox"
+
+
+def ensure_search_table(conn: sqlite3.Connection) -> None:
+    # Trigram tokens work for Korean without a morphological analyzer; unicode61 would
+    # index whole eojeol such as "면세를" and miss "면세".
+    conn.execute(
+        f"""
+        CREATE VIRTUAL TABLE IF NOT EXISTS "{TABLE_SEARCH}" USING fts5(
+            "stem",
+            "options",
+            "explanation",
+            "source" UNINDEXED,
+            "year" UNINDEXED,
+            "subject" UNINDEXED,
+            "qno" UNINDEXED,
+            "stable_id" UNINDEXED,
+            tokenize = 'trigram'
+        )
+        """
+    )
+    conn.execute(
+        f'INSERT INTO "{TABLE_SEARCH}" ("{TABLE_SEARCH}", "rank") VALUES (\'rank\', ?)', (RANK_FUNCTION,)
+    )
+
+
+def rebuild_search_index(conn: sqlite3.Connection) -> dict[str, int]:
+    ensure_ox_table(conn)
+    ensure_search_table(conn)
+    conn.execute(f'DELETE FROM "{TABLE_SEARCH}"')
+    options_sql = " || char(10) || ".join(f'COALESCE("{col}", \'\')' for col in OPTION_COLUMNS)
+    questions = conn.execute(
+        f"""
+        INSERT INTO "{TABLE_SEARCH}" ("stem", "options", "explanation", "source", "year", "subject", "qno", "stable_id")
+        SELECT
+            COALESCE("{COL_STEM}", ''), {options_sql}, COALESCE("{COL_EXPLANATION}", ''),
+            '{SOURCE_QUESTION}', "{COL_YEAR}", "{COL_SUBJECT}", "{COL_QNO}", ''
+        FROM "{TABLE_QUESTIONS}"
+        ORDER BY "{COL_YEAR}", "{COL_SUBJECT}", "{COL_QNO}"
+        """
+    ).rowcount
+    ox = conn.execute(
+        f"""
+        INSERT INTO "{TABLE_SEARCH}" ("stem", "options", "explanation", "source", "year", "subject", "qno", "stable_id")
+        SELECT
+            COALESCE("{COL_OX_QUESTION}", ''), '', COALESCE("{COL_EXPLANATION}", ''),
+            '{SOURCE_OX}', "{COL_YEAR}", "{COL_SUBJECT}", "{COL_QNO}", "{COL_STABLE_ID}"
+        FROM "{TABLE_OX}"
+        ORDER BY "{COL_YEAR}", "{COL_SUBJECT}", "{COL_QNO}"
+        """
+    ).rowcount
+    conn.execute(f"INSERT INTO \"{TABLE_SEARCH}\" (\"{TABLE_SEARCH}\") VALUES ('optimize')")
+    return {"questions": int(questions), "ox": int(ox)}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Rebuild the FTS5 trigram search index over 문제 and OX.")
+    parser.add_argument("--db-path", default="data/questions.db")
+    args = parser.parse_args()
+
+    conn = sqlite3.connect(Path(args.db_path))
+    try:
+        with conn:
+            result = rebuild_search_index(conn)
+    finally:
+        conn.close()
+    for key, value in result.items():
+        print(f"{key}={value}")
+
+
+if __name__ == "__main__":
+    main()
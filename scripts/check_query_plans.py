@@ -0,0 +1,333 @@
+from __future__ import annotations
+
+import argparse
+import random
+import sqlite3
+import sys
+import tempfile
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Callable, List, Tuple
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT / "webapp"))
+
+import server
+from build_ox_links import rebuild_ox_links
+from build_ox_similarity import rebuild_similarity
+from build_previews import rebuild_previews
+from build_search_index import rebuild_search_index
+from import_ox_text import build_stable_id, ensure_ox_table
+from load_2025_questions import ensure_schema
+
+
+WORDS = (
+    "부가가치세", "면세", "과세표준", "세액공제", "납세의무자", "원천징수", "가산세", "경정청구",
+    "손해배상", "해제", "취소소송", "처분", "주주총회", "이사회", "감가상각", "충당부채",
+)
+YEARS = (2023, 2024, 2025)
+QUESTIONS_PER_SUBJECT = 40
+OX_PER_QUESTION = 4
+NOTES_PER_USER = 400
+USERS = ("guest", "user-a", "user-b")
+
+
+@dataclass
+class PlanCheck:
+    label: str
+    run: Callable[[], object]
+    # Tables this query is allowed to read in full, e.g. the FTS table when every term is too short for trigrams.
+    allow_scan: Tuple[str, ...] = ()
+    # Set when the sorted set is bounded by the query itself (one similarity cluster), not by table size.
+    allow_sort: bool = False
+    statements: List[str] = field(default_factory=list)
+
+
+def sentence(rng: random.Random, words: int) -> str:
+    return " ".join(rng.choice(WORDS) for _ in range(words))
+
+
+def seed_database(db_path: Path, seed: int) -> str:
+    rng = random.Random(seed)
+    conn = sqlite3.connect(db_path)
+    try:
+        ensure_schema(conn)
+        ensure_ox_table(conn)
+        server.ensure_app_tables(conn)
+        question_rows = []
+        ox_rows = []
+        for year in YEARS:
+            for subject in server.SUBJECTS:
+                for qno in range(1, QUESTIONS_PER_SUBJECT + 1):
+                    options = [sentence(rng, 8) for _ in range(5)]
+                    question_rows.append((year, subject, qno, sentence(rng, 20), *options, "①", sentence(rng, 30)))
+                    for offset in range(OX_PER_QUESTION):
+                        ox_no = (qno - 1) * OX_PER_QUESTION + offset + 1
+                        text = options[offset] if offset < 2 else sentence(rng, 10)
+                        ox_rows.append((year, subject, ox_no, qno, build_stable_id(ox_no, text), text, "O", sentence(rng, 15)))
+        conn.executemany(
+            """
+            INSERT INTO 문제 (출제연도, 과목, 문제번호, 문제지문, 보기_1, 보기_2, 보기_3, 보기_4, 보기_5, 답, 해설)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+            """,
+            question_rows,
+        )
+        conn.executemany(
+            """
+            INSERT INTO OX (출제연도, 과목, 문제번호, 원문번호, stable_id, 문제, 답, 해설)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+            """,
+            ox_rows,
+        )
+        note_rows = []
+        for user in USERS:
+            for index in range(NOTES_PER_USER):
+                note_rows.append(
+                    (
+                        user,
+                        server.NOTE_SOURCE_OX if index % 2 else server.NOTE_SOURCE_QUESTION,
+                        YEARS[index % len(YEARS)],
+                        server.SUBJECTS[index % len(server.SUBJECTS)],
+                        index // (len(YEARS) * len(server.SUBJECTS)) + 1,
+                        rng.choice(server.IMPORTANCE_LEVELS),
+                        sentence(rng, 4),
+                        f"2025-01-{1 + index % 28:02d} 09:{index % 60:02d}:00",
+                    )
+                )
+        conn.executemany(
+            """
+            INSERT OR IGNORE INTO 오답노트 (user_id, source, 출제연도, 과목, 문제번호, 중요도, 코멘트, 수정일시)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+            """,
+            note_rows,
+        )
+        for index in range(30):
+            created = f"2025-02-{1 + index % 28:02d} 10:00:00"
+            conn.execute(
+                "INSERT INTO 공지게시판 (title, body, author, is_published, created_at, updated_at) VALUES (?, ?, ?, ?, ?, ?)",
+                (f"공지 {index}", sentence(rng, 10), "관리자", index % 3 != 0, created, created),
+            )
+            post_id = conn.execute(
+                """
+                INSERT INTO qa_posts (nickname, title, body, subject, exam_year, question_no, created_at, updated_at)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+                """,
+                ("익명", f"질문 {index}", sentence(rng, 10), server.SUBJECTS[0], 2025, index + 1, created, created),
+            ).lastrowid
+            conn.executemany(
+                "INSERT INTO qa_answers (post_id, nickname, body, created_at, updated_at) VALUES (?, ?, ?, ?, ?)",
+                [(post_id, "답변자", sentence(rng, 6), created, created) for _ in range(3)],
+            )
+        rebuild_similarity(conn)
+        rebuild_ox_links(conn)
+        rebuild_search_index(conn)
+        rebuild_previews(conn)
+        conn.commit()
+        stable_id = conn.execute("SELECT item_id FROM ox_similar WHERE kind = 'ox' LIMIT 1").fetchone()
+        if stable_id is None:
+            stable_id = conn.execute("SELECT stable_id FROM OX LIMIT 1").fetchone()
+        return str(stable_id[0])
+    finally:
+        conn.close()
+
+
+def build_checks(stable_id: str) -> List[PlanCheck]:
+    year, subject = YEARS[-1], server.SUBJECTS[0]
+    return [
+        PlanCheck("fetch_questions", lambda: server.fetch_questions(year, subject)),
+        PlanCheck("fetch_ox_questions", lambda: server.fetch_ox_questions(year, subject)),
+        PlanCheck("fetch_ox_with_source", lambda: server.fetch_ox_with_source(year, subject, stable_id)),
+        PlanCheck("fetch_ox_similar", lambda: server.fetch_ox_similar(stable_id), allow_sort=True),
+        PlanCheck(
+            "fetch_ox_similar(year,subject)",
+            lambda: server.fetch_ox_similar(stable_id, year=year, subject=subject),
+            allow_sort=True,
+        ),
+        PlanCheck("search_content", lambda: server.search_content("부가가치세 면세")),
+        PlanCheck(
+            "search_content(filters)",
+            lambda: server.search_content("과세표준", subject=subject, year=year, source=server.NOTE_SOURCE_OX, page=2),
+        ),
+        PlanCheck(
+            "search_content(short)",
+            lambda: server.search_content("세 면"),
+            allow_scan=(server.TABLE_SEARCH,),
+            allow_sort=True,
+        ),
+        PlanCheck("fetch_notices", lambda: server.fetch_notices()),
+        PlanCheck("fetch_notices(all)", lambda: server.fetch_notices(include_unpublished=True)),
+        PlanCheck("fetch_qa_posts", lambda: server.fetch_qa_posts()),
+        PlanCheck("fetch_wrong_note_map", lambda: server.fetch_wrong_note_map(year, subject, "user-a")),
+        PlanCheck(
+            "fetch_wrong_note_maps",
+            lambda: server.fetch_wrong_note_maps(
+                "user-a", years=list(YEARS), subjects=list(server.SUBJECTS[:4]), sources=[server.NOTE_SOURCE_OX]
+            ),
+        ),
+        PlanCheck("fetch_wrong_note_maps(all)", lambda: server.fetch_wrong_note_maps("user-a", years=[], subjects=[], sources=[])),
+        PlanCheck("fetch_wrong_notes", lambda: server.fetch_wrong_notes(user_id="user-a")),
+        PlanCheck(
+            "fetch_wrong_notes(filters)",
+            lambda: server.fetch_wrong_notes(
+                user_id="user-a", source=server.NOTE_SOURCE_OX, subject=subject, importance=server.IMPORTANCE_LEVELS[0]
+            ),
+        ),
+        PlanCheck(
+            "fetch_wrong_notes(after)",
+            lambda: server.fetch_wrong_notes(user_id="user-a", limit=20, after=("2025-01-15 09:00:00", 10**9)),
+        ),
+        PlanCheck(
+            "fetch_wrong_notes(subject, after)",
+            lambda: server.fetch_wrong_notes(user_id="user-a", subject=subject, limit=20, after=("2025-01-15 09:00:00", 10**9)),
+        ),
+        PlanCheck("fetch_wrong_notes(comment)", lambda: server.fetch_wrong_notes(user_id="user-a", comment="부가가치")),
+        PlanCheck("fetch_wrong_notes(short comment)", lambda: server.fetch_wrong_notes(user_id="user-a", comment="면세")),
+        PlanCheck("fetch_wrong_note_bundle", lambda: server.fetch_wrong_note_bundle("user-a", subjects=[], importances=[], sources=[])),
+        PlanCheck(
+            "fetch_wrong_note_bundle(filters)",
+            lambda: server.fetch_wrong_note_bundle(
+                "user-a",
+                subjects=list(server.SUBJECTS[:3]),
+                importances=list(server.IMPORTANCE_LEVELS[:2]),
+                sources=[server.NOTE_SOURCE_QUESTION],
+                limit=30,
+            ),
+        ),
+        PlanCheck(
+            "fetch_wrong_note_bundle(after)",
+            lambda: server.fetch_wrong_note_bundle(
+                "user-a", subjects=[], importances=[], sources=[], limit=30, after=(server.NOTE_SOURCE_QUESTION, 2024, subject, 10)
+            ),
+        ),
+        PlanCheck("fetch_wrong_note_stats", lambda: server.fetch_wrong_note_stats("user-a")),
+        PlanCheck("fetch_review_queue", lambda: server.fetch_review_queue("user-a", limit=30)),
+        PlanCheck("record_review", lambda: server.record_review(user_id="user-a", note_id=5, grade=4)),
+        PlanCheck(
+            "grade_exam_submission",
+            lambda: server.grade_exam_submission(
+                user_id="user-a", year=year, subject=subject, answers={qno: qno % 5 + 1 for qno in range(1, 41)}
+            ),
+        ),
+        PlanCheck(
+            "record_ox_answers",
+            lambda: server.record_ox_answers(
+                user_id="user-a", year=year, subject=subject, answers=[{"question_no": qno, "choice": "O"} for qno in range(1, 21)]
+            ),
+        ),
+        PlanCheck("fetch_exam_attempts", lambda: server.fetch_exam_attempts("user-a", year=year, subject=subject)),
+        PlanCheck("fetch_wrong_note_seq", lambda: server.fetch_wrong_note_seq("user-a")),
+        PlanCheck("fetch_wrong_note_changes", lambda: server.fetch_wrong_note_changes("user-a", since=100, limit=50)),
+        PlanCheck(
+            "merge_wrong_notes",
+            lambda: server.merge_wrong_notes(
+                user_id="user-b",
+                notes=[
+                    {
+                        "source": server.NOTE_SOURCE_QUESTION,
+                        "year": year,
+                        "subject": subject,
+                        "question_no": qno,
+                        "importance": server.IMPORTANCE_LEVELS[qno % len(server.IMPORTANCE_LEVELS)],
+                        "updated_at": "2025-03-01T09:00:00",
+                    }
+                    for qno in range(1, 30)
+                ]
+                + [{"source": server.NOTE_SOURCE_OX, "year": year, "subject": subject, "stable_id": stable_id, "updated_at": "2025-03-01"}],
+            ),
+        ),
+    ]
+
+
+def capture_statements(check: PlanCheck) -> None:
+    """Run check.run() with every connection it opens tracing its SQL (parameters already bound)."""
+    original_connect = sqlite3.connect
+
+    def traced_connect(*args, **kwargs):
+        conn = original_connect(*args, **kwargs)
+        conn.set_trace_callback(check.statements.append)
+        return conn
+
+    sqlite3.connect = traced_connect
+    try:
+        check.run()
+    finally:
+        sqlite3.connect = original_connect
+
+
+def plan_problems(conn: sqlite3.Connection, sql: str, check: PlanCheck) -> Tuple[List[str], List[str]]:
+    plan = [str(row[3]) for row in conn.execute(f"EXPLAIN QUERY PLAN {sql}")]
+    problems: List[str] = []
+    for detail in plan:
+        if "USE TEMP B-TREE" in detail:
+            if not check.allow_sort:
+                problems.append(detail)
+            continue
+        if not detail.startswith("SCAN ") or detail == "SCAN CONSTANT ROW":
+            continue
+        if detail.split()[1] in check.allow_scan:
+            continue
+        # A materialized subquery is as large as its own plan lets it be; those lines are checked too.
+        if detail.split()[1].startswith("(subquery-"):
+            continue
+        # An index walked in ORDER BY order is fine; a bare table scan or an FTS scan with no MATCH is not.
+        if "VIRTUAL TABLE INDEX" in detail:
+            if not detail.endswith("VIRTUAL TABLE INDEX 0:"):
+                continue
+        elif " USING " in detail:
+            continue
+        problems.append(detail)
+    return plan, problems
+
+
+def is_checked_statement(sql: str) -> bool:
+    head = sql.lstrip().upper()
+    # FTS5 reads its own shadow tables with 'main'.'<table>_config'-style SQL; those are not ours to index.
+    return head.startswith("SELECT") and "SQLITE_MASTER" not in head and "'MAIN'." not in head
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="EXPLAIN QUERY PLAN guard: fail if a webapp/server.py read query scans a table or sorts with a temp B-tree."
+    )
+    parser.add_argument("--seed", type=int, default=11)
+    parser.add_argument("--verbose", action="store_true", help="모든 쿼리의 실행 계획 출력")
+    args = parser.parse_args()
+
+    failures: List[str] = []
+    with tempfile.TemporaryDirectory() as workdir:
+        db_path = Path(workdir) / "plans.db"
+        stable_id = seed_database(db_path, args.seed)
+        server.DB_PATH = db_path
+        checks = build_checks(stable_id)
+        conn = sqlite3.connect(db_path)
+        try:
+            for check in checks:
+                capture_statements(check)
+                statements = [sql for sql in check.statements if is_checked_statement(sql)]
+                if not statements:
+                    failures.append(f"{check.label}: no SELECT captured")
+                    continue
+                check_problems: List[str] = []
+                for sql in statements:
+                    plan, problems = plan_problems(conn, sql, check)
+                    check_problems.extend(problems)
+                    if args.verbose or problems:
+                        print(f"  -- {' '.join(sql.split())[:160]}")
+                        for detail in plan:
+                            print(f"     {detail}")
+                status = "ok" if not check_problems else "PLAN"
+                print(f"[{status}] {check.label}: statements={len(statements)}")
+                failures.extend(f"{check.label}: {problem}" for problem in check_problems)
+        finally:
+            conn.close()
+
+    if failures:
+        print("FAILED")
+        for failure in failures:
+            print(f"  {failure}")
+        sys.exit(1)
+    print("OK")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,51 @@
+from __future__ import annotations
+
+import argparse
+import sqlite3
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT / "webapp"))
+
+import server
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Recount 오답노트_stats from 오답노트, report buckets whose trigger-maintained count drifted, and fix them."
+    )
+    parser.add_argument("--db-path", default="data/questions.db")
+    parser.add_argument("--check-only", action="store_true", help="카운터를 고치지 않고 차이만 보고 (차이가 있으면 종료코드 1)")
+    args = parser.parse_args()
+
+    conn = sqlite3.connect(Path(args.db_path))
+    try:
+        server.ensure_app_tables(conn)
+        conn.execute("BEGIN IMMEDIATE")
+        drift = server.rebuild_wrong_note_stats(conn)
+        if args.check_only:
+            conn.rollback()
+        else:
+            conn.commit()
+        buckets, notes = conn.execute(
+            f'SELECT COUNT(*), COALESCE(SUM("{server.COL_STATS_COUNT}"), 0) FROM "{server.TABLE_WRONG_NOTE_STATS}"'
+        ).fetchone()
+    finally:
+        conn.close()
+
+    for item in drift:
+        print(
+            f"drift user_id={item['user_id']} source={item['source']} subject={item['subject']} "
+            f"importance={item['importance'] or '-'} stored={item['stored']} actual={item['actual']}"
+        )
+    print(f"buckets={buckets}")
+    print(f"notes={notes}")
+    print(f"drifted={len(drift)}")
+    if drift and args.check_only:
+        sys.exit(1)
+    print("OK" if not drift else "REBUILT")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,14 +1,188 @@
 from __future__ import annotations
 
+import json
+import os
 from pathlib import Path
 
 
 PROBLEM_DIRNAMES = ("문제", "원본문제")
 SOLUTION_DIRNAME = "풀이"
 OX_DIRNAME = "OX문제"
+INDEX_CACHE_VERSION = 1
+
+
+class DataRootIndex:
+    """One scan of the data root, answering directory lookups from memory.
+
+    Directories are keyed by their POSIX path relative to the root. A persisted
+    index is reused for every directory whose mtime is unchanged, so only edited
+    folders are listed again.
+    """
+
+    def __init__(self, root: Path) -> None:
+        self.root = Path(os.path.abspath(root))
+        self.entries: dict[str, dict[str, bool]] = {}
+        self.folded: dict[str, dict[str, str]] = {}
+        self.mtimes: dict[str, int] = {}
+        self.listed = 0
+
+    @classmethod
+    def scan(cls, root: Path) -> "DataRootIndex":
+        index = cls(root)
+        index._walk("")
+        return index
+
+    @classmethod
+    def load(cls, root: Path, cache_path: Path) -> "DataRootIndex":
+        index = cls(root)
+        try:
+            payload = json.loads(cache_path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            payload = {}
+        if payload.get("version") != INDEX_CACHE_VERSION or payload.get("root") != str(index.root):
+            index._walk("")
+            return index
+
+        stale: list[str] = []
+        for key, item in payload.get("dirs", {}).items():
+            try:
+                mtime = os.stat(index._abspath(key)).st_mtime_ns
+            except OSError:
+                continue
+            if mtime != item.get("mtime"):
+                stale.append(key)
+                continue
+            index._store(key, mtime, {name: bool(is_dir) for name, is_dir in item.get("entries", [])})
+        if "" not in index.entries and "" not in stale:
+            stale.append("")
+        refreshed: set[str] = set()
+        for key in sorted(stale):
+            if key not in refreshed:
+                refreshed.update(index._walk(key))
+        return index
+
+    def save(self, cache_path: Path) -> None:
+        payload = {
+            "version": INDEX_CACHE_VERSION,
+            "root": str(self.root),
+            "dirs": {
+                key: {"mtime": self.mtimes[key], "entries": sorted(self.entries[key].items())}
+                for key in sorted(self.entries)
+            },
+        }
+        cache_path.parent.mkdir(parents=True, exist_ok=True)
+        cache_path.write_text(json.dumps(payload, ensure_ascii=False), encoding="utf-8")
+
+    def _abspath(self, key: str) -> str:
+        return os.path.join(str(self.root), *key.split("/")) if key else str(self.root)
+
+    def _store(self, key: str, mtime: int, entries: dict[str, bool]) -> None:
+        folded: dict[str, str] = {}
+        for name in sorted(entries):
+            folded.setdefault(name.casefold(), name)
+        self.entries[key] = entries
+        self.folded[key] = folded
+        self.mtimes[key] = mtime
+
+    def _walk(self, start: str) -> list[str]:
+        walked: list[str] = []
+        for dirpath, dirnames, filenames in os.walk(self._abspath(start)):
+            rel = os.path.relpath(dirpath, str(self.root))
+            key = "" if rel == "." else Path(rel).as_posix()
+            entries = {name: True for name in dirnames}
+            entries.update({name: False for name in filenames})
+            try:
+                mtime = os.stat(dirpath).st_mtime_ns
+            except OSError:
+                mtime = 0
+            self._store(key, mtime, entries)
+            self.listed += 1
+            walked.append(key)
+            # Subfolders still fresh from the cache keep their stored listing.
+            dirnames[:] = [name for name in dirnames if (f"{key}/{name}" if key else name) not in self.entries]
+        return walked
+
+    def key_for(self, path: Path) -> str | None:
+        rel = os.path.relpath(os.path.abspath(path), str(self.root))
+        if rel == ".":
+            return ""
+        if rel == os.pardir or rel.startswith(os.pardir + os.sep):
+            return None
+        return Path(rel).as_posix()
+
+    def covers(self, path: Path) -> bool:
+        return self.key_for(path) is not None
+
+    def is_dir(self, path: Path) -> bool:
+        return self.key_for(path) in self.entries
+
+    def lookup(self, base_dir: Path, filename: str) -> Path | None:
+        key = self.key_for(base_dir)
+        if key not in self.entries:
+            return None
+        if filename in self.entries[key]:
+            return base_dir / filename
+        name = self.folded[key].get(filename.casefold())
+        return base_dir / name if name is not None else None
+
+    def list_entries(self, base_dir: Path, *, dirs: bool) -> list[Path]:
+        key = self.key_for(base_dir)
+        if key not in self.entries:
+            return []
+        return sorted(base_dir / name for name, is_dir in self.entries[key].items() if is_dir == dirs)
+
+
+_INDEX: DataRootIndex | None = None
+
+
+def use_data_root_index(data_root: Path, *, cache_path: Path | None = None) -> DataRootIndex:
+    """Index data_root once; later lookups under it skip the filesystem."""
+    global _INDEX
+    if cache_path is not None:
+        _INDEX = DataRootIndex.load(data_root, cache_path)
+        _INDEX.save(cache_path)
+    else:
+        _INDEX = DataRootIndex.scan(data_root)
+    return _INDEX
+
+
+def active_index(path: Path) -> DataRootIndex | None:
+    if _INDEX is not None and _INDEX.covers(path):
+        return _INDEX
+    return None
+
+
+def is_data_dir(path: Path) -> bool:
+    index = active_index(path)
+    if index is not None:
+        return index.is_dir(path)
+    return path.is_dir()
+
+
+def list_dir_files(base_dir: Path) -> list[Path]:
+    index = active_index(base_dir)
+    if index is not None:
+        return index.list_entries(base_dir, dirs=False)
+    if not base_dir.is_dir():
+        return []
+    return sorted(path for path in base_dir.iterdir() if path.is_file())
+
+
+def list_year_dirs(data_root: Path) -> list[Path]:
+    index = active_index(data_root)
+    if index is not None:
+        subdirs = index.list_entries(data_root, dirs=True)
+    elif data_root.is_dir():
+        subdirs = [path for path in data_root.iterdir() if path.is_dir()]
+    else:
+        subdirs = []
+    return sorted(path for path in subdirs if path.name.isdigit())
 
 
 def resolve_case_insensitive(base_dir: Path, filename: str) -> Path | None:
+    index = active_index(base_dir)
+    if index is not None:
+        return index.lookup(base_dir, filename)
     candidate = base_dir / filename
     if candidate.exists():
         return candidate
@@ -25,7 +199,7 @@ def year_problem_dirs(year_dir: Path) -> list[Path]:
     dirs: list[Path] = []
     for dirname in PROBLEM_DIRNAMES:
         problem_dir = year_dir / dirname
-        if problem_dir.is_dir():
+        if is_data_dir(problem_dir):
             dirs.append(problem_dir)
     dirs.append(year_dir)
     return dirs
@@ -34,7 +208,7 @@ def year_problem_dirs(year_dir: Path) -> list[Path]:
 def year_solution_dirs(year_dir: Path) -> list[Path]:
     dirs: list[Path] = []
     solution_dir = year_dir / SOLUTION_DIRNAME
-    if solution_dir.is_dir():
+    if is_data_dir(solution_dir):
         dirs.append(solution_dir)
     dirs.append(year_dir)
     return dirs
@@ -43,10 +217,10 @@ def year_solution_dirs(year_dir: Path) -> list[Path]:
 def year_ox_dirs(year_dir: Path) -> list[Path]:
     dirs: list[Path] = []
     shared_ox_dir = year_dir.parent / OX_DIRNAME
-    if shared_ox_dir.is_dir():
+    if is_data_dir(shared_ox_dir):
         dirs.append(shared_ox_dir)
     ox_dir = year_dir / OX_DIRNAME
-    if ox_dir.is_dir():
+    if is_data_dir(ox_dir):
         dirs.append(ox_dir)
     dirs.append(year_dir)
     return dirs
@@ -84,9 +258,14 @@ def find_year_file(year_dir: Path, filename: str, *, kind: str) -> Path:
 def list_year_pdfs(year_dir: Path) -> list[Path]:
     files: list[Path] = []
     seen: set[Path] = set()
+    index = active_index(year_dir)
     for base in year_problem_dirs(year_dir):
-        for path in sorted(base.glob("*.pdf")):
-            resolved = path.resolve()
+        if index is not None:
+            pdfs = [path for path in index.list_entries(base, dirs=False) if path.suffix == ".pdf" and not path.name.startswith(".")]
+        else:
+            pdfs = sorted(base.glob("*.pdf"))
+        for path in pdfs:
+            resolved = Path(os.path.abspath(path)) if index is not None else path.resolve()
             if resolved in seen:
                 continue
             seen.add(resolved)
@@ -0,0 +1,298 @@
+from __future__ import annotations
+
+import argparse
+import hashlib
+import json
+import re
+import sqlite3
+import subprocess
+import sys
+from dataclasses import asdict, dataclass
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Iterator, List
+
+
+# (SQLite table, ASCII slug used in chunk filenames)
+DUMP_TABLES = (
+    ("문제", "questions"),
+    ("OX", "ox"),
+    ("공지게시판", "notices"),
+)
+MANIFEST_FILENAME = "manifest.json"
+APPLIED_FILENAME = "applied.{target}.json"
+SCHEMA_SLUG = "schema"
+FETCH_SIZE = 500
+
+# D1 rejects statements over 100 KB; keep a margin.
+DEFAULT_MAX_STATEMENT_BYTES = 90_000
+DEFAULT_MAX_FILE_BYTES = 4_000_000
+DEFAULT_MAX_STATEMENTS = 200
+
+CREATE_TABLE_RE = re.compile(r"^\s*CREATE\s+TABLE\s+(?!IF\s+NOT\s+EXISTS)", re.IGNORECASE)
+CREATE_INDEX_RE = re.compile(r"^\s*CREATE\s+(UNIQUE\s+)?INDEX\s+(?!IF\s+NOT\s+EXISTS)", re.IGNORECASE)
+
+
+@dataclass
+class DumpChunk:
+    file: str
+    table: str
+    rows: int
+    statements: int
+    bytes: int
+    sha256: str
+    first_id: int | None = None
+    last_id: int | None = None
+
+
+def quote_ident(name: str) -> str:
+    return '"' + name.replace('"', '""') + '"'
+
+
+def sql_literal(value: object) -> str:
+    if value is None:
+        return "NULL"
+    if isinstance(value, bool):
+        return "1" if value else "0"
+    if isinstance(value, int):
+        return str(value)
+    if isinstance(value, float):
+        return repr(value)
+    if isinstance(value, (bytes, bytearray, memoryview)):
+        return "X'" + bytes(value).hex() + "'"
+    return "'" + str(value).replace("'", "''") + "'"
+
+
+def file_sha256(path: Path) -> str:
+    digest = hashlib.sha256()
+    with path.open("rb") as handle:
+        for chunk in iter(lambda: handle.read(1 << 20), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def table_columns(conn: sqlite3.Connection, table: str) -> tuple[List[str], str]:
+    """Column names plus the INTEGER PRIMARY KEY column (or rowid) used for ordering."""
+    info = conn.execute(f"PRAGMA table_info({quote_ident(table)})").fetchall()
+    columns = [str(row[1]) for row in info]
+    pk_columns = [row for row in info if int(row[5] or 0) > 0]
+    if len(pk_columns) == 1 and str(pk_columns[0][2]).upper() == "INTEGER":
+        return columns, str(pk_columns[0][1])
+    return columns, "rowid"
+
+
+def schema_statements(conn: sqlite3.Connection, tables: List[str]) -> List[str]:
+    statements: List[str] = []
+    for table in tables:
+        row = conn.execute("SELECT sql FROM sqlite_master WHERE type = 'table' AND name = ?", (table,)).fetchone()
+        if row is None or not row[0]:
+            continue
+        statements.append(CREATE_TABLE_RE.sub("CREATE TABLE IF NOT EXISTS ", str(row[0]), count=1).strip() + ";")
+        index_rows = conn.execute(
+            "SELECT sql FROM sqlite_master WHERE type = 'index' AND tbl_name = ? AND sql IS NOT NULL ORDER BY name",
+            (table,),
+        )
+        for (index_sql,) in index_rows:
+            statements.append(
+                CREATE_INDEX_RE.sub(lambda m: f"CREATE {m.group(1) or ''}INDEX IF NOT EXISTS ", str(index_sql), count=1).strip()
+                + ";"
+            )
+    return statements
+
+
+def iter_insert_statements(
+    conn: sqlite3.Connection,
+    table: str,
+    *,
+    max_statement_bytes: int,
+) -> Iterator[tuple[str, int, int, int]]:
+    """Yield (statement, row_count, first_id, last_id), packing rows up to max_statement_bytes."""
+    columns, order_col = table_columns(conn, table)
+    select_cols = ", ".join(quote_ident(col) for col in columns)
+    order_expr = "rowid" if order_col == "rowid" else quote_ident(order_col)
+    prefix = f"INSERT OR REPLACE INTO {quote_ident(table)} ({select_cols}) VALUES\n"
+    prefix_bytes = len(prefix.encode("utf-8"))
+    id_index = columns.index(order_col) if order_col in columns else None
+
+    cursor = conn.execute(f"SELECT {select_cols}, {order_expr} FROM {quote_ident(table)} ORDER BY {order_expr}")
+    values: List[str] = []
+    size = prefix_bytes
+    first_id = last_id = 0
+    while True:
+        batch = cursor.fetchmany(FETCH_SIZE)
+        if not batch:
+            break
+        for row in batch:
+            row_id = int(row[id_index] if id_index is not None else row[-1])
+            tuple_sql = "(" + ", ".join(sql_literal(value) for value in row[: len(columns)]) + ")"
+            tuple_bytes = len(tuple_sql.encode("utf-8")) + 2
+            if values and size + tuple_bytes > max_statement_bytes:
+                yield prefix + ",\n".join(values) + ";\n", len(values), first_id, last_id
+                values, size = [], prefix_bytes
+            if not values:
+                first_id = row_id
+            values.append(tuple_sql)
+            size += tuple_bytes
+            last_id = row_id
+    if values:
+        yield prefix + ",\n".join(values) + ";\n", len(values), first_id, last_id
+
+
+class ChunkWriter:
+    def __init__(self, out_dir: Path, *, max_file_bytes: int, max_statements: int) -> None:
+        self.out_dir = out_dir
+        self.max_file_bytes = max_file_bytes
+        self.max_statements = max_statements
+        self.chunks: List[DumpChunk] = []
+        self._handle = None
+        self._digest = None
+        self._current: DumpChunk | None = None
+
+    def _open(self, table: str, slug: str) -> None:
+        name = f"{len(self.chunks) + 1:04d}_{slug}.sql"
+        self._handle = (self.out_dir / name).open("wb")
+        self._digest = hashlib.sha256()
+        self._current = DumpChunk(file=name, table=table, rows=0, statements=0, bytes=0, sha256="")
+
+    def close(self) -> None:
+        if self._current is None:
+            return
+        self._handle.close()
+        self._current.sha256 = self._digest.hexdigest()
+        self.chunks.append(self._current)
+        self._handle = self._digest = self._current = None
+
+    def write(self, table: str, slug: str, statement: str, *, rows: int = 0, first_id: int | None = None, last_id: int | None = None) -> None:
+        data = statement.encode("utf-8")
+        current = self._current
+        if current is not None and (
+            current.table != table
+            or current.statements >= self.max_statements
+            or current.bytes + len(data) > self.max_file_bytes
+        ):
+            self.close()
+        if self._current is None:
+            self._open(table, slug)
+        current = self._current
+        self._handle.write(data)
+        self._digest.update(data)
+        current.bytes += len(data)
+        current.statements += 1
+        current.rows += rows
+        if first_id is not None and current.first_id is None:
+            current.first_id = first_id
+        if last_id is not None:
+            current.last_id = last_id
+
+
+def export_dump(
+    *,
+    db_path: Path,
+    out_dir: Path,
+    tables: List[str],
+    max_file_bytes: int,
+    max_statements: int,
+    max_statement_bytes: int,
+) -> dict:
+    out_dir.mkdir(parents=True, exist_ok=True)
+    for stale in out_dir.glob("[0-9][0-9][0-9][0-9]_*.sql"):
+        stale.unlink()
+
+    slugs = dict(DUMP_TABLES)
+    conn = sqlite3.connect(db_path)
+    writer = ChunkWriter(out_dir, max_file_bytes=max_file_bytes, max_statements=max_statements)
+    try:
+        existing = [table for table in tables if conn.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?", (table,)
+        ).fetchone()]
+        for statement in schema_statements(conn, existing):
+            writer.write(SCHEMA_SLUG, SCHEMA_SLUG, statement + "\n")
+        writer.close()
+        for table in existing:
+            slug = slugs.get(table) or f"table{tables.index(table) + 1}"
+            for statement, rows, first_id, last_id in iter_insert_statements(
+                conn, table, max_statement_bytes=max_statement_bytes
+            ):
+                if len(statement.encode("utf-8")) > max_statement_bytes:
+                    print(f"[WARN] {table} id={first_id}: 한 행이 --max-statement-bytes를 넘습니다", file=sys.stderr)
+                writer.write(table, slug, statement, rows=rows, first_id=first_id, last_id=last_id)
+            writer.close()
+    finally:
+        writer.close()
+        conn.close()
+
+    manifest = {
+        "source": str(db_path),
+        "created_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "limits": {
+            "max_file_bytes": max_file_bytes,
+            "max_statements": max_statements,
+            "max_statement_bytes": max_statement_bytes,
+        },
+        "chunks": [asdict(chunk) for chunk in writer.chunks],
+    }
+    (out_dir / MANIFEST_FILENAME).write_text(json.dumps(manifest, ensure_ascii=False, indent=1), encoding="utf-8")
+    return manifest
+
+
+def apply_dump(*, out_dir: Path, database: str, remote: bool, wrangler: str) -> int:
+    """Run wrangler per chunk in manifest order, skipping chunks already applied with the same checksum."""
+    manifest = json.loads((out_dir / MANIFEST_FILENAME).read_text(encoding="utf-8"))
+    applied_path = out_dir / APPLIED_FILENAME.format(target="remote" if remote else "local")
+    applied: dict[str, str] = {}
+    if applied_path.exists():
+        applied = json.loads(applied_path.read_text(encoding="utf-8"))
+
+    for chunk in manifest["chunks"]:
+        path = out_dir / chunk["file"]
+        if applied.get(chunk["file"]) == chunk["sha256"]:
+            print(f"[skip] {chunk['file']}")
+            continue
+        if not path.exists() or file_sha256(path) != chunk["sha256"]:
+            print(f"[FAIL] {chunk['file']}: 파일이 없거나 체크섬이 manifest와 다릅니다")
+            return 1
+        command = [wrangler, "d1", "execute", database, "--remote" if remote else "--local", f"--file={path}"]
+        print(f"[run] {chunk['file']} rows={chunk['rows']}")
+        if subprocess.run(command).returncode != 0:
+            print(f"[FAIL] {chunk['file']}: 다시 실행하면 이 chunk부터 이어서 적용합니다")
+            return 1
+        applied[chunk["file"]] = chunk["sha256"]
+        applied_path.write_text(json.dumps(applied, indent=1), encoding="utf-8")
+    return 0
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Export 문제/OX/공지게시판 as size-bounded SQL chunks for `wrangler d1 execute`, or apply them."
+    )
+    parser.add_argument("--db-path", default="data/questions.db")
+    parser.add_argument("--out-dir", default="data/d1_dump")
+    parser.add_argument("--tables", nargs="+", default=[table for table, _ in DUMP_TABLES])
+    parser.add_argument("--max-file-bytes", type=int, default=DEFAULT_MAX_FILE_BYTES, help="chunk 파일 하나의 최대 바이트")
+    parser.add_argument("--max-statements", type=int, default=DEFAULT_MAX_STATEMENTS, help="chunk 파일 하나의 최대 문장 수")
+    parser.add_argument("--max-statement-bytes", type=int, default=DEFAULT_MAX_STATEMENT_BYTES, help="INSERT 문 하나의 최대 바이트")
+    parser.add_argument("--apply", action="store_true", help="내보내기 대신 manifest 순서대로 wrangler로 적용 (적용된 chunk는 건너뜀)")
+    parser.add_argument("--database", default="tax-exam3-db")
+    parser.add_argument("--remote", action="store_true", help="--apply 시 원격 D1에 적용 (기본: --local)")
+    parser.add_argument("--wrangler", default="wrangler")
+    args = parser.parse_args()
+
+    out_dir = Path(args.out_dir)
+    if args.apply:
+        sys.exit(apply_dump(out_dir=out_dir, database=args.database, remote=args.remote, wrangler=args.wrangler))
+
+    manifest = export_dump(
+        db_path=Path(args.db_path),
+        out_dir=out_dir,
+        tables=list(args.tables),
+        max_file_bytes=max(1, int(args.max_file_bytes)),
+        max_statements=max(1, int(args.max_statements)),
+        max_statement_bytes=max(1, int(args.max_statement_bytes)),
+    )
+    for chunk in manifest["chunks"]:
+        print(f"{chunk['file']}: table={chunk['table']} rows={chunk['rows']} statements={chunk['statements']} bytes={chunk['bytes']}")
+    print(f"chunks={len(manifest['chunks'])} manifest={out_dir / MANIFEST_FILENAME}")
+
+
+if __name__ == "__main__":
+    main()
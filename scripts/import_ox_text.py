@@ -4,10 +4,16 @@ import argparse
 import hashlib
 import re
 import sqlite3
+import sys
 import unicodedata
 from pathlib import Path
 
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT / "webapp"))
+
 from data_paths import find_year_file
+from ingest_profile import add_profile_arguments, configure_profiler, finish_profiler, profile_stage
+from question_text import build_note_preview
 
 TABLE_OX = "OX"
 
@@ -19,6 +25,10 @@ COL_STABLE_ID = "stable_id"
 COL_QUESTION = "\ubb38\uc81c"
 COL_ANSWER = "\ub2f5"
 COL_EXPLANATION = "\ud574\uc124"
+COL_PREVIEW = "\ubbf8\ub9ac\ubcf4\uae30"
+
+INDEX_OX_STABLE_ID = f"idx_{TABLE_OX}_{COL_YEAR}_{COL_SUBJECT}_{COL_STABLE_ID}"
+INDEX_OX_BLANK_STABLE_ID = f"idx_{TABLE_OX}_{COL_STABLE_ID}_blank"
 
 ANSWER_LABEL_RE = r"(?:\uC815\uB2F5|\uB2F5)"
 EXPLANATION_LABEL_RE = r"(?:\uC124\uBA85|\uD574\uC124)"
@@ -199,68 +209,194 @@ def ensure_ox_table(conn: sqlite3.Connection) -> None:
         conn.execute(
             f'ALTER TABLE "{TABLE_OX}" ADD COLUMN "{COL_STABLE_ID}" TEXT NOT NULL DEFAULT \'\''
         )
-    rows = conn.execute(
-        f'SELECT rowid, "{COL_SOURCE_QNO}", "{COL_QNO}", "{COL_QUESTION}", "{COL_STABLE_ID}" FROM "{TABLE_OX}"'
-    ).fetchall()
-    occurrence_map: dict[str, int] = {}
-    for rowid, source_qno, qno, question, stable_id in rows:
-        current = str(stable_id or "").strip()
-        if current:
-            continue
-        source_value = int(source_qno or 0) or int(qno or 0)
-        base = build_stable_id(source_value, str(question or ""), 1)
-        occurrence_map[base] = occurrence_map.get(base, 0) + 1
-        next_stable_id = build_stable_id(source_value, str(question or ""), occurrence_map[base])
+    if COL_PREVIEW not in columns:
+        conn.execute(f'ALTER TABLE "{TABLE_OX}" ADD COLUMN "{COL_PREVIEW}" TEXT NOT NULL DEFAULT \'\'')
+    conn.execute(
+        f'CREATE INDEX IF NOT EXISTS "{INDEX_OX_BLANK_STABLE_ID}" ON "{TABLE_OX}" ("{COL_STABLE_ID}") WHERE "{COL_STABLE_ID}" = \'\''
+    )
+    has_unique_index = conn.execute(
+        "SELECT 1 FROM sqlite_master WHERE type = 'index' AND name = ?",
+        (INDEX_OX_STABLE_ID,),
+    ).fetchone()
+    if has_unique_index is None:
+        # One-time migration: clear duplicate ids inside a (year, subject) so the unique index can be built.
+        conn.execute(
+            f"""
+            UPDATE "{TABLE_OX}" SET "{COL_STABLE_ID}" = ''
+            WHERE "{COL_STABLE_ID}" <> ''
+              AND rowid NOT IN (
+                  SELECT MIN(rowid) FROM "{TABLE_OX}"
+                  GROUP BY "{COL_YEAR}", "{COL_SUBJECT}", "{COL_STABLE_ID}"
+              )
+            """
+        )
+    backfill_blank_stable_ids(conn)
+    if has_unique_index is None:
         conn.execute(
-            f'UPDATE "{TABLE_OX}" SET "{COL_STABLE_ID}" = ?, "{COL_SOURCE_QNO}" = ? WHERE rowid = ?',
-            (next_stable_id, source_value, rowid),
+            f"""
+            CREATE UNIQUE INDEX IF NOT EXISTS "{INDEX_OX_STABLE_ID}"
+            ON "{TABLE_OX}" ("{COL_YEAR}", "{COL_SUBJECT}", "{COL_STABLE_ID}")
+            """
         )
     conn.commit()
 
 
+def backfill_blank_stable_ids(conn: sqlite3.Connection) -> int:
+    blank_rows = conn.execute(
+        f"""
+        SELECT rowid, "{COL_YEAR}", "{COL_SUBJECT}", "{COL_SOURCE_QNO}", "{COL_QNO}", "{COL_QUESTION}"
+        FROM "{TABLE_OX}"
+        WHERE "{COL_STABLE_ID}" = ''
+        """
+    ).fetchall()
+    if not blank_rows:
+        return 0
+
+    taken: dict[tuple[int, str], set[str]] = {}
+    updates: list[tuple[str, int, int]] = []
+    for rowid, year, subject, source_qno, qno, question in sorted(blank_rows, key=lambda row: (row[1], row[2], row[4])):
+        key = (int(year), str(subject))
+        if key not in taken:
+            taken[key] = {
+                str(row[0])
+                for row in conn.execute(
+                    f'SELECT "{COL_STABLE_ID}" FROM "{TABLE_OX}" WHERE "{COL_YEAR}" = ? AND "{COL_SUBJECT}" = ? AND "{COL_STABLE_ID}" <> \'\'',
+                    key,
+                )
+            }
+        source_value = int(source_qno or 0) or int(qno or 0)
+        occurrence = 1
+        stable_id = build_stable_id(source_value, str(question or ""), occurrence)
+        while stable_id in taken[key]:
+            occurrence += 1
+            stable_id = build_stable_id(source_value, str(question or ""), occurrence)
+        taken[key].add(stable_id)
+        updates.append((stable_id, source_value, int(rowid)))
+
+    conn.executemany(
+        f'UPDATE "{TABLE_OX}" SET "{COL_STABLE_ID}" = ?, "{COL_SOURCE_QNO}" = ? WHERE rowid = ?',
+        updates,
+    )
+    return len(updates)
+
+
+def build_ox_rows(records: list[tuple[int, str, str, str]]) -> list[tuple[int, int, str, str, str, str]]:
+    rows: list[tuple[int, int, str, str, str, str]] = []
+    occurrence_map: dict[str, int] = {}
+    for sequence, (source_qno, question, answer, explanation) in enumerate(records, start=1):
+        base = build_stable_id(source_qno, question, 1)
+        occurrence_map[base] = occurrence_map.get(base, 0) + 1
+        stable_id = build_stable_id(source_qno, question, occurrence_map[base])
+        rows.append((sequence, int(source_qno), stable_id, question, answer, explanation))
+    return rows
+
+
+def write_ox_records(
+    conn: sqlite3.Connection,
+    *,
+    year: int,
+    subject: str,
+    records: list[tuple[int, str, str, str]],
+    source: object = "",
+) -> dict[str, int]:
+    """Diff the parsed records against the stored (year, subject) rows by stable_id and write only changes.
+
+    Matching rows keep their rowid. Rows whose 문제번호 moves are parked on a negative number first so the
+    UNIQUE (출제연도, 과목, 문제번호) constraint never sees a transient collision.
+    """
+    subject = subject.strip()
+    new_rows = build_ox_rows(records)
+    with profile_stage("sqlite_write", source=source, rows_in=len(new_rows)) as stage:
+        existing: dict[str, tuple[int, int, int, str, str, str]] = {}
+        stale_rowids: list[int] = []
+        for rowid, qno, source_qno, stable_id, question, answer, explanation in conn.execute(
+            f"""
+            SELECT rowid, "{COL_QNO}", "{COL_SOURCE_QNO}", "{COL_STABLE_ID}", "{COL_QUESTION}", "{COL_ANSWER}", "{COL_EXPLANATION}"
+            FROM "{TABLE_OX}"
+            WHERE "{COL_YEAR}" = ? AND "{COL_SUBJECT}" = ?
+            ORDER BY "{COL_QNO}"
+            """,
+            (int(year), subject),
+        ):
+            key = str(stable_id or "")
+            if not key or key in existing:
+                stale_rowids.append(int(rowid))
+                continue
+            existing[key] = (int(rowid), int(qno), int(source_qno or 0), question, answer, explanation)
+
+        inserts: list[tuple] = []
+        updates: list[tuple] = []
+        moved_rowids: list[int] = []
+        seen: set[str] = set()
+        for qno, source_qno, stable_id, question, answer, explanation in new_rows:
+            seen.add(stable_id)
+            current = existing.get(stable_id)
+            if current is None:
+                inserts.append(
+                    (int(year), subject, qno, source_qno, stable_id, question, build_note_preview(question), answer, explanation)
+                )
+                continue
+            rowid = current[0]
+            if current[1:] == (qno, source_qno, question, answer, explanation):
+                continue
+            if current[1] != qno:
+                moved_rowids.append(rowid)
+            updates.append((qno, source_qno, question, build_note_preview(question), answer, explanation, rowid))
+        deletes = stale_rowids + [row[0] for key, row in existing.items() if key not in seen]
+
+        if deletes:
+            conn.executemany(f'DELETE FROM "{TABLE_OX}" WHERE rowid = ?', [(rowid,) for rowid in deletes])
+        if moved_rowids:
+            conn.executemany(
+                f'UPDATE "{TABLE_OX}" SET "{COL_QNO}" = -rowid WHERE rowid = ?',
+                [(rowid,) for rowid in moved_rowids],
+            )
+        if updates:
+            conn.executemany(
+                f"""
+                UPDATE "{TABLE_OX}"
+                SET "{COL_QNO}" = ?, "{COL_SOURCE_QNO}" = ?, "{COL_QUESTION}" = ?, "{COL_PREVIEW}" = ?,
+                    "{COL_ANSWER}" = ?, "{COL_EXPLANATION}" = ?
+                WHERE rowid = ?
+                """,
+                updates,
+            )
+        if inserts:
+            conn.executemany(
+                f"""
+                INSERT INTO "{TABLE_OX}"
+                ("{COL_YEAR}", "{COL_SUBJECT}", "{COL_QNO}", "{COL_SOURCE_QNO}", "{COL_STABLE_ID}", "{COL_QUESTION}", "{COL_PREVIEW}", "{COL_ANSWER}", "{COL_EXPLANATION}")
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+                """,
+                inserts,
+            )
+        stage.rows_out = len(inserts) + len(updates) + len(deletes)
+
+    return {
+        "inserted": len(inserts),
+        "updated": len(updates),
+        "deleted": len(deletes),
+        "unchanged": len(new_rows) - len(inserts) - len(updates),
+    }
+
+
 def import_ox_text(*, db_path: Path, year: int, subject: str, text_path: Path) -> dict[str, int]:
-    records = parse_ox_text(text_path)
+    with profile_stage("parse_ox_text", source=text_path) as stage:
+        records = parse_ox_text(text_path)
+        stage.rows_out = len(records)
     if not records:
         raise ValueError(f"No parsable OX records found: {text_path}")
 
     conn = sqlite3.connect(db_path)
     try:
-        ensure_ox_table(conn)
-        conn.execute(
-            f'DELETE FROM "{TABLE_OX}" WHERE "{COL_YEAR}" = ? AND "{COL_SUBJECT}" = ?',
-            (int(year), subject.strip()),
-        )
-        sql = f"""
-            INSERT INTO "{TABLE_OX}"
-            ("{COL_YEAR}", "{COL_SUBJECT}", "{COL_QNO}", "{COL_SOURCE_QNO}", "{COL_STABLE_ID}", "{COL_QUESTION}", "{COL_ANSWER}", "{COL_EXPLANATION}")
-            VALUES (?, ?, ?, ?, ?, ?, ?, ?)
-        """
-        updated = 0
-        occurrence_map: dict[str, int] = {}
-        for sequence, (source_qno, question, answer, explanation) in enumerate(records, start=1):
-            base = build_stable_id(source_qno, question, 1)
-            occurrence_map[base] = occurrence_map.get(base, 0) + 1
-            stable_id = build_stable_id(source_qno, question, occurrence_map[base])
-            cursor = conn.execute(
-                sql,
-                (
-                    int(year),
-                    subject.strip(),
-                    sequence,
-                    int(source_qno),
-                    stable_id,
-                    question,
-                    answer,
-                    explanation,
-                ),
-            )
-            if cursor.rowcount and cursor.rowcount > 0:
-                updated += int(cursor.rowcount)
+        with profile_stage("ensure_ox_table", source=db_path):
+            ensure_ox_table(conn)
+        counts = write_ox_records(conn, year=year, subject=subject, records=records, source=text_path)
         conn.commit()
     finally:
         conn.close()
 
-    return {"parsed": len(records), "upserted": updated}
+    return {"parsed": len(records), **counts}
 
 
 def main() -> None:
@@ -270,23 +406,27 @@ def main() -> None:
     parser.add_argument("--subject", required=True)
     parser.add_argument("--file", default="")
     parser.add_argument("--data-root", default="data")
+    add_profile_arguments(parser)
     args = parser.parse_args()
-
-    if args.file:
-        text_path = Path(args.file)
-    else:
-        year_dir = Path(args.data_root) / str(args.year)
-        text_path = find_year_file(year_dir, f"{args.subject}ox.txt", kind="ox")
-
-    result = import_ox_text(
-        db_path=Path(args.db_path),
-        year=int(args.year),
-        subject=str(args.subject),
-        text_path=text_path,
-    )
-    for key, value in result.items():
-        print(f"{key}={value}")
-    print(f"path={text_path}")
+    configure_profiler(args)
+    try:
+        if args.file:
+            text_path = Path(args.file)
+        else:
+            year_dir = Path(args.data_root) / str(args.year)
+            text_path = find_year_file(year_dir, f"{args.subject}ox.txt", kind="ox")
+
+        result = import_ox_text(
+            db_path=Path(args.db_path),
+            year=int(args.year),
+            subject=str(args.subject),
+            text_path=text_path,
+        )
+        for key, value in result.items():
+            print(f"{key}={value}")
+        print(f"path={text_path}")
+    finally:
+        finish_profiler()
 
 
 if __name__ == "__main__":
@@ -1,11 +1,14 @@
 from __future__ import annotations
 
 import argparse
+import os
 import re
 import sqlite3
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 
-from data_paths import find_year_file
+from data_paths import find_year_file, list_dir_files, list_year_dirs, use_data_root_index, year_solution_dirs
+from ingest_profile import add_profile_arguments, configure_profiler, finish_profiler, profile_stage
 
 TABLE_QUESTIONS = "문제"
 
@@ -16,6 +19,8 @@ COL_ANSWER = "답"
 COL_DISTRIBUTED = "답_배포"
 COL_EXPLANATION = "해설"
 COL_ANSWERED = "답변여부"
+TABLE_SOLUTION_STAGING = "solution_import"
+SOLUTION_SUFFIX = "풀이.txt"
 
 ENTRY_RE = re.compile(r"(?m)^\s*(?:\*\*)?(\d{1,2})\.\s*")
 ANSWER_RE = re.compile(r"정답\s*:\s*([①②③④⑤1-5])")
@@ -64,85 +69,222 @@ def parse_solution_text(path: Path) -> dict[int, tuple[str, str]]:
     return parsed
 
 
+def ensure_answered_column(conn: sqlite3.Connection) -> None:
+    columns = {row[1] for row in conn.execute(f'PRAGMA table_info("{TABLE_QUESTIONS}")')}
+    if COL_ANSWERED not in columns:
+        conn.execute(
+            f'ALTER TABLE "{TABLE_QUESTIONS}" ADD COLUMN "{COL_ANSWERED}" INTEGER NOT NULL DEFAULT 0'
+        )
+
+
+def apply_solution_batches(
+    conn: sqlite3.Connection,
+    batches: dict[tuple[int, str], dict[int, tuple[str, str]]],
+    source: object = "",
+) -> dict[tuple[int, str], dict[str, int]]:
+    """Apply parsed solutions for any number of (year, subject) pairs with one UPDATE ... FROM,
+    then grade 답 against 답_배포 for exactly those pairs with one aggregate query."""
+    ensure_answered_column(conn)
+    conn.create_function("normalize_answer", 1, normalize_answer, deterministic=True)
+    conn.execute(
+        f"""
+        CREATE TEMP TABLE IF NOT EXISTS "{TABLE_SOLUTION_STAGING}" (
+            "year" INTEGER NOT NULL,
+            "subject" TEXT NOT NULL,
+            "qno" INTEGER NOT NULL,
+            "answer" TEXT NOT NULL,
+            "explanation" TEXT NOT NULL,
+            PRIMARY KEY ("year", "subject", "qno")
+        )
+        """
+    )
+    conn.execute(f'DELETE FROM temp."{TABLE_SOLUTION_STAGING}"')
+    staged = [
+        (int(year), subject.strip(), int(qno), answer, explanation)
+        for (year, subject), records in batches.items()
+        for qno, (answer, explanation) in records.items()
+    ]
+    conn.executemany(
+        f'INSERT OR REPLACE INTO temp."{TABLE_SOLUTION_STAGING}" VALUES (?, ?, ?, ?, ?)',
+        staged,
+    )
+
+    with profile_stage("sqlite_update", source=source, rows_in=len(staged)) as stage:
+        cursor = conn.execute(
+            f"""
+            UPDATE "{TABLE_QUESTIONS}"
+            SET "{COL_ANSWER}" = s."answer", "{COL_EXPLANATION}" = s."explanation", "{COL_ANSWERED}" = 1
+            FROM temp."{TABLE_SOLUTION_STAGING}" AS s
+            WHERE "{TABLE_QUESTIONS}"."{COL_YEAR}" = s."year"
+              AND "{TABLE_QUESTIONS}"."{COL_SUBJECT}" = s."subject"
+              AND "{TABLE_QUESTIONS}"."{COL_QNO}" = s."qno"
+            """
+        )
+        stage.rows_out = max(int(cursor.rowcount or 0), 0)
+
+    results: dict[tuple[int, str], dict[str, int]] = {
+        (int(year), subject.strip()): {
+            "parsed": len(records),
+            "updated": 0,
+            "matched": 0,
+            "mismatch": 0,
+            "no_distributed": 0,
+        }
+        for (year, subject), records in batches.items()
+    }
+    grade_sql = f"""
+        SELECT
+            g."{COL_YEAR}",
+            g."{COL_SUBJECT}",
+            SUM(g.staged),
+            SUM(CASE WHEN g.d <> '' AND g.a = g.d THEN 1 ELSE 0 END),
+            SUM(CASE WHEN g.d <> '' AND g.a <> g.d THEN 1 ELSE 0 END),
+            SUM(CASE WHEN g.d = '' THEN 1 ELSE 0 END)
+        FROM (
+            SELECT
+                q."{COL_YEAR}",
+                q."{COL_SUBJECT}",
+                s."qno" IS NOT NULL AS staged,
+                normalize_answer(q."{COL_ANSWER}") AS a,
+                normalize_answer(q."{COL_DISTRIBUTED}") AS d
+            FROM "{TABLE_QUESTIONS}" q
+            LEFT JOIN temp."{TABLE_SOLUTION_STAGING}" s
+              ON s."year" = q."{COL_YEAR}" AND s."subject" = q."{COL_SUBJECT}" AND s."qno" = q."{COL_QNO}"
+            WHERE (q."{COL_YEAR}", q."{COL_SUBJECT}") IN (
+                SELECT DISTINCT "year", "subject" FROM temp."{TABLE_SOLUTION_STAGING}"
+            )
+        ) g
+        GROUP BY g."{COL_YEAR}", g."{COL_SUBJECT}"
+    """
+    with profile_stage("grade", source=source) as stage:
+        for year, subject, updated, matched, mismatch, no_distributed in conn.execute(grade_sql):
+            result = results[(int(year), str(subject))]
+            result["updated"] = int(updated or 0)
+            result["matched"] = int(matched or 0)
+            result["mismatch"] = int(mismatch or 0)
+            result["no_distributed"] = int(no_distributed or 0)
+        stage.rows_out = len(results)
+    conn.execute(f'DELETE FROM temp."{TABLE_SOLUTION_STAGING}"')
+    return results
+
+
+def apply_solution_records(
+    conn: sqlite3.Connection,
+    *,
+    year: int,
+    subject: str,
+    records: dict[int, tuple[str, str]],
+    source: object = "",
+) -> dict[str, int]:
+    results = apply_solution_batches(conn, {(int(year), subject.strip()): records}, source=source)
+    return results[(int(year), subject.strip())]
+
+
 def import_solution_text(*, db_path: Path, year: int, subject: str, text_path: Path) -> dict[str, int]:
-    records = parse_solution_text(text_path)
+    with profile_stage("parse_solution_text", source=text_path) as stage:
+        records = parse_solution_text(text_path)
+        stage.rows_out = len(records)
     if not records:
         raise ValueError(f"No parsable solution records found: {text_path}")
 
     conn = sqlite3.connect(db_path)
     try:
-        columns = {row[1] for row in conn.execute(f'PRAGMA table_info("{TABLE_QUESTIONS}")')}
-        if COL_ANSWERED not in columns:
-            conn.execute(
-                f'ALTER TABLE "{TABLE_QUESTIONS}" ADD COLUMN "{COL_ANSWERED}" INTEGER NOT NULL DEFAULT 0'
-            )
-            conn.commit()
+        result = apply_solution_records(conn, year=year, subject=subject, records=records, source=text_path)
+        conn.commit()
+        return result
+    finally:
+        conn.close()
 
-        sql = f"""
-            UPDATE "{TABLE_QUESTIONS}"
-            SET "{COL_ANSWER}" = ?, "{COL_EXPLANATION}" = ?, "{COL_ANSWERED}" = 1
-            WHERE "{COL_YEAR}" = ? AND "{COL_SUBJECT}" = ? AND "{COL_QNO}" = ?
-        """
 
-        updated = 0
-        for qno, (answer, explanation) in sorted(records.items()):
-            cursor = conn.execute(sql, (answer, explanation, int(year), subject.strip(), int(qno)))
-            if cursor.rowcount and cursor.rowcount > 0:
-                updated += int(cursor.rowcount)
-        conn.commit()
+def discover_solution_files(data_root: Path) -> dict[tuple[int, str], Path]:
+    found: dict[tuple[int, str], Path] = {}
+    for year_dir in list_year_dirs(data_root):
+        for base in year_solution_dirs(year_dir):
+            for path in list_dir_files(base):
+                if not path.name.casefold().endswith(SOLUTION_SUFFIX):
+                    continue
+                subject = path.name[: -len(SOLUTION_SUFFIX)].strip()
+                if subject:
+                    found.setdefault((int(year_dir.name), subject), path)
+    return found
 
-        mismatch = 0
-        matched = 0
-        no_distributed = 0
-        grade_sql = f"""
-            SELECT "{COL_ANSWER}", "{COL_DISTRIBUTED}"
-            FROM "{TABLE_QUESTIONS}"
-            WHERE "{COL_YEAR}" = ? AND "{COL_SUBJECT}" = ?
-            ORDER BY "{COL_QNO}"
-        """
-        for answer, distributed in conn.execute(grade_sql, (int(year), subject.strip())).fetchall():
-            n_answer = normalize_answer(answer)
-            n_distributed = normalize_answer(distributed)
-            if not n_distributed:
-                no_distributed += 1
-            elif n_answer == n_distributed:
-                matched += 1
-            else:
-                mismatch += 1
-        return {
-            "parsed": len(records),
-            "updated": updated,
-            "matched": matched,
-            "mismatch": mismatch,
-            "no_distributed": no_distributed,
-        }
+
+def import_all_solution_texts(*, db_path: Path, data_root: Path, jobs: int) -> dict[tuple[int, str], dict[str, int]]:
+    files = discover_solution_files(data_root)
+    if not files:
+        raise FileNotFoundError(f"No *{SOLUTION_SUFFIX} files found under {data_root}")
+
+    keys = list(files)
+    with profile_stage("parse_solution_text", source=data_root) as stage:
+        if jobs > 1 and len(keys) > 1:
+            with ProcessPoolExecutor(max_workers=jobs) as pool:
+                parsed = list(pool.map(parse_solution_text, [files[key] for key in keys]))
+        else:
+            parsed = [parse_solution_text(files[key]) for key in keys]
+        stage.rows_in = len(keys)
+        stage.rows_out = sum(len(records) for records in parsed)
+
+    batches = {key: records for key, records in zip(keys, parsed) if records}
+    for key in keys:
+        if key not in batches:
+            print(f"[skip] {key[0]} {key[1]}: no parsable records in {files[key]}")
+
+    conn = sqlite3.connect(db_path)
+    try:
+        results = apply_solution_batches(conn, batches, source=data_root)
+        conn.commit()
     finally:
         conn.close()
+    return results
 
 
 def main() -> None:
     parser = argparse.ArgumentParser(description="Import subject solution text into DB and grade against 답_배포.")
     parser.add_argument("--db-path", default="data/questions.db")
-    parser.add_argument("--year", type=int, required=True)
-    parser.add_argument("--subject", required=True)
+    parser.add_argument("--year", type=int)
+    parser.add_argument("--subject")
     parser.add_argument("--file", default="")
     parser.add_argument("--data-root", default="data")
+    parser.add_argument("--all", action="store_true", help="Import every <subject>풀이.txt under --data-root at once.")
+    parser.add_argument("--jobs", type=int, default=os.cpu_count() or 1, help="Parallel parse processes for --all.")
+    add_profile_arguments(parser)
     args = parser.parse_args()
+    if not args.all and (args.year is None or not args.subject):
+        parser.error("--year and --subject are required unless --all is given")
+    configure_profiler(args)
+    try:
+        if args.all:
+            use_data_root_index(Path(args.data_root))
+            results = import_all_solution_texts(
+                db_path=Path(args.db_path),
+                data_root=Path(args.data_root),
+                jobs=max(1, int(args.jobs)),
+            )
+            totals = {key: 0 for key in ("parsed", "updated", "matched", "mismatch", "no_distributed")}
+            for (year, subject), result in sorted(results.items()):
+                print(f"[{year}] {subject}: " + " ".join(f"{key}={value}" for key, value in result.items()))
+                for key in totals:
+                    totals[key] += result[key]
+            for key, value in totals.items():
+                print(f"{key}={value}")
+            return
 
-    if args.file:
-        text_path = Path(args.file)
-    else:
-        year_dir = Path(args.data_root) / str(args.year)
-        text_path = find_year_file(year_dir, f"{args.subject}풀이.txt", kind="solution")
-
-    result = import_solution_text(
-        db_path=Path(args.db_path),
-        year=int(args.year),
-        subject=str(args.subject),
-        text_path=text_path,
-    )
-    for key, value in result.items():
-        print(f"{key}={value}")
+        if args.file:
+            text_path = Path(args.file)
+        else:
+            year_dir = Path(args.data_root) / str(args.year)
+            text_path = find_year_file(year_dir, f"{args.subject}풀이.txt", kind="solution")
+
+        result = import_solution_text(
+            db_path=Path(args.db_path),
+            year=int(args.year),
+            subject=str(args.subject),
+            text_path=text_path,
+        )
+        for key, value in result.items():
+            print(f"{key}={value}")
+    finally:
+        finish_profiler()
 
 
 if __name__ == "__main__":
@@ -0,0 +1,384 @@
+from __future__ import annotations
+
+import argparse
+import hashlib
+import json
+import os
+import sqlite3
+from concurrent.futures import Future, ProcessPoolExecutor
+from dataclasses import dataclass, field
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List
+
+import build_ox_links
+import build_answer_masks
+import build_ox_similarity
+import build_previews
+import build_search_index
+import import_ox_text
+import import_solution_text
+import load_2025_questions
+import sync_distributed_answers
+from data_paths import find_year_file, list_year_dirs, list_year_pdfs, use_data_root_index
+from ingest_profile import add_profile_arguments, configure_profiler, finish_profiler, profile_stage
+
+
+TABLE_MANIFEST = "ingest_manifest"
+
+KIND_QUESTIONS = "questions"
+KIND_SOLUTION = "solution"
+KIND_DISTRIBUTED = "distributed"
+KIND_OX = "ox"
+KIND_OX_LINK = "ox_link"
+KIND_OX_SIMILARITY = "ox_similarity"
+KIND_SEARCH = "search_index"
+KIND_PREVIEW = "preview"
+KIND_ANSWER_MASK = "answer_mask"
+
+SOLUTION_SUBJECTS = load_2025_questions.SUBJECTS
+OX_SUBJECTS = (
+    "재정학",
+    "세법학개론",
+    "회계학개론",
+    "상법",
+    "민법",
+    "행정소송법",
+    "국세기본법",
+    "국세징수법",
+    "소득세법",
+    "법인세법",
+    "부가가치세법",
+    "조세범처벌법",
+)
+
+KIND_MODULES = {
+    KIND_QUESTIONS: load_2025_questions,
+    KIND_SOLUTION: import_solution_text,
+    KIND_DISTRIBUTED: sync_distributed_answers,
+    KIND_OX: import_ox_text,
+    KIND_OX_LINK: build_ox_links,
+    KIND_OX_SIMILARITY: build_ox_similarity,
+    KIND_SEARCH: build_search_index,
+    KIND_PREVIEW: build_previews,
+    KIND_ANSWER_MASK: build_answer_masks,
+}
+
+
+@dataclass
+class IngestStage:
+    name: str
+    kind: str
+    year: int
+    subject: str = ""
+    inputs: List[Path] = field(default_factory=list)
+    deps: List[str] = field(default_factory=list)
+    input_hash: str = ""
+
+
+def hash_file(path: Path, cache: Dict[Path, str]) -> str:
+    cached = cache.get(path)
+    if cached is not None:
+        return cached
+    digest = hashlib.sha256()
+    with path.open("rb") as handle:
+        for chunk in iter(lambda: handle.read(1 << 20), b""):
+            digest.update(chunk)
+    cache[path] = digest.hexdigest()
+    return cache[path]
+
+
+def discover_years(data_root: Path) -> List[int]:
+    return [int(path.name) for path in list_year_dirs(data_root)]
+
+
+def try_find(year_dir: Path, filename: str, kind: str) -> Path | None:
+    try:
+        return find_year_file(year_dir, filename, kind=kind)
+    except FileNotFoundError:
+        return None
+
+
+def build_plan(data_root: Path, years: List[int]) -> List[IngestStage]:
+    """Stages in dependency order: questions -> solution -> distributed per year; OX stands alone."""
+    stages: List[IngestStage] = []
+    for year in years:
+        year_dir = data_root / str(year)
+        exam_pdfs = [path for path in list_year_pdfs(year_dir) if "시험지 원본" in path.name]
+        solution_paths = {
+            subject: try_find(year_dir, f"{subject}풀이.txt", "solution") for subject in SOLUTION_SUBJECTS
+        }
+        published_path = try_find(year_dir, "실제정답.txt", "problem")
+
+        question_stage = ""
+        if exam_pdfs:
+            question_stage = f"{KIND_QUESTIONS}:{year}"
+            inputs = list(exam_pdfs)
+            inputs.extend(path for path in solution_paths.values() if path is not None)
+            if published_path is not None:
+                inputs.append(published_path)
+            stages.append(IngestStage(name=question_stage, kind=KIND_QUESTIONS, year=year, inputs=inputs))
+
+        year_deps = [question_stage] if question_stage else []
+        solution_stages: List[str] = []
+        for subject, path in solution_paths.items():
+            if path is None:
+                continue
+            name = f"{KIND_SOLUTION}:{year}:{subject}"
+            stages.append(
+                IngestStage(name=name, kind=KIND_SOLUTION, year=year, subject=subject, inputs=[path], deps=list(year_deps))
+            )
+            solution_stages.append(name)
+
+        stages.append(
+            IngestStage(
+                name=f"{KIND_DISTRIBUTED}:{year}",
+                kind=KIND_DISTRIBUTED,
+                year=year,
+                inputs=[published_path] if published_path is not None else [],
+                deps=year_deps + solution_stages,
+            )
+        )
+
+        ox_stages: List[str] = []
+        for subject in OX_SUBJECTS:
+            path = try_find(year_dir, f"{subject}ox.txt", "ox")
+            if path is None:
+                continue
+            name = f"{KIND_OX}:{year}:{subject}"
+            stages.append(IngestStage(name=name, kind=KIND_OX, year=year, subject=subject, inputs=[path]))
+            ox_stages.append(name)
+        if ox_stages:
+            stages.append(
+                IngestStage(name=f"{KIND_OX_LINK}:{year}", kind=KIND_OX_LINK, year=year, deps=year_deps + ox_stages)
+            )
+
+    # Near-duplicate clusters span every year and subject, so they depend on all question/OX stages.
+    content_stages = [stage.name for stage in stages if stage.kind in (KIND_QUESTIONS, KIND_OX)]
+    if content_stages:
+        stages.append(IngestStage(name=KIND_OX_SIMILARITY, kind=KIND_OX_SIMILARITY, year=0, deps=content_stages))
+        stages.append(IngestStage(name=KIND_PREVIEW, kind=KIND_PREVIEW, year=0, deps=content_stages))
+    # Grading keys follow 답 (solution stages) with 답_배포 as the fallback.
+    answer_stages = [stage.name for stage in stages if stage.kind in (KIND_QUESTIONS, KIND_SOLUTION, KIND_DISTRIBUTED)]
+    if answer_stages:
+        stages.append(IngestStage(name=KIND_ANSWER_MASK, kind=KIND_ANSWER_MASK, year=0, deps=answer_stages))
+    # The search index also covers 해설, so solution stages invalidate it too.
+    text_stages = [stage.name for stage in stages if stage.kind in (KIND_QUESTIONS, KIND_SOLUTION, KIND_OX)]
+    if text_stages:
+        stages.append(IngestStage(name=KIND_SEARCH, kind=KIND_SEARCH, year=0, deps=text_stages))
+    return stages
+
+
+def compute_stage_hashes(stages: List[IngestStage]) -> None:
+    """A stage's hash covers its input files, the script that applies it and its dependencies' hashes,
+    so any upstream change also invalidates everything downstream."""
+    file_cache: Dict[Path, str] = {}
+    by_name = {stage.name: stage for stage in stages}
+    for stage in stages:
+        digest = hashlib.sha256(stage.name.encode("utf-8"))
+        module_path = Path(KIND_MODULES[stage.kind].__file__)
+        digest.update(hash_file(module_path, file_cache).encode("ascii"))
+        for path in stage.inputs:
+            digest.update(path.name.encode("utf-8"))
+            digest.update(hash_file(path, file_cache).encode("ascii"))
+        for dep in stage.deps:
+            digest.update(by_name[dep].input_hash.encode("ascii"))
+        stage.input_hash = digest.hexdigest()
+
+
+def ensure_manifest_table(conn: sqlite3.Connection) -> None:
+    conn.execute(
+        f"""
+        CREATE TABLE IF NOT EXISTS "{TABLE_MANIFEST}" (
+            "stage" TEXT PRIMARY KEY,
+            "input_hash" TEXT NOT NULL,
+            "inputs" TEXT NOT NULL,
+            "result" TEXT NOT NULL DEFAULT '',
+            "updated_at" TEXT NOT NULL
+        )
+        """
+    )
+    conn.commit()
+
+
+def load_manifest(conn: sqlite3.Connection) -> Dict[str, str]:
+    return {stage: input_hash for stage, input_hash in conn.execute(f'SELECT "stage", "input_hash" FROM "{TABLE_MANIFEST}"')}
+
+
+def record_manifest(conn: sqlite3.Connection, stage: IngestStage, result: dict) -> None:
+    conn.execute(
+        f"""
+        INSERT INTO "{TABLE_MANIFEST}" ("stage", "input_hash", "inputs", "result", "updated_at")
+        VALUES (?, ?, ?, ?, ?)
+        ON CONFLICT("stage") DO UPDATE SET
+            "input_hash" = excluded."input_hash",
+            "inputs" = excluded."inputs",
+            "result" = excluded."result",
+            "updated_at" = excluded."updated_at"
+        """,
+        (
+            stage.name,
+            stage.input_hash,
+            json.dumps([str(path) for path in stage.inputs], ensure_ascii=False),
+            json.dumps(result, ensure_ascii=False),
+            datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+        ),
+    )
+
+
+def prepare_stage(kind: str, year: int, year_dir: str, inputs: List[str]) -> object:
+    """Parse a stage's inputs without touching the DB; runs in a worker process."""
+    if kind == KIND_QUESTIONS:
+        return load_2025_questions.build_question_rows(Path(year_dir), year)
+    if kind == KIND_SOLUTION:
+        return import_solution_text.parse_solution_text(Path(inputs[0]))
+    if kind == KIND_DISTRIBUTED:
+        return sync_distributed_answers.parse_published_answers(Path(inputs[0])) if inputs else None
+    if kind == KIND_OX:
+        return import_ox_text.parse_ox_text(Path(inputs[0]))
+    if kind in (KIND_OX_LINK, KIND_OX_SIMILARITY, KIND_SEARCH, KIND_PREVIEW, KIND_ANSWER_MASK):
+        return None
+    raise ValueError(f"unknown stage kind: {kind}")
+
+
+def apply_stage(conn: sqlite3.Connection, stage: IngestStage, data: object) -> dict:
+    source = stage.inputs[0] if stage.inputs else stage.name
+    if stage.kind == KIND_QUESTIONS:
+        with profile_stage("upsert_questions", source=stage.name, rows_in=len(data)):
+            load_2025_questions.upsert_questions(conn, data)
+        return {"rows": len(data)}
+    if stage.kind == KIND_SOLUTION:
+        if not data:
+            raise ValueError(f"No parsable solution records found: {source}")
+        return import_solution_text.apply_solution_records(
+            conn, year=stage.year, subject=stage.subject, records=data, source=source
+        )
+    if stage.kind == KIND_DISTRIBUTED:
+        if data is None:
+            updated = sync_distributed_answers.fallback_copy_from_answer(conn, year=stage.year)
+        else:
+            updated = sync_distributed_answers.update_from_mapping(conn, year=stage.year, mapping=data)
+        total, filled = sync_distributed_answers.count_filled(conn, year=stage.year)
+        return {"updated": updated, "filled": filled, "total": total}
+    if stage.kind == KIND_OX:
+        if not data:
+            raise ValueError(f"No parsable OX records found: {source}")
+        counts = import_ox_text.write_ox_records(
+            conn, year=stage.year, subject=stage.subject, records=data, source=source
+        )
+        return {"parsed": len(data), **counts}
+    if stage.kind == KIND_OX_LINK:
+        return build_ox_links.rebuild_ox_links(conn, year=stage.year)
+    if stage.kind == KIND_OX_SIMILARITY:
+        return build_ox_similarity.rebuild_similarity(conn)
+    if stage.kind == KIND_SEARCH:
+        return build_search_index.rebuild_search_index(conn)
+    if stage.kind == KIND_PREVIEW:
+        return build_previews.rebuild_previews(conn)
+    if stage.kind == KIND_ANSWER_MASK:
+        return build_answer_masks.rebuild_answer_masks(conn)
+    raise ValueError(f"unknown stage kind: {stage.kind}")
+
+
+def run_plan(
+    conn: sqlite3.Connection,
+    stages: List[IngestStage],
+    *,
+    data_root: Path,
+    jobs: int,
+    force: bool = False,
+) -> Dict[str, str]:
+    manifest = load_manifest(conn)
+    dirty = [stage for stage in stages if force or manifest.get(stage.name) != stage.input_hash]
+    status: Dict[str, str] = {stage.name: "skipped" for stage in stages if stage not in dirty}
+    if not dirty:
+        return status
+
+    def submit_args(stage: IngestStage) -> tuple:
+        return (stage.kind, stage.year, str(data_root / str(stage.year)), [str(path) for path in stage.inputs])
+
+    pool = ProcessPoolExecutor(max_workers=jobs) if jobs > 1 and len(dirty) > 1 else None
+    futures: Dict[str, Future] = {}
+    try:
+        if pool is not None:
+            futures = {stage.name: pool.submit(prepare_stage, *submit_args(stage)) for stage in dirty}
+
+        for stage in dirty:
+            failed_deps = [dep for dep in stage.deps if status.get(dep) == "failed"]
+            if failed_deps:
+                status[stage.name] = "failed"
+                print(f"[fail] {stage.name}: dependency failed ({', '.join(failed_deps)})")
+                continue
+            try:
+                if pool is not None:
+                    data = futures[stage.name].result()
+                else:
+                    data = prepare_stage(*submit_args(stage))
+                with conn:
+                    result = apply_stage(conn, stage, data)
+                    record_manifest(conn, stage, result)
+            except Exception as error:
+                status[stage.name] = "failed"
+                print(f"[fail] {stage.name}: {error}")
+                continue
+            status[stage.name] = "ran"
+            summary = " ".join(f"{key}={value}" for key, value in result.items())
+            print(f"[run] {stage.name}: {summary}")
+    finally:
+        if pool is not None:
+            pool.shutdown(cancel_futures=True)
+    return status
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Rebuild questions.db from the data folder, re-running only stages whose inputs changed."
+    )
+    parser.add_argument("--db-path", default="data/questions.db")
+    parser.add_argument("--data-root", default="data")
+    parser.add_argument("--years", nargs="*", type=int, default=[], help="기본값: data-root 아래 연도 폴더 전체")
+    parser.add_argument("--jobs", type=int, default=os.cpu_count() or 1, help="병렬 파싱 프로세스 수")
+    parser.add_argument("--force", action="store_true", help="입력 변경 여부와 무관하게 모든 단계를 다시 실행")
+    parser.add_argument("--dry-run", action="store_true", help="실행할 단계만 출력")
+    parser.add_argument("--data-index", default="", help="데이터 폴더 색인 캐시 파일(JSON). 지정 시 변경된 폴더만 다시 읽음")
+    add_profile_arguments(parser)
+    args = parser.parse_args()
+    configure_profiler(args)
+    try:
+        data_root = Path(args.data_root)
+        db_path = Path(args.db_path)
+        db_path.parent.mkdir(parents=True, exist_ok=True)
+        use_data_root_index(data_root, cache_path=Path(args.data_index) if args.data_index else None)
+        years = list(args.years) or discover_years(data_root)
+
+        stages = build_plan(data_root, years)
+        compute_stage_hashes(stages)
+
+        conn = sqlite3.connect(db_path)
+        try:
+            load_2025_questions.ensure_schema(conn)
+            import_solution_text.ensure_answered_column(conn)
+            import_ox_text.ensure_ox_table(conn)
+            ensure_manifest_table(conn)
+
+            if args.dry_run:
+                manifest = load_manifest(conn)
+                for stage in stages:
+                    state = "run" if args.force or manifest.get(stage.name) != stage.input_hash else "skip"
+                    print(f"[{state}] {stage.name}")
+                return
+
+            status = run_plan(conn, stages, data_root=data_root, jobs=max(1, int(args.jobs)), force=args.force)
+        finally:
+            conn.close()
+
+        counts = {key: sum(1 for value in status.values() if value == key) for key in ("ran", "skipped", "failed")}
+        print(f"stages={len(stages)} ran={counts['ran']} skipped={counts['skipped']} failed={counts['failed']}")
+        if counts["failed"]:
+            raise SystemExit(1)
+    finally:
+        finish_profiler()
+
+
+if __name__ == "__main__":
+    main()
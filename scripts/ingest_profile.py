@@ -0,0 +1,167 @@
+from __future__ import annotations
+
+import argparse
+import cProfile
+import json
+import re
+import time
+import tracemalloc
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Dict, Iterator, List, Tuple
+
+
+@dataclass
+class StageRecord:
+    stage: str
+    source: str
+    calls: int = 0
+    wall_s: float = 0.0
+    cpu_s: float = 0.0
+    peak_bytes: int = 0
+    rows_in: int = 0
+    rows_out: int = 0
+
+
+@dataclass
+class StageCall:
+    rows_in: int = 0
+    rows_out: int = 0
+    peak_seen: int = 0
+
+
+class StageProfiler:
+    """Per-stage wall/CPU/tracemalloc accounting keyed by (stage, source file).
+
+    Repeated calls of the same stage on the same source (e.g. parse_question_block
+    for each of the 80 questions in one PDF) are summed into one record. With a
+    profile directory, each stage name also gets a cProfile dump; nested stages
+    pause the outer profile so the dumps hold exclusive time.
+    """
+
+    def __init__(self, *, enabled: bool = False, profile_dir: Path | None = None) -> None:
+        self.enabled = enabled
+        self.profile_dir = profile_dir
+        self.records: Dict[Tuple[str, str], StageRecord] = {}
+        self.profiles: Dict[str, cProfile.Profile] = {}
+        self._stack: List[Tuple[StageCall, cProfile.Profile | None]] = []
+        self._owns_tracemalloc = False
+
+    def start(self) -> None:
+        if self.enabled and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._owns_tracemalloc = True
+
+    def stop(self) -> None:
+        if self._owns_tracemalloc:
+            tracemalloc.stop()
+            self._owns_tracemalloc = False
+
+    @contextmanager
+    def stage(self, name: str, *, source: object = "", rows_in: int = 0) -> Iterator[StageCall]:
+        call = StageCall(rows_in=int(rows_in))
+        if not self.enabled:
+            yield call
+            return
+
+        parent = self._stack[-1] if self._stack else None
+        start_current, running_peak = tracemalloc.get_traced_memory()
+        if parent is not None:
+            parent[0].peak_seen = max(parent[0].peak_seen, running_peak)
+            if parent[1] is not None:
+                parent[1].disable()
+        tracemalloc.reset_peak()
+
+        profile = None
+        if self.profile_dir is not None:
+            profile = self.profiles.setdefault(name, cProfile.Profile())
+        self._stack.append((call, profile))
+        if profile is not None:
+            profile.enable()
+
+        wall_start = time.perf_counter()
+        cpu_start = time.process_time()
+        try:
+            yield call
+        finally:
+            wall = time.perf_counter() - wall_start
+            cpu = time.process_time() - cpu_start
+            if profile is not None:
+                profile.disable()
+            self._stack.pop()
+
+            peak = max(call.peak_seen, tracemalloc.get_traced_memory()[1])
+            if parent is not None:
+                parent[0].peak_seen = max(parent[0].peak_seen, peak)
+                if parent[1] is not None:
+                    parent[1].enable()
+
+            key = (name, str(source))
+            record = self.records.get(key)
+            if record is None:
+                record = StageRecord(stage=name, source=str(source))
+                self.records[key] = record
+            record.calls += 1
+            record.wall_s += wall
+            record.cpu_s += cpu
+            record.peak_bytes = max(record.peak_bytes, peak - start_current)
+            record.rows_in += call.rows_in
+            record.rows_out += call.rows_out
+
+    def report(self) -> List[dict]:
+        rows: List[dict] = []
+        for record in self.records.values():
+            row = asdict(record)
+            row["wall_s"] = round(record.wall_s, 6)
+            row["cpu_s"] = round(record.cpu_s, 6)
+            rows.append(row)
+        return rows
+
+    def dump(self) -> None:
+        if not self.enabled:
+            return
+        report = {"stages": self.report()}
+        text = json.dumps(report, ensure_ascii=False, indent=2)
+        print(text)
+        if self.profile_dir is None:
+            return
+        self.profile_dir.mkdir(parents=True, exist_ok=True)
+        (self.profile_dir / "profile.json").write_text(text, encoding="utf-8")
+        for name, profile in self.profiles.items():
+            safe_name = re.sub(r"[^\w.-]+", "_", name)
+            profile.dump_stats(str(self.profile_dir / f"{safe_name}.prof"))
+
+
+PROFILER = StageProfiler()
+
+
+def profile_stage(name: str, *, source: object = "", rows_in: int = 0):
+    return PROFILER.stage(name, source=source, rows_in=rows_in)
+
+
+def add_profile_arguments(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument(
+        "--profile",
+        action="store_true",
+        help="단계별 wall/CPU 시간, tracemalloc 최대 메모리, 입출력 행 수를 JSON으로 출력",
+    )
+    parser.add_argument(
+        "--profile-dir",
+        default="",
+        help="지정 시 단계별 cProfile(.prof)과 profile.json을 이 폴더에 저장 (--profile 포함)",
+    )
+
+
+def configure_profiler(args: argparse.Namespace) -> StageProfiler:
+    global PROFILER
+    profile_dir = Path(args.profile_dir) if getattr(args, "profile_dir", "") else None
+    enabled = bool(getattr(args, "profile", False)) or profile_dir is not None
+    PROFILER = StageProfiler(enabled=enabled, profile_dir=profile_dir)
+    PROFILER.start()
+    return PROFILER
+
+
+def finish_profiler() -> None:
+    PROFILER.stop()
+    PROFILER.dump()
@@ -4,15 +4,19 @@ import argparse
 import json
 import re
 import sqlite3
+import sys
 from dataclasses import dataclass
 from html import escape
 from pathlib import Path
 from statistics import median
 from typing import Dict, Iterable, List, Tuple
 
-import pdfplumber
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT / "webapp"))
 
-from data_paths import find_year_file, list_year_pdfs
+from data_paths import find_year_file, list_year_pdfs, use_data_root_index
+from ingest_profile import add_profile_arguments, configure_profiler, finish_profiler, profile_stage
+from question_text import build_note_preview, ensure_answer_mask_triggers
 
 
 QUESTION_START_RE = re.compile(r"^(\d{1,2})\.(?:\s|$)")
@@ -353,6 +357,8 @@ def extract_pdf_lines_and_tables(
     pdf_path: Path,
     footer_cutoff: float = 60.0,
 ) -> tuple[List[ParsedLine], List[ParsedTable]]:
+    import pdfplumber
+
     lines: List[ParsedLine] = []
     tables: List[ParsedTable] = []
 
@@ -763,8 +769,20 @@ def parse_question_block(
 
 
 def parse_exam_pdf(pdf_path: Path) -> Dict[int, Dict[str, object]]:
-    lines, tables = extract_pdf_lines_and_tables(pdf_path)
-    boundaries = detect_question_boundaries(lines)
+    with profile_stage("extract_pdf_lines_and_tables", source=pdf_path) as stage:
+        lines, tables = extract_pdf_lines_and_tables(pdf_path)
+        stage.rows_out = len(lines) + len(tables)
+    return parse_extracted_questions(lines, tables, source=pdf_path)
+
+
+def parse_extracted_questions(
+    lines: List[ParsedLine],
+    tables: List[ParsedTable],
+    source: object = "",
+) -> Dict[int, Dict[str, object]]:
+    with profile_stage("detect_question_boundaries", source=source, rows_in=len(lines)) as stage:
+        boundaries = detect_question_boundaries(lines)
+        stage.rows_out = len(boundaries)
     parsed: Dict[int, Dict[str, object]] = {}
 
     for index, (start_idx, question_no) in enumerate(boundaries):
@@ -772,7 +790,9 @@ def parse_exam_pdf(pdf_path: Path) -> Dict[int, Dict[str, object]]:
         block = lines[start_idx:end_idx]
 
         block_tables = collect_tables_for_block(block, tables)
-        stem, options, stem_html, options_html = parse_question_block(question_no, block, block_tables)
+        with profile_stage("parse_question_block", source=source, rows_in=len(block)) as stage:
+            stem, options, stem_html, options_html = parse_question_block(question_no, block, block_tables)
+            stage.rows_out = 1
         parsed[question_no] = {
             "stem": stem,
             "options": options,
@@ -1013,11 +1033,16 @@ def build_question_rows(data_dir: Path, year: int) -> List[QuestionRow]:
         "민법": find_year_file(data_dir, "민법풀이.txt", kind="solution"),
         "행정소송법": find_year_file(data_dir, "행정소송법풀이.txt", kind="solution"),
     }
-    solution_map: Dict[str, Dict[int, Tuple[str, str]]] = {
-        subject: parse_solution_file(path) for subject, path in solution_files.items()
-    }
+    solution_map: Dict[str, Dict[int, Tuple[str, str]]] = {}
+    for subject, path in solution_files.items():
+        with profile_stage("parse_solution_file", source=path) as stage:
+            solution_map[subject] = parse_solution_file(path)
+            stage.rows_out = len(solution_map[subject])
 
-    published_map = parse_published_answers(find_year_file(data_dir, "실제정답.txt", kind="problem"))
+    published_path = find_year_file(data_dir, "실제정답.txt", kind="problem")
+    with profile_stage("parse_published_answers", source=published_path) as stage:
+        published_map = parse_published_answers(published_path)
+        stage.rows_out = len(published_map)
 
     for key, row in records.items():
         _, subject, number = key
@@ -1056,6 +1081,11 @@ def ensure_schema(conn: sqlite3.Connection) -> None:
         conn.execute('ALTER TABLE "문제" ADD COLUMN "렌더_마크업" TEXT')
     if "답변여부" not in columns:
         conn.execute('ALTER TABLE "문제" ADD COLUMN "답변여부" INTEGER NOT NULL DEFAULT 0')
+    if "미리보기" not in columns:
+        conn.execute('ALTER TABLE "문제" ADD COLUMN "미리보기" TEXT NOT NULL DEFAULT \'\'')
+    if "정답_비트" not in columns:
+        conn.execute('ALTER TABLE "문제" ADD COLUMN "정답_비트" INTEGER NOT NULL DEFAULT 0')
+    ensure_answer_mask_triggers(conn)
     conn.execute(
         """
         CREATE INDEX IF NOT EXISTS idx_문제_출제연도_과목
@@ -1069,10 +1099,11 @@ def upsert_questions(conn: sqlite3.Connection, rows: List[QuestionRow]) -> None:
     INSERT INTO 문제 (
         출제연도, 과목, 문제번호, 문제지문,
         보기_1, 보기_2, 보기_3, 보기_4, 보기_5,
-        답, 답_배포, 해설, 렌더_마크업
-    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+        답, 답_배포, 해설, 렌더_마크업, 미리보기
+    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
     ON CONFLICT(출제연도, 과목, 문제번호) DO UPDATE SET
         문제지문=excluded.문제지문,
+        미리보기=excluded.미리보기,
         보기_1=excluded.보기_1,
         보기_2=excluded.보기_2,
         보기_3=excluded.보기_3,
@@ -1101,6 +1132,7 @@ def upsert_questions(conn: sqlite3.Connection, rows: List[QuestionRow]) -> None:
                 row.답_배포,
                 row.해설,
                 row.렌더_마크업,
+                build_note_preview(row.문제지문),
             )
             for row in rows
         ],
@@ -1137,38 +1169,45 @@ def main() -> None:
     parser.add_argument("--data-dir", default="", help="단일 연도 폴더 직접 지정(레거시 호환)")
     parser.add_argument("--db-path", default="data/questions.db", help="SQLite DB 파일 경로")
     parser.add_argument("--year", type=int, default=2025, help="--data-dir 사용 시 출제연도")
+    add_profile_arguments(parser)
     args = parser.parse_args()
+    configure_profiler(args)
+    try:
+        db_path = Path(args.db_path)
+        db_path.parent.mkdir(parents=True, exist_ok=True)
+        all_rows: List[QuestionRow] = []
 
-    db_path = Path(args.db_path)
-    db_path.parent.mkdir(parents=True, exist_ok=True)
-    all_rows: List[QuestionRow] = []
-
-    if args.data_dir:
-        data_dir = Path(args.data_dir)
-        if not data_dir.exists():
-            raise FileNotFoundError(f"데이터 폴더를 찾을 수 없습니다: {data_dir}")
-        all_rows = build_question_rows(data_dir, args.year)
-    else:
-        data_root = Path(args.data_root)
-        for year in args.years:
-            data_dir = data_root / str(year)
+        if args.data_dir:
+            data_dir = Path(args.data_dir)
             if not data_dir.exists():
                 raise FileNotFoundError(f"데이터 폴더를 찾을 수 없습니다: {data_dir}")
-            print(f"파싱 중: {data_dir}")
-            year_rows = build_question_rows(data_dir, int(year))
-            print(f"  -> {len(year_rows)}문항")
-            all_rows.extend(year_rows)
-
-    conn = sqlite3.connect(db_path)
-    try:
-        ensure_schema(conn)
-        upsert_questions(conn, all_rows)
-        conn.commit()
+            all_rows = build_question_rows(data_dir, args.year)
+        else:
+            data_root = Path(args.data_root)
+            use_data_root_index(data_root)
+            for year in args.years:
+                data_dir = data_root / str(year)
+                if not data_dir.exists():
+                    raise FileNotFoundError(f"데이터 폴더를 찾을 수 없습니다: {data_dir}")
+                print(f"파싱 중: {data_dir}")
+                year_rows = build_question_rows(data_dir, int(year))
+                print(f"  -> {len(year_rows)}문항")
+                all_rows.extend(year_rows)
+
+        conn = sqlite3.connect(db_path)
+        try:
+            ensure_schema(conn)
+            with profile_stage("upsert_questions", source=db_path, rows_in=len(all_rows)) as stage:
+                upsert_questions(conn, all_rows)
+                conn.commit()
+                stage.rows_out = len(all_rows)
+        finally:
+            conn.close()
+
+        print(f"DB 적재 완료: {db_path}")
+        print_summary(all_rows)
     finally:
-        conn.close()
-
-    print(f"DB 적재 완료: {db_path}")
-    print_summary(all_rows)
+        finish_profiler()
 
 
 if __name__ == "__main__":
@@ -1,5 +1,5 @@
 """
-SQLite questions.db → Supabase PostgreSQL 마이그레이션 스크립트
+SQLite questions.db → Supabase PostgreSQL 동기화 스크립트
 
 사용법:
   1. 아래 환경변수를 설정하거나 .env 파일에 저장
@@ -10,21 +10,35 @@ SQLite questions.db → Supabase PostgreSQL 마이그레이션 스크립트
   3. python scripts/migrate_to_supabase.py
 
   먼저 Supabase에서 supabase/schema.sql 을 실행해야 합니다.
+
+  마지막으로 올린 각 행의 해시를 DB의 supabase_sync_state 테이블에 배치 단위로 기록하므로,
+  다시 실행하면 바뀐 행만 올리고 중단된 실행은 남은 행부터 이어서 올립니다.
+  로컬에서 사라진 행(예: OX 재가져오기로 삭제된 문항)은 Supabase에서도 삭제합니다.
+  --full 로 전체를 다시 올리고, --dry-run 으로 올릴 행 수만 확인할 수 있습니다.
+  로컬 테스트: python scripts/postgrest_standin.py 를 띄운 뒤 --url http://127.0.0.1:54321
 """
 
 from __future__ import annotations
 
+import argparse
+import hashlib
 import json
 import os
+import sqlite3
 import sys
 import time
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
 from pathlib import Path
+from urllib.parse import quote
 
 ROOT = Path(__file__).resolve().parent.parent
 sys.path.insert(0, str(ROOT / "webapp"))
 
 try:
     import requests
+    from requests.adapters import HTTPAdapter
 except ImportError:
     print("requests 패키지가 필요합니다: pip install requests")
     sys.exit(1)
@@ -35,42 +49,70 @@ try:
 except ImportError:
     pass
 
+import server
+from server import ensure_app_tables, fetch_notices, query_ox_questions, query_questions
+
 # ── 환경변수 ─────────────────────────────────────────────────────────────────
 SUPABASE_URL = os.getenv("SUPABASE_URL", "").rstrip("/")
 SUPABASE_KEY = os.getenv("SUPABASE_SERVICE_ROLE_KEY", "")
 
-if not SUPABASE_URL or not SUPABASE_KEY:
-    print("SUPABASE_URL 과 SUPABASE_SERVICE_ROLE_KEY 환경변수를 설정해주세요.")
-    sys.exit(1)
-
-HEADERS = {
-    "apikey": SUPABASE_KEY,
-    "Authorization": f"Bearer {SUPABASE_KEY}",
-    "Content-Type": "application/json",
-    "Prefer": "resolution=merge-duplicates",
-}
-
 BATCH_SIZE = 50  # Supabase REST API 한 번에 삽입할 행 수
 RETRY_DELAY = 2  # 실패 시 재시도 대기 (초)
+MAX_ATTEMPTS = 3
+DEFAULT_CONCURRENCY = 4  # 동시에 보내는 배치 수
+REQUEST_TIMEOUT = 30
 
+TABLE_SYNC_STATE = "supabase_sync_state"
+
+
+@dataclass
+class SyncTable:
+    name: str
+    on_conflict: str
+    rows: dict[str, dict]
+
+
+@dataclass
+class BatchResult:
+    table: str
+    index: int
+    keys: list[str]
+    ok: bool = False
+    status: int = 0
+    error: str = ""
+    attempts: int = 0
+    remote_ids: list[int | None] = field(default_factory=list)
+    rejected: dict[str, str] = field(default_factory=dict)
+
+    @property
+    def failed_keys(self) -> list[str]:
+        if self.rejected:
+            return list(self.rejected)
+        return [] if self.ok else list(self.keys)
+
+
+@dataclass
+class SyncJob:
+    method: str
+    url: str
+    prefer: str
+    payload: list[dict] | dict | None
+    entries: list[tuple[str, str]]
+    delete: bool = False
+
+
+@dataclass
+class SyncSummary:
+    pending: int = 0
+    removed: int = 0
+    pushed: int = 0
+    deleted: int = 0
+    failures: list[BatchResult] = field(default_factory=list)
 
-def supabase_upsert(table: str, rows: list[dict], *, on_conflict: str) -> bool:
-    """Supabase REST API로 배치 upsert. 실패 시 True 반환."""
-    url = f"{SUPABASE_URL}/rest/v1/{table}?on_conflict={on_conflict}"
-    headers = {**HEADERS, "Prefer": "resolution=merge-duplicates,return=minimal"}
-    for attempt in range(3):
-        try:
-            resp = requests.post(url, headers=headers, json=rows, timeout=30)
-            if resp.ok:
-                return True
-            print(f"  [WARN] {table} upsert 실패 (HTTP {resp.status_code}): {resp.text[:200]}")
-            if attempt < 2:
-                time.sleep(RETRY_DELAY)
-        except Exception as e:
-            print(f"  [ERROR] 네트워크 오류: {e}")
-            if attempt < 2:
-                time.sleep(RETRY_DELAY)
-    return False
+
+def row_hash(row: dict) -> str:
+    payload = json.dumps(row, ensure_ascii=False, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
 
 
 def batched(items: list, size: int):
@@ -78,97 +120,112 @@ def batched(items: list, size: int):
         yield items[i : i + size]
 
 
-def migrate_questions() -> None:
-    print("\n=== 기출문제 마이그레이션 ===")
-    try:
-        from server import SUBJECTS, fetch_questions
-    except ImportError as e:
-        print(f"  [ERROR] server.py import 실패: {e}")
-        return
-
-    years = [2025, 2024, 2023, 2022]
-    total = 0
-    for year in years:
-        for subject in SUBJECTS:
-            questions = fetch_questions(year, subject)
-            if not questions:
-                continue
-            rows = [
-                {
-                    "year": year,
-                    "subject": subject,
-                    "original_no": q["original_no"],
-                    "stem": q["stem"],
-                    "stem_html": q["stem_html"],
-                    "options": json.dumps(q["options"], ensure_ascii=False),
-                    "options_html": json.dumps(q["options_html"], ensure_ascii=False),
-                    "answer": q["answer"],
-                    "distributed_answer": q["distributed_answer"],
-                    "explanation": q["explanation"],
-                }
-                for q in questions
-            ]
-            ok = False
-            for batch in batched(rows, BATCH_SIZE):
-                ok = supabase_upsert("questions", batch, on_conflict="year,subject,original_no")
-            total += len(rows)
-            status = "✓" if ok else "✗"
-            print(f"  {status} {year} {subject}: {len(questions)}문제")
-    print(f"  총 {total}행 처리 완료")
-
-
-def migrate_ox_questions() -> None:
-    print("\n=== OX 문제 마이그레이션 ===")
-    try:
-        from server import SUBJECTS, fetch_ox_questions
-    except ImportError as e:
-        print(f"  [ERROR] server.py import 실패: {e}")
-        return
-
-    years = [2025, 2024, 2023, 2022]
-    total = 0
-    for year in years:
-        for subject in SUBJECTS:
-            questions = fetch_ox_questions(year, subject)
-            if not questions:
-                continue
-            rows = [
-                {
-                    "year": year,
-                    "subject": subject,
-                    "original_no": q["original_no"],
-                    "source_no": q.get("source_no", q["original_no"]),
-                    "stable_id": q.get("stable_id", ""),
-                    "question": q["question"],
-                    "answer": q["answer"],
-                    "explanation": q["explanation"],
-                }
-                for q in questions
-            ]
-            ok = False
-            for batch in batched(rows, BATCH_SIZE):
-                ok = supabase_upsert("ox_questions", batch, on_conflict="year,subject,original_no")
-            total += len(rows)
-            status = "✓" if ok else "✗"
-            print(f"  {status} {year} {subject}: {len(questions)}문제")
-    print(f"  총 {total}행 처리 완료")
-
-
-def migrate_notices() -> None:
-    print("\n=== 공지게시판 마이그레이션 ===")
-    try:
-        from server import fetch_notices
-    except ImportError as e:
-        print(f"  [ERROR] server.py import 실패: {e}")
-        return
-
-    notices = fetch_notices(include_unpublished=True)
-    if not notices:
-        print("  공지 없음 (건너뜀)")
-        return
-
-    rows = [
-        {
+def ensure_sync_state_table(conn: sqlite3.Connection) -> None:
+    conn.execute(
+        f"""
+        CREATE TABLE IF NOT EXISTS "{TABLE_SYNC_STATE}" (
+            "target" TEXT NOT NULL,
+            "table_name" TEXT NOT NULL,
+            "row_key" TEXT NOT NULL,
+            "row_hash" TEXT NOT NULL,
+            "remote_id" INTEGER,
+            "pushed_at" TEXT NOT NULL,
+            PRIMARY KEY ("target", "table_name", "row_key")
+        )
+        """
+    )
+    conn.commit()
+
+
+def load_sync_state(conn: sqlite3.Connection, *, target: str, table: str) -> dict[str, tuple[str, int | None]]:
+    rows = conn.execute(
+        f'SELECT "row_key", "row_hash", "remote_id" FROM "{TABLE_SYNC_STATE}" WHERE "target" = ? AND "table_name" = ?',
+        (target, table),
+    )
+    return {str(key): (str(digest), remote_id) for key, digest, remote_id in rows}
+
+
+def record_pushed(
+    conn: sqlite3.Connection,
+    *,
+    target: str,
+    table: str,
+    items: list[tuple[str, str, int | None]],
+) -> None:
+    pushed_at = datetime.now(timezone.utc).isoformat(timespec="seconds")
+    with conn:
+        conn.executemany(
+            f"""
+            INSERT INTO "{TABLE_SYNC_STATE}" ("target", "table_name", "row_key", "row_hash", "remote_id", "pushed_at")
+            VALUES (?, ?, ?, ?, ?, ?)
+            ON CONFLICT ("target", "table_name", "row_key") DO UPDATE SET
+                "row_hash" = excluded."row_hash",
+                "remote_id" = COALESCE(excluded."remote_id", "{TABLE_SYNC_STATE}"."remote_id"),
+                "pushed_at" = excluded."pushed_at"
+            """,
+            [(target, table, key, digest, remote_id, pushed_at) for key, digest, remote_id in items],
+        )
+
+
+def forget_pushed(conn: sqlite3.Connection, *, target: str, table: str, keys: list[str]) -> None:
+    with conn:
+        conn.executemany(
+            f'DELETE FROM "{TABLE_SYNC_STATE}" WHERE "target" = ? AND "table_name" = ? AND "row_key" = ?',
+            [(target, table, key) for key in keys],
+        )
+
+
+def list_year_subjects(conn: sqlite3.Connection, table: str) -> list[tuple[int, str]]:
+    sql = f"""
+        SELECT DISTINCT "{server.COL_YEAR}", "{server.COL_SUBJECT}"
+        FROM "{table}"
+        ORDER BY "{server.COL_YEAR}" DESC, "{server.COL_SUBJECT}" ASC
+    """
+    return [(int(year), str(subject)) for year, subject in conn.execute(sql)]
+
+
+def collect_questions(conn: sqlite3.Connection) -> SyncTable:
+    rows: dict[str, dict] = {}
+    for year, subject in list_year_subjects(conn, server.TABLE_QUESTIONS):
+        for q in query_questions(conn, year, subject):
+            rows[f"{year}:{subject}:{q['original_no']}"] = {
+                "year": year,
+                "subject": subject,
+                "original_no": q["original_no"],
+                "stem": q["stem"],
+                "stem_html": q["stem_html"],
+                "options": q["options"],
+                "options_html": q["options_html"],
+                "answer": q["answer"],
+                "distributed_answer": q["distributed_answer"],
+                "explanation": q["explanation"],
+            }
+    return SyncTable(name="questions", on_conflict="year,subject,original_no", rows=rows)
+
+
+def collect_ox_questions(conn: sqlite3.Connection) -> SyncTable:
+    rows: dict[str, dict] = {}
+    for year, subject in list_year_subjects(conn, server.TABLE_OX):
+        for q in query_ox_questions(conn, year, subject):
+            rows[f"{year}:{subject}:{q['stable_id']}"] = {
+                "year": year,
+                "subject": subject,
+                "original_no": q["original_no"],
+                "source_no": q.get("source_no", q["original_no"]),
+                "stable_id": q["stable_id"],
+                "question": q["question"],
+                "answer": q["answer"],
+                "explanation": q["explanation"],
+            }
+    # 원문번호는 재가져오기 때 바뀌므로 OX 행은 stable_id 로 식별한다.
+    return SyncTable(name="ox_questions", on_conflict="year,subject,stable_id", rows=rows)
+
+
+def collect_notices() -> SyncTable:
+    # 공지는 Supabase 쪽 id가 로컬 notice_id와 다르므로 처음에는 INSERT 하고,
+    # 돌려받은 id를 상태 테이블에 기억해 두었다가 수정분은 그 id로 PATCH 한다.
+    rows = {
+        str(n["notice_id"]): {
             "title": n["title"],
             "body": n["body"],
             "author": n["author"],
@@ -176,31 +233,301 @@ def migrate_notices() -> None:
             "created_at": n["created_at"] or None,
             "updated_at": n["updated_at"] or None,
         }
-        for n in notices
-    ]
+        for n in fetch_notices(include_unpublished=True)
+    }
+    return SyncTable(name="notices", on_conflict="", rows=rows)
 
-    # 공지는 id가 다를 수 있으므로 INSERT만 (중복 방지를 위해 기존 테이블 비우기 옵션)
-    url = f"{SUPABASE_URL}/rest/v1/notices"
-    hdrs = {**HEADERS, "Prefer": "return=minimal"}
-    resp = requests.post(url, headers=hdrs, json=rows, timeout=30)
-    if resp.ok:
-        print(f"  ✓ {len(rows)}건 삽입 완료")
+
+def make_session(concurrency: int) -> requests.Session:
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=1, pool_maxsize=max(1, concurrency))
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    session.headers.update(
+        {
+            "apikey": SUPABASE_KEY,
+            "Authorization": f"Bearer {SUPABASE_KEY}",
+            "Content-Type": "application/json",
+        }
+    )
+    return session
+
+
+def send_batch(
+    session: requests.Session,
+    *,
+    method: str,
+    url: str,
+    prefer: str,
+    rows: list[dict] | dict | None,
+    result: BatchResult,
+) -> BatchResult:
+    """재시도는 네트워크 오류와 429/5xx에만 한다. 4xx는 다시 보내도 같은 결과다.
+
+    여러 행을 담은 POST가 4xx로 거절되면 한 행씩 다시 보내 어떤 행이 문제인지 result.rejected 에 남긴다.
+    """
+    for attempt in range(1, MAX_ATTEMPTS + 1):
+        result.attempts = attempt
+        try:
+            resp = session.request(method, url, headers={"Prefer": prefer}, json=rows, timeout=REQUEST_TIMEOUT)
+        except requests.RequestException as e:
+            result.status, result.error = 0, f"네트워크 오류: {e}"
+        else:
+            result.status = resp.status_code
+            if resp.ok:
+                result.ok, result.error = True, ""
+                if "return=representation" in prefer:
+                    result.remote_ids = [item.get("id") for item in resp.json()]
+                return result
+            result.error = resp.text[:200]
+            if resp.status_code != 429 and resp.status_code < 500:
+                if isinstance(rows, list) and len(rows) > 1:
+                    return isolate_rejected_rows(session, method=method, url=url, prefer=prefer, rows=rows, result=result)
+                if isinstance(rows, list):
+                    result.rejected = {key: f"HTTP {result.status}: {result.error}" for key in result.keys}
+                return result
+        if attempt < MAX_ATTEMPTS:
+            time.sleep(RETRY_DELAY)
+    return result
+
+
+def isolate_rejected_rows(
+    session: requests.Session,
+    *,
+    method: str,
+    url: str,
+    prefer: str,
+    rows: list[dict],
+    result: BatchResult,
+) -> BatchResult:
+    remote_ids: list[int | None] = []
+    rejected: dict[str, str] = {}
+    for key, row in zip(result.keys, rows):
+        single = send_batch(
+            session,
+            method=method,
+            url=url,
+            prefer=prefer,
+            rows=[row],
+            result=BatchResult(table=result.table, index=result.index, keys=[key]),
+        )
+        result.attempts += single.attempts
+        if single.ok:
+            remote_ids.append(single.remote_ids[0] if single.remote_ids else None)
+        else:
+            remote_ids.append(None)
+            rejected[key] = single.rejected.get(key) or f"HTTP {single.status or '-'}: {single.error}"
+    result.ok = not rejected
+    result.rejected = rejected
+    result.remote_ids = remote_ids if "return=representation" in prefer else []
+    return result
+
+
+def delete_filters(
+    table: SyncTable,
+    keys: list[str],
+    previous: dict[str, tuple[str, int | None]],
+    *,
+    batch_size: int,
+) -> list[tuple[str, list[str]]]:
+    """로컬에서 사라진 행을 지우는 PostgREST 필터를 만든다. 키는 on_conflict 열 값(year:subject:식별자)이다."""
+    if not table.on_conflict:
+        by_id = [(key, previous[key][1]) for key in keys if previous[key][1] is not None]
+        return [
+            (f"id=in.({','.join(str(remote_id) for _, remote_id in chunk)})", [key for key, _ in chunk])
+            for chunk in batched(by_id, batch_size)
+        ]
+    year_col, subject_col, ident_col = table.on_conflict.split(",")
+    groups: dict[tuple[str, str], list[tuple[str, str]]] = {}
+    for key in keys:
+        year, rest = key.split(":", 1)
+        subject, ident = rest.rsplit(":", 1)
+        groups.setdefault((year, subject), []).append((key, ident))
+    filters: list[tuple[str, list[str]]] = []
+    for (year, subject), items in groups.items():
+        for chunk in batched(items, batch_size):
+            values = ",".join(f'"{ident}"' for _, ident in chunk)
+            filters.append(
+                (
+                    f"{year_col}=eq.{quote(year)}&{subject_col}=eq.{quote(subject)}&{ident_col}=in.({quote(values)})",
+                    [key for key, _ in chunk],
+                )
+            )
+    return filters
+
+
+def sync_table(
+    session: requests.Session,
+    conn: sqlite3.Connection,
+    table: SyncTable,
+    *,
+    target: str,
+    batch_size: int,
+    concurrency: int,
+    full: bool,
+    dry_run: bool,
+) -> SyncSummary:
+    """변경된 행만 동시에 최대 concurrency개 배치로 올리고, 로컬에서 사라진 행은 원격에서 지운다.
+
+    성공한 배치는 바로 상태 테이블에 기록한다. 거절된 행만 실패로 남고 나머지 행은 계속 진행한다.
+    """
+    previous = load_sync_state(conn, target=target, table=table.name)
+    state = {} if full else previous
+    pending = [
+        (key, row, digest)
+        for key, row in table.rows.items()
+        if (digest := row_hash(row)) != state.get(key, ("", None))[0]
+    ]
+    removed = [key for key in previous if key not in table.rows]
+    summary = SyncSummary(pending=len(pending), removed=len(removed))
+    if dry_run or not (pending or removed):
+        return summary
+
+    url = f"{target}/rest/v1/{table.name}"
+    jobs: list[SyncJob] = []
+    if table.on_conflict:
+        for chunk in batched(pending, batch_size):
+            jobs.append(
+                SyncJob(
+                    "POST",
+                    f"{url}?on_conflict={table.on_conflict}",
+                    "resolution=merge-duplicates,return=minimal",
+                    [row for _, row, _ in chunk],
+                    [(key, digest) for key, _, digest in chunk],
+                )
+            )
     else:
-        print(f"  ✗ 실패: {resp.text[:300]}")
+        inserts = [item for item in pending if previous.get(item[0], ("", None))[1] is None]
+        for key, row, digest in pending:
+            remote_id = previous.get(key, ("", None))[1]
+            if remote_id is not None:
+                jobs.append(SyncJob("PATCH", f"{url}?id=eq.{remote_id}", "return=minimal", row, [(key, digest)]))
+        for chunk in batched(inserts, batch_size):
+            jobs.append(
+                SyncJob(
+                    "POST",
+                    url,
+                    "return=representation",
+                    [row for _, row, _ in chunk],
+                    [(key, digest) for key, _, digest in chunk],
+                )
+            )
+        # 원격 id를 받기 전에 사라진 공지는 지울 원격 행이 없으니 상태만 정리한다.
+        unconfirmed = [key for key in removed if previous[key][1] is None]
+        if unconfirmed:
+            forget_pushed(conn, target=target, table=table.name, keys=unconfirmed)
+            summary.deleted += len(unconfirmed)
+    for query, keys in delete_filters(table, removed, previous, batch_size=batch_size):
+        jobs.append(SyncJob("DELETE", f"{url}?{query}", "return=minimal", None, [(key, "") for key in keys], delete=True))
+
+    def finish(future: Future, job: SyncJob) -> None:
+        result: BatchResult = future.result()
+        if not result.ok and not result.rejected:
+            summary.failures.append(result)
+            print(
+                f"  [FAIL] {table.name} 배치 #{result.index} {job.method} ({len(result.keys)}행, 시도 {result.attempts}회, "
+                f"HTTP {result.status or '-'}): {result.error}"
+            )
+            return
+        if result.rejected:
+            summary.failures.append(result)
+            for key, error in result.rejected.items():
+                print(f"  [REJECT] {table.name} {key}: {error}")
+        if job.delete:
+            forget_pushed(conn, target=target, table=table.name, keys=result.keys)
+            summary.deleted += len(result.keys)
+            return
+        remote_ids = result.remote_ids or [None] * len(job.entries)
+        accepted = [
+            (key, digest, remote_id)
+            for (key, digest), remote_id in zip(job.entries, remote_ids)
+            if key not in result.rejected
+        ]
+        record_pushed(conn, target=target, table=table.name, items=accepted)
+        summary.pushed += len(accepted)
+
+    with ThreadPoolExecutor(max_workers=max(1, concurrency)) as pool:
+        in_flight: dict[Future, SyncJob] = {}
+        for index, job in enumerate(jobs, start=1):
+            if len(in_flight) >= concurrency:
+                done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+                for future in done:
+                    finish(future, in_flight.pop(future))
+            result = BatchResult(table=table.name, index=index, keys=[key for key, _ in job.entries])
+            future = pool.submit(
+                send_batch, session, method=job.method, url=job.url, prefer=job.prefer, rows=job.payload, result=result
+            )
+            in_flight[future] = job
+        for future in list(in_flight):
+            finish(future, in_flight.pop(future))
+
+    return summary
 
 
 def main() -> None:
-    print("=== Supabase 마이그레이션 시작 ===")
-    print(f"  대상: {SUPABASE_URL}")
-    print()
+    parser = argparse.ArgumentParser(description="questions.db 내용을 Supabase에 동기화 (변경된 행만 업로드)")
+    parser.add_argument("--db-path", default=str(server.DB_PATH))
+    parser.add_argument("--url", default=SUPABASE_URL, help="기본값: SUPABASE_URL 환경변수")
+    parser.add_argument("--tables", nargs="+", choices=("questions", "ox", "notices"), default=["questions", "ox", "notices"])
+    parser.add_argument("--batch-size", type=int, default=BATCH_SIZE)
+    parser.add_argument("--concurrency", type=int, default=DEFAULT_CONCURRENCY, help="동시에 보내는 배치 수")
+    parser.add_argument("--full", action="store_true", help="동기화 상태를 무시하고 전체를 다시 업로드")
+    parser.add_argument("--dry-run", action="store_true", help="업로드할 행 수만 출력")
+    args = parser.parse_args()
+
+    target = str(args.url or "").rstrip("/")
+    if not target or not SUPABASE_KEY:
+        print("SUPABASE_URL 과 SUPABASE_SERVICE_ROLE_KEY 환경변수를 설정해주세요.")
+        sys.exit(1)
+
+    server.DB_PATH = Path(args.db_path)
+    if not server.DB_PATH.exists():
+        print(f"DB 파일을 찾을 수 없습니다: {server.DB_PATH}")
+        sys.exit(1)
+
+    print("=== Supabase 동기화 시작 ===")
+    print(f"  대상: {target}")
     print("  주의: Supabase에서 supabase/schema.sql 을 먼저 실행했는지 확인하세요.")
-    print()
 
-    migrate_questions()
-    migrate_ox_questions()
-    migrate_notices()
+    conn = sqlite3.connect(server.DB_PATH)
+    session = make_session(args.concurrency)
+    failed_batches = 0
+    try:
+        ensure_app_tables(conn)
+        ensure_sync_state_table(conn)
+        collectors = {
+            "questions": lambda: collect_questions(conn),
+            "ox": lambda: collect_ox_questions(conn),
+            "notices": collect_notices,
+        }
+        for name in args.tables:
+            table = collectors[name]()
+            print(f"\n=== {table.name} ===")
+            summary = sync_table(
+                session,
+                conn,
+                table,
+                target=target,
+                batch_size=max(1, int(args.batch_size)),
+                concurrency=max(1, int(args.concurrency)),
+                full=args.full,
+                dry_run=args.dry_run,
+            )
+            failed_batches += len(summary.failures)
+            failed_rows = sum(len(result.failed_keys) for result in summary.failures)
+            print(
+                f"  total={len(table.rows)} pending={summary.pending} pushed={summary.pushed} "
+                f"removed={summary.removed} deleted={summary.deleted} "
+                f"failed_rows={failed_rows} failed_batches={len(summary.failures)}"
+            )
+    finally:
+        session.close()
+        conn.close()
 
     print("\n=== 완료 ===")
+    if failed_batches:
+        print(f"  실패한 배치 {failed_batches}개: 다시 실행하면 실패한 행만 이어서 올립니다.")
+        sys.exit(1)
     print("  Supabase Dashboard > Table Editor 에서 데이터를 확인하세요.")
 
 
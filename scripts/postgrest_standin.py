@@ -0,0 +1,237 @@
+"""
+로컬 PostgREST 대용 서버 (migrate_to_supabase.py 테스트용)
+
+  python scripts/postgrest_standin.py --port 54321 --fail-every 5
+  SUPABASE_SERVICE_ROLE_KEY=local python scripts/migrate_to_supabase.py --url http://127.0.0.1:54321
+
+메모리에만 저장하며 /rest/v1/<table> 에 대해 다음만 흉내 낸다.
+  POST  ?on_conflict=a,b + Prefer: resolution=merge-duplicates  → upsert
+  POST  (on_conflict 없음)                                      → insert, id 자동 부여
+  PATCH ?id=eq.N                                                → 한 행 수정
+  DELETE ?col=eq.v&col=in.(a,b)                                 → 조건에 맞는 행 삭제
+  GET                                                           → 전체 행 조회
+--fail-every N 이면 N번째 쓰기 요청마다 503을 돌려준다.
+--unique ox_questions=year,subject,original_no 처럼 주면 그 열 조합의 UNIQUE 제약을 흉내 내어
+위반하는 요청 전체를 409로 거절한다.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import threading
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+
+class StandinStore:
+    def __init__(self, fail_every: int = 0, unique: dict[str, list[list[str]]] | None = None) -> None:
+        self.tables: dict[str, list[dict]] = {}
+        self.next_id: dict[str, int] = {}
+        self.fail_every = fail_every
+        self.unique = unique or {}
+        self.writes = 0
+        self.rows_written = 0
+        self.lock = threading.Lock()
+
+    def should_fail(self) -> bool:
+        with self.lock:
+            self.writes += 1
+            return self.fail_every > 0 and self.writes % self.fail_every == 0
+
+    def upsert(self, table: str, rows: list[dict], conflict_cols: list[str]) -> list[dict] | str:
+        """Upsert rows; returns the written rows, or an error message if the request violates --unique."""
+        with self.lock:
+            stored = self.tables.setdefault(table, [])
+            matches: list[dict | None] = []
+            for row in rows:
+                existing = None
+                if conflict_cols:
+                    key = tuple(row.get(col) for col in conflict_cols)
+                    existing = next((item for item in stored if tuple(item.get(col) for col in conflict_cols) == key), None)
+                matches.append(existing)
+            replaced = {id(item) for item in matches if item is not None}
+            after = [item for item in stored if id(item) not in replaced]
+            after += [{**existing, **row} if existing is not None else row for row, existing in zip(rows, matches)]
+            error = self.violation(table, after)
+            if error:
+                return error
+            written: list[dict] = []
+            for row, existing in zip(rows, matches):
+                if existing is not None:
+                    existing.update(row)
+                    written.append(existing)
+                    continue
+                new_id = self.next_id.get(table, 1)
+                self.next_id[table] = new_id + 1
+                item = {"id": new_id, **row}
+                stored.append(item)
+                written.append(item)
+            self.rows_written += len(rows)
+            return written
+
+    def violation(self, table: str, rows: list[dict]) -> str:
+        """Check the emulated UNIQUE constraints against the table as it would look after a write."""
+        for cols in self.unique.get(table, []):
+            seen: set[tuple] = set()
+            for item in rows:
+                key = tuple(item.get(col) for col in cols)
+                if key in seen:
+                    return f"duplicate key value violates unique constraint ({', '.join(cols)})={key}"
+                seen.add(key)
+        return ""
+
+    def delete(self, table: str, filters: dict[str, list[str]]) -> int:
+        with self.lock:
+            stored = self.tables.get(table, [])
+            keep = [item for item in stored if not all(str(item.get(col)) in values for col, values in filters.items())]
+            self.tables[table] = keep
+            self.rows_written += len(stored) - len(keep)
+            return len(stored) - len(keep)
+
+    def patch(self, table: str, row_id: int, values: dict) -> int:
+        with self.lock:
+            for item in self.tables.get(table, []):
+                if item.get("id") == row_id:
+                    item.update(values)
+                    self.rows_written += 1
+                    return 1
+            return 0
+
+
+class StandinHandler(BaseHTTPRequestHandler):
+    store: StandinStore
+
+    def _table(self) -> tuple[str, dict[str, list[str]]] | None:
+        parsed = urlparse(self.path)
+        prefix = "/rest/v1/"
+        if not parsed.path.startswith(prefix) or not parsed.path[len(prefix):]:
+            self._reply(HTTPStatus.NOT_FOUND, {"message": "unknown path"})
+            return None
+        if not self.headers.get("apikey"):
+            self._reply(HTTPStatus.UNAUTHORIZED, {"message": "missing apikey"})
+            return None
+        return parsed.path[len(prefix):], parse_qs(parsed.query)
+
+    def _body(self):
+        length = int(self.headers.get("Content-Length") or 0)
+        return json.loads(self.rfile.read(length) or b"null")
+
+    def _reply(self, status: int, payload=None) -> None:
+        body = b"" if payload is None else json.dumps(payload, ensure_ascii=False).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self) -> None:
+        target = self._table()
+        if target is not None:
+            self._reply(HTTPStatus.OK, self.store.tables.get(target[0], []))
+
+    def do_POST(self) -> None:
+        target = self._table()
+        if target is None:
+            return
+        table, query = target
+        rows = self._body()
+        if isinstance(rows, dict):
+            rows = [rows]
+        if not isinstance(rows, list):
+            self._reply(HTTPStatus.BAD_REQUEST, {"message": "expected JSON array"})
+            return
+        if self.store.should_fail():
+            self._reply(HTTPStatus.SERVICE_UNAVAILABLE, {"message": "injected failure"})
+            return
+        prefer = self.headers.get("Prefer", "")
+        conflict_cols: list[str] = []
+        if "resolution=merge-duplicates" in prefer:
+            conflict_cols = [col for col in (query.get("on_conflict") or [""])[0].split(",") if col]
+        written = self.store.upsert(table, rows, conflict_cols)
+        if isinstance(written, str):
+            self._reply(HTTPStatus.CONFLICT, {"code": "23505", "message": written})
+            return
+        if "return=representation" in prefer:
+            self._reply(HTTPStatus.CREATED, written)
+        else:
+            self._reply(HTTPStatus.CREATED)
+
+    def do_PATCH(self) -> None:
+        target = self._table()
+        if target is None:
+            return
+        table, query = target
+        id_filter = (query.get("id") or [""])[0]
+        if not id_filter.startswith("eq."):
+            self._reply(HTTPStatus.BAD_REQUEST, {"message": "expected id=eq.<n>"})
+            return
+        values = self._body()
+        if self.store.should_fail():
+            self._reply(HTTPStatus.SERVICE_UNAVAILABLE, {"message": "injected failure"})
+            return
+        self.store.patch(table, int(id_filter[3:]), values)
+        self._reply(HTTPStatus.NO_CONTENT)
+
+    def do_DELETE(self) -> None:
+        target = self._table()
+        if target is None:
+            return
+        table, query = target
+        filters: dict[str, list[str]] = {}
+        for col, values in query.items():
+            value = values[0]
+            if value.startswith("eq."):
+                filters[col] = [value[3:]]
+            elif value.startswith("in.(") and value.endswith(")"):
+                filters[col] = [item.strip().strip('"') for item in value[4:-1].split(",")]
+            else:
+                self._reply(HTTPStatus.BAD_REQUEST, {"message": f"unsupported filter {col}={value}"})
+                return
+        if not filters:
+            self._reply(HTTPStatus.BAD_REQUEST, {"message": "DELETE requires a filter"})
+            return
+        if self.store.should_fail():
+            self._reply(HTTPStatus.SERVICE_UNAVAILABLE, {"message": "injected failure"})
+            return
+        self.store.delete(table, filters)
+        self._reply(HTTPStatus.NO_CONTENT)
+
+    def log_message(self, format: str, *args) -> None:
+        return
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="In-memory PostgREST stand-in for testing migrate_to_supabase.py.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=54321)
+    parser.add_argument("--fail-every", type=int, default=0, help="N번째 쓰기 요청마다 503 응답")
+    parser.add_argument(
+        "--unique",
+        action="append",
+        default=[],
+        metavar="TABLE=COL,COL",
+        help="흉내 낼 UNIQUE 제약 (여러 번 지정 가능), 예: ox_questions=year,subject,stable_id",
+    )
+    args = parser.parse_args()
+
+    unique: dict[str, list[list[str]]] = {}
+    for spec in args.unique:
+        table, _, cols = spec.partition("=")
+        unique.setdefault(table, []).append([col for col in cols.split(",") if col])
+    StandinHandler.store = StandinStore(fail_every=max(0, int(args.fail_every)), unique=unique)
+    httpd = ThreadingHTTPServer((args.host, args.port), StandinHandler)
+    print(f"PostgREST stand-in: http://{args.host}:{args.port}/rest/v1/")
+    try:
+        httpd.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        store = StandinHandler.store
+        print(f"writes={store.writes} rows_written={store.rows_written}")
+        httpd.server_close()
+
+
+if __name__ == "__main__":
+    main()
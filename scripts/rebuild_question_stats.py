@@ -0,0 +1,62 @@
+from __future__ import annotations
+
+import argparse
+import sqlite3
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT / "webapp"))
+
+import server
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Recompute question_stats (attempts, correct, per-choice picks) from exam_attempts and ox_answer_log."
+    )
+    parser.add_argument("--db-path", default="data/questions.db")
+    parser.add_argument("--check-only", action="store_true", help="카운터를 고치지 않고 차이만 보고 (차이가 있으면 종료코드 1)")
+    parser.add_argument(
+        "--force", action="store_true", help="카운터 버퍼를 쓰는 서버가 실행 중이어도 진행 (버퍼의 미기록분이 이중으로 집계됨)"
+    )
+    args = parser.parse_args()
+
+    conn = sqlite3.connect(Path(args.db_path))
+    try:
+        server.ensure_app_tables(conn)
+        owner = server.question_stats_buffer_owner(conn)
+        if owner is not None and not args.force:
+            # Its buffered deltas belong to history rows that are already committed and would be counted twice.
+            print(
+                f"server pid {owner} is buffering question_stats; stop it (or run it with --stats-flush-ms 0) first",
+                file=sys.stderr,
+            )
+            sys.exit(2)
+        conn.execute("BEGIN IMMEDIATE")
+        drift = server.rebuild_question_stats(conn)
+        if args.check_only:
+            conn.rollback()
+        else:
+            conn.commit()
+        items, attempts = conn.execute(
+            f'SELECT COUNT(*), COALESCE(SUM("attempts"), 0) FROM "{server.TABLE_QUESTION_STATS}"'
+        ).fetchone()
+    finally:
+        conn.close()
+
+    for item in drift:
+        print(
+            f"drift source={item['source']} year={item['year']} subject={item['subject']} "
+            f"question_no={item['question_no']} stable_id={item['stable_id']} stored={item['stored']} actual={item['actual']}"
+        )
+    print(f"items={items}")
+    print(f"attempts={attempts}")
+    print(f"drifted={len(drift)}")
+    if drift and args.check_only:
+        sys.exit(1)
+    print("OK" if not drift else "REBUILT")
+
+
+if __name__ == "__main__":
+    main()
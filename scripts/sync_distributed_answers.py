@@ -4,8 +4,10 @@ import argparse
 import re
 import sqlite3
 from pathlib import Path
+from typing import Sequence
 
-from data_paths import find_year_file
+from data_paths import find_year_file, use_data_root_index
+from ingest_profile import add_profile_arguments, configure_profiler, finish_profiler, profile_stage
 
 
 TABLE_QUESTIONS = "문제"
@@ -14,6 +16,7 @@ COL_SUBJECT = "과목"
 COL_QNO = "문제번호"
 COL_ANSWER = "답"
 COL_DISTRIBUTED = "답_배포"
+TABLE_DISTRIBUTED_STAGING = "distributed_import"
 
 SUBJECTS = {
     "재정학",
@@ -68,6 +71,73 @@ def parse_published_answers(path: Path) -> dict[tuple[str, int], str]:
     return mapping
 
 
+def stage_published_answers(conn: sqlite3.Connection, mappings: dict[int, dict[tuple[str, int], str]]) -> int:
+    conn.execute(
+        f"""
+        CREATE TEMP TABLE IF NOT EXISTS "{TABLE_DISTRIBUTED_STAGING}" (
+            "year" INTEGER NOT NULL,
+            "subject" TEXT NOT NULL,
+            "qno" INTEGER NOT NULL,
+            "answer" TEXT NOT NULL,
+            PRIMARY KEY ("year", "subject", "qno")
+        )
+        """
+    )
+    conn.execute(f'DELETE FROM temp."{TABLE_DISTRIBUTED_STAGING}"')
+    rows = [
+        (int(year), subject, int(qno), answer)
+        for year, mapping in mappings.items()
+        for (subject, qno), answer in mapping.items()
+    ]
+    conn.executemany(f'INSERT OR REPLACE INTO temp."{TABLE_DISTRIBUTED_STAGING}" VALUES (?, ?, ?, ?)', rows)
+    return len(rows)
+
+
+def diff_staged_answers(conn: sqlite3.Connection, *, fallback_years: Sequence[int] = ()) -> list[tuple[int, str, int, str, str]]:
+    """Rows whose 답_배포 would change: staged published answers plus 답 copies for fallback years."""
+    params: list[object] = []
+    fallback_sql = ""
+    if fallback_years:
+        placeholders = ", ".join("?" for _ in fallback_years)
+        fallback_sql = f"""
+            UNION ALL
+            SELECT "{COL_YEAR}", "{COL_SUBJECT}", "{COL_QNO}", COALESCE("{COL_DISTRIBUTED}", ''), "{COL_ANSWER}"
+            FROM "{TABLE_QUESTIONS}"
+            WHERE "{COL_YEAR}" IN ({placeholders})
+              AND COALESCE(TRIM("{COL_ANSWER}"), '') <> ''
+              AND COALESCE("{COL_DISTRIBUTED}", '') <> "{COL_ANSWER}"
+        """
+        params.extend(int(year) for year in fallback_years)
+    sql = f"""
+        SELECT q."{COL_YEAR}", q."{COL_SUBJECT}", q."{COL_QNO}", COALESCE(q."{COL_DISTRIBUTED}", ''), s."answer"
+        FROM temp."{TABLE_DISTRIBUTED_STAGING}" s
+        JOIN "{TABLE_QUESTIONS}" q
+          ON q."{COL_YEAR}" = s."year" AND q."{COL_SUBJECT}" = s."subject" AND q."{COL_QNO}" = s."qno"
+        WHERE COALESCE(q."{COL_DISTRIBUTED}", '') <> s."answer"
+        {fallback_sql}
+        ORDER BY 1, 2, 3
+    """
+    return [
+        (int(year), str(subject), int(qno), str(old or ""), str(new or ""))
+        for year, subject, qno, old, new in conn.execute(sql, params)
+    ]
+
+
+def apply_staged_answers(conn: sqlite3.Connection) -> int:
+    cur = conn.execute(
+        f"""
+        UPDATE "{TABLE_QUESTIONS}"
+        SET "{COL_DISTRIBUTED}" = s."answer"
+        FROM temp."{TABLE_DISTRIBUTED_STAGING}" AS s
+        WHERE "{TABLE_QUESTIONS}"."{COL_YEAR}" = s."year"
+          AND "{TABLE_QUESTIONS}"."{COL_SUBJECT}" = s."subject"
+          AND "{TABLE_QUESTIONS}"."{COL_QNO}" = s."qno"
+          AND COALESCE("{TABLE_QUESTIONS}"."{COL_DISTRIBUTED}", '') <> s."answer"
+        """
+    )
+    return max(int(cur.rowcount or 0), 0)
+
+
 def update_from_mapping(
     conn: sqlite3.Connection,
     *,
@@ -76,18 +146,8 @@ def update_from_mapping(
 ) -> int:
     if not mapping:
         return 0
-
-    sql = f"""
-        UPDATE "{TABLE_QUESTIONS}"
-        SET "{COL_DISTRIBUTED}" = ?
-        WHERE "{COL_YEAR}" = ? AND "{COL_SUBJECT}" = ? AND "{COL_QNO}" = ?
-    """
-    updated = 0
-    for (subject, qno), answer in mapping.items():
-        cur = conn.execute(sql, (answer, year, subject, qno))
-        if cur.rowcount and cur.rowcount > 0:
-            updated += int(cur.rowcount)
-    return updated
+    stage_published_answers(conn, {int(year): mapping})
+    return apply_staged_answers(conn)
 
 
 def fallback_copy_from_answer(conn: sqlite3.Connection, *, year: int) -> int:
@@ -96,6 +156,7 @@ def fallback_copy_from_answer(conn: sqlite3.Connection, *, year: int) -> int:
         SET "{COL_DISTRIBUTED}" = "{COL_ANSWER}"
         WHERE "{COL_YEAR}" = ?
           AND COALESCE(TRIM("{COL_ANSWER}"), '') <> ''
+          AND COALESCE("{COL_DISTRIBUTED}", '') <> "{COL_ANSWER}"
     """
     cur = conn.execute(sql, (year,))
     return int(cur.rowcount or 0)
@@ -112,6 +173,24 @@ def count_filled(conn: sqlite3.Connection, *, year: int) -> tuple[int, int]:
     return int(total or 0), int(filled or 0)
 
 
+def count_filled_by_subject(conn: sqlite3.Connection, *, years: list[int]) -> dict[tuple[int, str], tuple[int, int]]:
+    if not years:
+        return {}
+    placeholders = ", ".join("?" for _ in years)
+    sql = f"""
+        SELECT "{COL_YEAR}", "{COL_SUBJECT}", COUNT(*),
+               SUM(CASE WHEN COALESCE(TRIM("{COL_DISTRIBUTED}"), '') <> '' THEN 1 ELSE 0 END)
+        FROM "{TABLE_QUESTIONS}"
+        WHERE "{COL_YEAR}" IN ({placeholders})
+        GROUP BY "{COL_YEAR}", "{COL_SUBJECT}"
+        ORDER BY "{COL_YEAR}", "{COL_SUBJECT}"
+    """
+    return {
+        (int(year), str(subject)): (int(total or 0), int(filled or 0))
+        for year, subject, total, filled in conn.execute(sql, [int(year) for year in years])
+    }
+
+
 def main() -> None:
     parser = argparse.ArgumentParser(
         description="Sync 문제.답_배포 from 실제정답.txt (fallback: 답)."
@@ -119,30 +198,61 @@ def main() -> None:
     parser.add_argument("--db-path", default="data/questions.db")
     parser.add_argument("--data-root", default="data")
     parser.add_argument("--years", nargs="+", type=int, default=[2023, 2024, 2025])
+    parser.add_argument("--dry-run", action="store_true", help="List 답_배포 values that would change without writing.")
+    add_profile_arguments(parser)
     args = parser.parse_args()
-
-    db_path = Path(args.db_path)
-    data_root = Path(args.data_root)
-
-    conn = sqlite3.connect(db_path)
+    configure_profiler(args)
     try:
+        db_path = Path(args.db_path)
+        data_root = Path(args.data_root)
+        use_data_root_index(data_root)
+
+        mappings: dict[int, dict[tuple[str, int], str]] = {}
+        fallback_years: list[int] = []
         for year in args.years:
             try:
                 txt_path = find_year_file(data_root / str(year), "실제정답.txt", kind="problem")
-                mapping = parse_published_answers(txt_path)
-                updated = update_from_mapping(conn, year=year, mapping=mapping)
-                source = str(txt_path)
             except FileNotFoundError:
-                updated = fallback_copy_from_answer(conn, year=year)
-                source = "fallback: 문제.답"
+                fallback_years.append(int(year))
+                print(f"[{year}] source=fallback: 문제.답")
+                continue
+            with profile_stage("parse_published_answers", source=txt_path) as stage:
+                mappings[int(year)] = parse_published_answers(txt_path)
+                stage.rows_out = len(mappings[int(year)])
+            print(f"[{year}] source={txt_path}")
 
-            total, filled = count_filled(conn, year=year)
-            print(f"[{year}] source={source}")
-            print(f"  updated={updated}, filled={filled}/{total}")
+        conn = sqlite3.connect(db_path)
+        try:
+            staged = stage_published_answers(conn, mappings)
+            if args.dry_run:
+                changes = diff_staged_answers(conn, fallback_years=fallback_years)
+                for year, subject, qno, old, new in changes:
+                    print(f"  {year} {subject} {qno}: '{old}' -> '{new}'")
+                print(f"would_update={len(changes)}")
+                conn.rollback()
+                return
 
-        conn.commit()
+            with profile_stage("sqlite_update", source=db_path, rows_in=staged) as stage:
+                updated = apply_staged_answers(conn)
+                for year in fallback_years:
+                    updated += fallback_copy_from_answer(conn, year=year)
+                stage.rows_out = updated
+            conn.commit()
+
+            counts = count_filled_by_subject(conn, years=list(args.years))
+        finally:
+            conn.close()
+
+        print(f"updated={updated}")
+        for year in args.years:
+            year_counts = {subject: value for (key_year, subject), value in counts.items() if key_year == int(year)}
+            total = sum(value[0] for value in year_counts.values())
+            filled = sum(value[1] for value in year_counts.values())
+            print(f"[{year}] filled={filled}/{total}")
+            for subject, (subject_total, subject_filled) in year_counts.items():
+                print(f"  {subject}: {subject_filled}/{subject_total}")
     finally:
-        conn.close()
+        finish_profiler()
 
 
 if __name__ == "__main__":
@@ -31,11 +31,15 @@ CREATE TABLE IF NOT EXISTS ox_questions (
   stable_id   TEXT    NOT NULL DEFAULT '',
   question    TEXT    NOT NULL DEFAULT '',
   answer      TEXT    NOT NULL DEFAULT '',
-  explanation TEXT    NOT NULL DEFAULT '',
-  UNIQUE (year, subject, original_no)
+  explanation TEXT    NOT NULL DEFAULT ''
 );
 
-CREATE INDEX IF NOT EXISTS idx_ox_questions_year_subject ON ox_questions (year, subject);
+-- stable_id 가 OX 행의 식별자다. 원문번호(original_no)는 OX 재가져오기 때 바뀔 수 있으므로
+-- 정렬용 인덱스만 두고, 동기화 스크립트는 (year, subject, stable_id) 로 upsert 한다.
+ALTER TABLE ox_questions DROP CONSTRAINT IF EXISTS ox_questions_year_subject_original_no_key;
+DROP INDEX IF EXISTS idx_ox_questions_year_subject;
+CREATE INDEX IF NOT EXISTS idx_ox_questions_order ON ox_questions (year, subject, original_no);
+CREATE UNIQUE INDEX IF NOT EXISTS idx_ox_questions_stable_id ON ox_questions (year, subject, stable_id);
 
 -- 3. 공지게시판
 CREATE TABLE IF NOT EXISTS notices (
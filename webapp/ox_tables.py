@@ -0,0 +1,77 @@
+from __future__ import annotations
+
+import sqlite3
+
+# Tables derived from OX/문제 offline (scripts/build_ox_*.py) and read by server.py.
+# The DDL lives here once so the build scripts and the server create the same schema.
+
+TABLE_OX_SIMILAR = "ox_similar"
+TABLE_OX_LINK = "ox_source_link"
+COL_YEAR = "출제연도"
+COL_SUBJECT = "과목"
+COL_QNO = "문제번호"
+COL_OPTION_NO = "보기번호"
+COL_STABLE_ID = "stable_id"
+
+OX_SIMILAR_KIND_OX = "ox"
+OX_SIMILAR_KIND_OPTION = "option"
+
+
+def ensure_ox_similar_table(conn: sqlite3.Connection) -> None:
+    conn.execute(
+        f"""
+        CREATE TABLE IF NOT EXISTS "{TABLE_OX_SIMILAR}" (
+            "cluster_id" INTEGER NOT NULL,
+            "kind" TEXT NOT NULL,
+            "{COL_YEAR}" INTEGER NOT NULL,
+            "{COL_SUBJECT}" TEXT NOT NULL,
+            "item_id" TEXT NOT NULL,
+            "{COL_QNO}" INTEGER NOT NULL DEFAULT 0,
+            "{COL_OPTION_NO}" INTEGER NOT NULL DEFAULT 0,
+            "similarity" REAL NOT NULL DEFAULT 1.0,
+            PRIMARY KEY ("kind", "{COL_YEAR}", "{COL_SUBJECT}", "item_id")
+        )
+        """
+    )
+    conn.execute(f'CREATE INDEX IF NOT EXISTS "idx_{TABLE_OX_SIMILAR}_cluster_id" ON "{TABLE_OX_SIMILAR}" ("cluster_id")')
+    conn.execute(f'CREATE INDEX IF NOT EXISTS "idx_{TABLE_OX_SIMILAR}_item_id" ON "{TABLE_OX_SIMILAR}" ("item_id")')
+
+
+# The individual tax laws drilled as OX subjects are all asked inside the 세법학개론 paper,
+# so their 원문번호 points at a 세법학개론 question. Other OX subjects share the paper's name.
+OX_QUESTION_SUBJECTS = {
+    "국세기본법": "세법학개론",
+    "국세징수법": "세법학개론",
+    "소득세법": "세법학개론",
+    "법인세법": "세법학개론",
+    "부가가치세법": "세법학개론",
+    "조세범처벌법": "세법학개론",
+}
+
+
+def question_subject_for_ox(subject: str) -> str:
+    """문제.과목 of the paper an OX subject's statements were written from."""
+    return OX_QUESTION_SUBJECTS.get(subject, subject)
+
+
+def ox_question_subject_sql(column: str) -> str:
+    """SQL expression mapping an OX 과목 column to the 문제.과목 it links to (see OX_QUESTION_SUBJECTS)."""
+    cases = " ".join(f"WHEN '{ox_subject}' THEN '{subject}'" for ox_subject, subject in OX_QUESTION_SUBJECTS.items())
+    return f"CASE {column} {cases} ELSE {column} END"
+
+
+def ensure_ox_link_table(conn: sqlite3.Connection) -> None:
+    # Keyed by the OX row; 문제번호 is the source question in question_subject_for_ox(과목).
+    conn.execute(
+        f"""
+        CREATE TABLE IF NOT EXISTS "{TABLE_OX_LINK}" (
+            "{COL_YEAR}" INTEGER NOT NULL,
+            "{COL_SUBJECT}" TEXT NOT NULL,
+            "{COL_STABLE_ID}" TEXT NOT NULL,
+            "{COL_QNO}" INTEGER NOT NULL,
+            "{COL_OPTION_NO}" INTEGER NOT NULL DEFAULT 0,
+            "score" REAL NOT NULL DEFAULT 0,
+            PRIMARY KEY ("{COL_YEAR}", "{COL_SUBJECT}", "{COL_STABLE_ID}")
+        ) WITHOUT ROWID
+        """
+    )
@@ -0,0 +1,118 @@
+from __future__ import annotations
+
+import re
+import sqlite3
+
+# Text helpers shared by server.py and the offline builders in scripts/, which store their
+# output (e.g. 미리보기, 정답_비트) for the server to read back, so both sides must compute it the same way.
+
+PUA_TRANSLATION = str.maketrans(
+    {
+        "\ue000": "A",
+        "\ue001": "B",
+        "\ue002": "C",
+        "\ue003": "D",
+        "\ue00c": "M",
+        "\ue00f": "P",
+        "\ue010": "Q",
+        "\ue012": "S",
+        "\ue014": "U",
+        "\ue016": "W",
+        "\ue017": "X",
+        "\ue034": "1",
+        "\ue035": "2",
+        "\ue036": "3",
+        "\ue037": "4",
+        "\ue038": "5",
+        "\ue039": "9",
+        "\ue03b": "8",
+        "\ue03d": "0",
+        "\ue044": "x",
+        "\ue045": "",
+        "\ue046": "-",
+        "\ue047": "=",
+        "\ue048": "+",
+        "\ue04b": "{",
+        "\ue04c": "}",
+        "\ue052": ",",
+        "\ue056": "Σ",
+        "\ue05c": "√",
+        "\ue06d": "",
+        "\ue0ed": "i",
+    }
+)
+PUA_RE = re.compile(r"[\ue000-\uf8ff]")
+NOTE_PREVIEW_CHARS = 140
+TABLE_QUESTIONS = "문제"
+COL_ANSWER = "답"
+COL_DISTRIBUTED = "답_배포"
+COL_ANSWER_MASK = "정답_비트"
+
+
+def normalize_question_text(text: str) -> str:
+    if not text:
+        return ""
+    normalized = text.replace("\r\n", "\n").replace("\r", "\n")
+    normalized = normalized.translate(PUA_TRANSLATION)
+    normalized = PUA_RE.sub("", normalized)
+    normalized = "\n".join(line.rstrip() for line in normalized.split("\n"))
+    return normalized.strip()
+
+
+def build_note_preview(text: str) -> str:
+    preview = normalize_question_text(text or "")
+    if len(preview) > NOTE_PREVIEW_CHARS:
+        preview = f"{preview[:NOTE_PREVIEW_CHARS]}..."
+    return preview
+
+
+def answer_mask(*answers: str | None) -> int:
+    """Choice bitmask (bit 0 = ①) of the first answer string naming any of 1-5, e.g. "1,3" -> 0b101.
+    Same rule as mock-exam.js: 답 first, 답_배포 when 답 is empty."""
+    for answer in answers:
+        mask = 0
+        for digit in re.findall(r"[1-5]", answer or ""):
+            mask |= 1 << (int(digit) - 1)
+        if mask:
+            return mask
+    return 0
+
+
+def answer_mask_sql(*columns: str) -> str:
+    """SQL expression computing answer_mask() over the given column expressions."""
+    masks = [
+        " | ".join(f"((instr(coalesce({column}, ''), '{digit}') > 0) << {digit - 1})" for digit in range(1, 6))
+        for column in columns
+    ]
+    return "coalesce(" + ", ".join(f"nullif({mask}, 0)" for mask in masks) + ", 0)"
+
+
+def ensure_answer_mask_triggers(conn: sqlite3.Connection) -> None:
+    # 정답_비트 is derived from 답/답_배포 and is what grading reads; recompute it on every write to
+    # either. Rows written before the triggers existed are repaired once, when they are created.
+    columns = {row[1] for row in conn.execute(f'PRAGMA table_info("{TABLE_QUESTIONS}")')}
+    if not columns:
+        return
+    if COL_ANSWER_MASK not in columns:
+        conn.execute(f'ALTER TABLE "{TABLE_QUESTIONS}" ADD COLUMN "{COL_ANSWER_MASK}" INTEGER NOT NULL DEFAULT 0')
+    triggers = {f"{TABLE_QUESTIONS}_{COL_ANSWER_MASK}_{suffix}" for suffix in ("ai", "au")}
+    existing = {
+        row[0]
+        for row in conn.execute(
+            f"SELECT name FROM sqlite_master WHERE type = 'trigger' AND tbl_name = '{TABLE_QUESTIONS}'"
+        )
+    }
+    if triggers <= existing:
+        return
+    new_mask = answer_mask_sql(f'NEW."{COL_ANSWER}"', f'NEW."{COL_DISTRIBUTED}"')
+    for suffix, event in (("ai", "INSERT"), ("au", f'UPDATE OF "{COL_ANSWER}", "{COL_DISTRIBUTED}"')):
+        conn.execute(
+            f"""
+            CREATE TRIGGER IF NOT EXISTS "{TABLE_QUESTIONS}_{COL_ANSWER_MASK}_{suffix}"
+            AFTER {event} ON "{TABLE_QUESTIONS}" BEGIN
+                UPDATE "{TABLE_QUESTIONS}" SET "{COL_ANSWER_MASK}" = {new_mask} WHERE rowid = NEW.rowid;
+            END
+            """
+        )
+    mask = answer_mask_sql(f'"{COL_ANSWER}"', f'"{COL_DISTRIBUTED}"')
+    conn.execute(f'UPDATE "{TABLE_QUESTIONS}" SET "{COL_ANSWER_MASK}" = {mask} WHERE "{COL_ANSWER_MASK}" != {mask}')
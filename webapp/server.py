@@ -1,17 +1,32 @@
 from __future__ import annotations
 
 import argparse
+import base64
 import json
 import os
 import re
+import signal
 import sqlite3
-from datetime import datetime
+import threading
+import time
+from datetime import datetime, timedelta
 from html import escape
 from http import HTTPStatus
 from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
 from pathlib import Path
 from urllib.parse import parse_qs, urlparse
 
+from ox_tables import (
+    OX_SIMILAR_KIND_OPTION,
+    OX_SIMILAR_KIND_OX,
+    TABLE_OX_LINK,
+    TABLE_OX_SIMILAR,
+    ensure_ox_link_table,
+    ensure_ox_similar_table,
+    question_subject_for_ox,
+)
+from question_text import build_note_preview, ensure_answer_mask_triggers, normalize_question_text
+
 ROOT_DIR = Path(__file__).resolve().parent
 DB_PATH = ROOT_DIR.parent / "data" / "questions.db"
 
@@ -41,7 +56,15 @@ TABLE_WRONG_NOTE = "오답노트"
 TABLE_APP_META = "app_meta"
 TABLE_QA_POST = "qa_posts"
 TABLE_QA_ANSWER = "qa_answers"
+TABLE_EXAM_ATTEMPT = "exam_attempts"
+TABLE_OX_ANSWER_LOG = "ox_answer_log"
+TABLE_QUESTION_STATS = "question_stats"
 TABLE_NOTICE = "공지게시판"
+TABLE_SEARCH = "search_index"
+TABLE_WRONG_NOTE_SEARCH = f"{TABLE_WRONG_NOTE}_fts"
+TABLE_WRONG_NOTE_CHANGES = f"{TABLE_WRONG_NOTE}_changes"
+TABLE_WRONG_NOTE_STATS = f"{TABLE_WRONG_NOTE}_stats"
+TABLE_WRONG_NOTE_REVIEW = f"{TABLE_WRONG_NOTE}_review"
 
 COL_QNO = "문제번호"
 COL_STEM = "문제지문"
@@ -52,8 +75,10 @@ COL_OPT_4 = "보기_4"
 COL_OPT_5 = "보기_5"
 COL_ANSWER = "답"
 COL_DISTRIBUTED = "답_배포"
+COL_ANSWER_MASK = "정답_비트"
 COL_EXPLANATION = "해설"
 COL_RENDER = "렌더_마크업"
+COL_PREVIEW = "미리보기"
 COL_YEAR = "출제연도"
 COL_SUBJECT = "과목"
 
@@ -61,15 +86,31 @@ COL_OX_QNO = "문제번호"
 COL_OX_QUESTION = "문제"
 COL_OX_ANSWER = "답"
 COL_OX_EXPLANATION = "해설"
+COL_OX_SOURCE_QNO = "원문번호"
+COL_OX_STABLE_ID = "stable_id"
+COL_OPTION_NO = "보기번호"
+OPTION_COLUMNS = (COL_OPT_1, COL_OPT_2, COL_OPT_3, COL_OPT_4, COL_OPT_5)
 
+COL_NOTE_ID = "오답노트id"
 COL_NOTE_IMPORTANCE = "중요도"
 COL_NOTE_COMMENT = "코멘트"
 COL_NOTE_UPDATED = "수정일시"
 COL_NOTE_USER = "user_id"
 COL_NOTE_SOURCE = "source"
+COL_CHANGE_SEQ = "seq"
+COL_CHANGE_DELETED = "deleted"
+COL_STATS_COUNT = "note_count"
+COL_REVIEW_NOTE_ID = "note_id"
+COL_REVIEW_DUE = "due_at"
+COL_REVIEW_INTERVAL = "interval_days"
+COL_REVIEW_EASE = "ease"
+COL_REVIEW_REPS = "reps"
+COL_REVIEW_LAPSES = "lapses"
+COL_REVIEW_REVIEWED = "reviewed_at"
 COL_META_KEY = "meta_key"
 COL_META_VALUE = "meta_value"
 FIRST_RUN_INIT_KEY = "first_run_user_note_reset_done"
+STATS_BUFFER_OWNER_KEY = "question_stats_buffer_pid"  # set while a server holds unwritten question_stats deltas
 NOTE_SOURCE_QUESTION = "question"
 NOTE_SOURCE_OX = "ox"
 
@@ -83,56 +124,43 @@ COL_NOTICE_UPDATED = "updated_at"
 COL_QA_POST_ID = "id"
 COL_QA_ANSWER_ID = "id"
 
-PUA_TRANSLATION = str.maketrans(
-    {
-        "\ue000": "A",
-        "\ue001": "B",
-        "\ue002": "C",
-        "\ue003": "D",
-        "\ue00c": "M",
-        "\ue00f": "P",
-        "\ue010": "Q",
-        "\ue012": "S",
-        "\ue014": "U",
-        "\ue016": "W",
-        "\ue017": "X",
-        "\ue034": "1",
-        "\ue035": "2",
-        "\ue036": "3",
-        "\ue037": "4",
-        "\ue038": "5",
-        "\ue039": "9",
-        "\ue03b": "8",
-        "\ue03d": "0",
-        "\ue044": "x",
-        "\ue045": "",
-        "\ue046": "-",
-        "\ue047": "=",
-        "\ue048": "+",
-        "\ue04b": "{",
-        "\ue04c": "}",
-        "\ue052": ",",
-        "\ue056": "Σ",
-        "\ue05c": "√",
-        "\ue06d": "",
-        "\ue0ed": "i",
-    }
-)
-PUA_RE = re.compile(r"[\ue000-\uf8ff]")
 MATH_LINE_RE = re.compile(r"^[A-Za-z0-9\s=+\-*/(),.{}\[\]_\\^%Σ√>|:]+$")
+SEARCH_PAGE_SIZE = 20
+SEARCH_MAX_PAGE_SIZE = 50
+SEARCH_SNIPPET_TOKENS = 24
+SEARCH_MARK_OPEN = "\x02"
+SEARCH_MARK_CLOSE = "\x03"
+SEARCH_MIN_INDEXED_TERM = 3  # trigram tokenizer: shorter terms can only be matched with LIKE
+SEARCH_SCAN_MAX_ROWS = 2000  # index rows a LIKE-only query (every term under 3 chars) may read
+WRONG_NOTE_PAGE_SIZE = 50
+WRONG_NOTE_MAX_PAGE_SIZE = 200
+WRONG_NOTE_CHANGES_PAGE_SIZE = 500
+WRONG_NOTE_CHANGES_MAX_PAGE_SIZE = 2000
+WRONG_NOTE_MERGE_MAX_ITEMS = 1000
+WRONG_NOTE_MAP_MAX_YEARS = 20
+WRONG_NOTE_BUNDLE_MAX_ITEMS = 200
+WRONG_NOTE_CONTENT_COLUMNS = 25  # leading columns of wrong_note_content_sql(), consumed by build_wrong_note_item()
+EXAM_ATTEMPTS_PAGE_SIZE = 20
+EXAM_ATTEMPTS_MAX_PAGE_SIZE = 100
+OX_CHOICES = ("O", "X")  # stored as choice 1 and 2 in ox_answer_log and question_stats.pick_1/pick_2
+OX_ANSWER_MAX_ITEMS = 500
+# question_stats counters in write order: attempts, correct, then one pick count per choice.
+STATS_PICK_COLUMNS = tuple(f"pick_{index}" for index in range(1, 6))
+STATS_COUNTER_COLUMNS = ("attempts", "correct", *STATS_PICK_COLUMNS)
+# Spaced repetition (SM-2): importance sets the first due date and scales every later interval.
+REVIEW_INITIAL_DAYS = {"red": 0, "yellow": 1, "green": 3, "gray": 7}
+REVIEW_INTERVAL_FACTOR = {"red": 0.5, "yellow": 0.8, "green": 1.0, "gray": 1.5}
+REVIEW_DEFAULT_INITIAL_DAYS = 1
+REVIEW_DEFAULT_EASE = 2.5
+REVIEW_MIN_EASE = 1.3
+REVIEW_PASS_GRADE = 3
+REVIEW_QUEUE_SIZE = 20
+REVIEW_QUEUE_MAX_SIZE = 100
+# Database file -> (st_dev, st_ino, PRAGMA schema_version) seen after the last full ensure_app_tables pass.
+_APP_TABLES_READY: dict[str, tuple[int, int, int]] = {}
 OX_QUESTION_PREFIX_RE = re.compile(r"^\s*(?:문제\s*)?(?:\d+|[①-⑳])\s*[\.\)\]:：\-]\s*")
 
 
-def normalize_question_text(text: str) -> str:
-    if not text:
-        return ""
-    normalized = text.replace("\r\n", "\n").replace("\r", "\n")
-    normalized = normalized.translate(PUA_TRANSLATION)
-    normalized = PUA_RE.sub("", normalized)
-    normalized = "\n".join(line.rstrip() for line in normalized.split("\n"))
-    return normalized.strip()
-
-
 def normalize_math_tex(text: str) -> str:
     tex = text
     tex = re.sub(r"√\s*([A-Za-z0-9_]+)", r"\\sqrt{\1}", tex)
@@ -224,6 +252,11 @@ def ensure_wrong_note_schema(conn: sqlite3.Connection) -> None:
     if has_user_col and has_source_col and unique_ok:
         return
 
+    # Note ids change when the table is rebuilt and the copy below bypasses the triggers, so the
+    # comment index, the counters and the review schedule are re-created from scratch afterwards.
+    conn.execute(f'DROP TABLE IF EXISTS "{TABLE_WRONG_NOTE_SEARCH}"')
+    conn.execute(f'DROP TABLE IF EXISTS "{TABLE_WRONG_NOTE_STATS}"')
+    conn.execute(f'DROP TABLE IF EXISTS "{TABLE_WRONG_NOTE_REVIEW}"')
     legacy_table = f"{TABLE_WRONG_NOTE}_legacy"
     conn.execute(f'DROP TABLE IF EXISTS "{legacy_table}"')
     conn.execute(f'ALTER TABLE "{TABLE_WRONG_NOTE}" RENAME TO "{legacy_table}"')
@@ -302,7 +335,361 @@ def ensure_wrong_note_schema(conn: sqlite3.Connection) -> None:
     conn.execute(f'DROP TABLE "{legacy_table}"')
 
 
+def ensure_wrong_note_search(conn: sqlite3.Connection) -> None:
+    """External-content trigram index over 오답노트.코멘트, kept in sync by triggers."""
+    exists = conn.execute(
+        "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?", (TABLE_WRONG_NOTE_SEARCH,)
+    ).fetchone()
+    conn.execute(
+        f"""
+        CREATE VIRTUAL TABLE IF NOT EXISTS "{TABLE_WRONG_NOTE_SEARCH}" USING fts5(
+            "{COL_NOTE_COMMENT}",
+            content = '{TABLE_WRONG_NOTE}',
+            content_rowid = '{COL_NOTE_ID}',
+            tokenize = 'trigram'
+        )
+        """
+    )
+    conn.execute(
+        f"""
+        CREATE TRIGGER IF NOT EXISTS "{TABLE_WRONG_NOTE_SEARCH}_ai" AFTER INSERT ON "{TABLE_WRONG_NOTE}" BEGIN
+            INSERT INTO "{TABLE_WRONG_NOTE_SEARCH}" (rowid, "{COL_NOTE_COMMENT}")
+            VALUES (new."{COL_NOTE_ID}", new."{COL_NOTE_COMMENT}");
+        END
+        """
+    )
+    conn.execute(
+        f"""
+        CREATE TRIGGER IF NOT EXISTS "{TABLE_WRONG_NOTE_SEARCH}_ad" AFTER DELETE ON "{TABLE_WRONG_NOTE}" BEGIN
+            INSERT INTO "{TABLE_WRONG_NOTE_SEARCH}" ("{TABLE_WRONG_NOTE_SEARCH}", rowid, "{COL_NOTE_COMMENT}")
+            VALUES ('delete', old."{COL_NOTE_ID}", old."{COL_NOTE_COMMENT}");
+        END
+        """
+    )
+    conn.execute(
+        f"""
+        CREATE TRIGGER IF NOT EXISTS "{TABLE_WRONG_NOTE_SEARCH}_au"
+        AFTER UPDATE OF "{COL_NOTE_COMMENT}" ON "{TABLE_WRONG_NOTE}" BEGIN
+            INSERT INTO "{TABLE_WRONG_NOTE_SEARCH}" ("{TABLE_WRONG_NOTE_SEARCH}", rowid, "{COL_NOTE_COMMENT}")
+            VALUES ('delete', old."{COL_NOTE_ID}", old."{COL_NOTE_COMMENT}");
+            INSERT INTO "{TABLE_WRONG_NOTE_SEARCH}" (rowid, "{COL_NOTE_COMMENT}")
+            VALUES (new."{COL_NOTE_ID}", new."{COL_NOTE_COMMENT}");
+        END
+        """
+    )
+    if exists is None:
+        conn.execute(f"INSERT INTO \"{TABLE_WRONG_NOTE_SEARCH}\" (\"{TABLE_WRONG_NOTE_SEARCH}\") VALUES ('rebuild')")
+
+
+def ensure_wrong_note_changes(conn: sqlite3.Connection) -> None:
+    """Append-only log of 오답노트 writes; seq is the sync cursor handed to clients.
+
+    Triggers record every insert/update as the note's new state and every delete as a
+    tombstone, so any write path (single upsert or batch) shows up in the feed.
+    """
+    conn.execute(
+        f"""
+        CREATE TABLE IF NOT EXISTS "{TABLE_WRONG_NOTE_CHANGES}" (
+            "{COL_CHANGE_SEQ}" INTEGER PRIMARY KEY AUTOINCREMENT,
+            "{COL_NOTE_USER}" TEXT NOT NULL,
+            "{COL_NOTE_SOURCE}" TEXT NOT NULL,
+            "{COL_YEAR}" INTEGER NOT NULL,
+            "{COL_SUBJECT}" TEXT NOT NULL,
+            "{COL_QNO}" INTEGER NOT NULL,
+            "{COL_NOTE_IMPORTANCE}" TEXT NOT NULL DEFAULT '',
+            "{COL_NOTE_COMMENT}" TEXT NOT NULL DEFAULT '',
+            "{COL_NOTE_UPDATED}" TEXT NOT NULL DEFAULT '',
+            "{COL_CHANGE_DELETED}" INTEGER NOT NULL DEFAULT 0
+        )
+        """
+    )
+    conn.execute(
+        f"""
+        CREATE INDEX IF NOT EXISTS "idx_{TABLE_WRONG_NOTE_CHANGES}_user_id_{COL_CHANGE_SEQ}"
+        ON "{TABLE_WRONG_NOTE_CHANGES}" ("{COL_NOTE_USER}", "{COL_CHANGE_SEQ}")
+        """
+    )
+    key_columns = f'"{COL_NOTE_USER}", "{COL_NOTE_SOURCE}", "{COL_YEAR}", "{COL_SUBJECT}", "{COL_QNO}"'
+    # Tombstone lookup for last-writer-wins merges (merge_wrong_notes).
+    conn.execute(
+        f'CREATE INDEX IF NOT EXISTS "idx_{TABLE_WRONG_NOTE_CHANGES}_note" ON "{TABLE_WRONG_NOTE_CHANGES}" ({key_columns}, "{COL_CHANGE_SEQ}")'
+    )
+    state_columns = f'"{COL_NOTE_IMPORTANCE}", "{COL_NOTE_COMMENT}", "{COL_NOTE_UPDATED}"'
+    new_values = ", ".join(
+        f'new."{column}"'
+        for column in (COL_NOTE_USER, COL_NOTE_SOURCE, COL_YEAR, COL_SUBJECT, COL_QNO, COL_NOTE_IMPORTANCE, COL_NOTE_COMMENT, COL_NOTE_UPDATED)
+    )
+    old_key = ", ".join(f'old."{column}"' for column in (COL_NOTE_USER, COL_NOTE_SOURCE, COL_YEAR, COL_SUBJECT, COL_QNO))
+    for suffix, event in (("ai", "INSERT"), ("au", "UPDATE")):
+        conn.execute(
+            f"""
+            CREATE TRIGGER IF NOT EXISTS "{TABLE_WRONG_NOTE_CHANGES}_{suffix}" AFTER {event} ON "{TABLE_WRONG_NOTE}" BEGIN
+                INSERT INTO "{TABLE_WRONG_NOTE_CHANGES}" ({key_columns}, {state_columns})
+                VALUES ({new_values});
+            END
+            """
+        )
+    conn.execute(
+        f"""
+        CREATE TRIGGER IF NOT EXISTS "{TABLE_WRONG_NOTE_CHANGES}_ad" AFTER DELETE ON "{TABLE_WRONG_NOTE}" BEGIN
+            INSERT INTO "{TABLE_WRONG_NOTE_CHANGES}" ({key_columns}, "{COL_NOTE_UPDATED}", "{COL_CHANGE_DELETED}")
+            VALUES ({old_key}, strftime('%Y-%m-%d %H:%M:%S', 'now', 'localtime'), 1);
+        END
+        """
+    )
+
+
+def ensure_wrong_note_stats(conn: sqlite3.Connection) -> None:
+    """Per-user note counts by (source, 과목, 중요도), kept current by triggers on 오답노트."""
+    exists = conn.execute(
+        "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?", (TABLE_WRONG_NOTE_STATS,)
+    ).fetchone()
+    bucket_columns = (COL_NOTE_USER, COL_NOTE_SOURCE, COL_SUBJECT, COL_NOTE_IMPORTANCE)
+    bucket = ", ".join(f'"{column}"' for column in bucket_columns)
+    conn.execute(
+        f"""
+        CREATE TABLE IF NOT EXISTS "{TABLE_WRONG_NOTE_STATS}" (
+            "{COL_NOTE_USER}" TEXT NOT NULL,
+            "{COL_NOTE_SOURCE}" TEXT NOT NULL,
+            "{COL_SUBJECT}" TEXT NOT NULL,
+            "{COL_NOTE_IMPORTANCE}" TEXT NOT NULL,
+            "{COL_STATS_COUNT}" INTEGER NOT NULL DEFAULT 0,
+            PRIMARY KEY ({bucket})
+        ) WITHOUT ROWID
+        """
+    )
+    new_values = ", ".join(f'new."{column}"' for column in bucket_columns)
+    old_match = " AND ".join(f'"{column}" = old."{column}"' for column in bucket_columns)
+    increment = f"""
+        INSERT INTO "{TABLE_WRONG_NOTE_STATS}" ({bucket}, "{COL_STATS_COUNT}") VALUES ({new_values}, 1)
+        ON CONFLICT ({bucket}) DO UPDATE SET "{COL_STATS_COUNT}" = "{COL_STATS_COUNT}" + 1;
+    """
+    decrement = f"""
+        UPDATE "{TABLE_WRONG_NOTE_STATS}" SET "{COL_STATS_COUNT}" = "{COL_STATS_COUNT}" - 1 WHERE {old_match};
+        DELETE FROM "{TABLE_WRONG_NOTE_STATS}" WHERE {old_match} AND "{COL_STATS_COUNT}" <= 0;
+    """
+    bucket_changed = " OR ".join(f'old."{column}" IS NOT new."{column}"' for column in bucket_columns)
+    conn.execute(
+        f"""
+        CREATE TRIGGER IF NOT EXISTS "{TABLE_WRONG_NOTE_STATS}_ai" AFTER INSERT ON "{TABLE_WRONG_NOTE}" BEGIN
+            {increment}
+        END
+        """
+    )
+    conn.execute(
+        f"""
+        CREATE TRIGGER IF NOT EXISTS "{TABLE_WRONG_NOTE_STATS}_ad" AFTER DELETE ON "{TABLE_WRONG_NOTE}" BEGIN
+            {decrement}
+        END
+        """
+    )
+    conn.execute(
+        f"""
+        CREATE TRIGGER IF NOT EXISTS "{TABLE_WRONG_NOTE_STATS}_au"
+        AFTER UPDATE OF {bucket} ON "{TABLE_WRONG_NOTE}" WHEN {bucket_changed} BEGIN
+            {decrement}
+            {increment}
+        END
+        """
+    )
+    if exists is None:
+        rebuild_wrong_note_stats(conn)
+
+
+def rebuild_wrong_note_stats(conn: sqlite3.Connection) -> list[dict]:
+    """Recount every bucket from 오답노트, replace the counters and return the buckets that had drifted."""
+    bucket = f'"{COL_NOTE_USER}", "{COL_NOTE_SOURCE}", "{COL_SUBJECT}", "{COL_NOTE_IMPORTANCE}"'
+    stored = {
+        tuple(row[:4]): int(row[4])
+        for row in conn.execute(f'SELECT {bucket}, "{COL_STATS_COUNT}" FROM "{TABLE_WRONG_NOTE_STATS}"')
+    }
+    actual = {
+        tuple(row[:4]): int(row[4])
+        for row in conn.execute(f'SELECT {bucket}, COUNT(*) FROM "{TABLE_WRONG_NOTE}" GROUP BY {bucket}')
+    }
+    drift: list[dict] = []
+    for key in sorted(set(stored) | set(actual)):
+        if stored.get(key, 0) != actual.get(key, 0):
+            user_id, source, subject, importance = key
+            drift.append(
+                {
+                    "user_id": user_id,
+                    "source": source,
+                    "subject": subject,
+                    "importance": importance,
+                    "stored": stored.get(key, 0),
+                    "actual": actual.get(key, 0),
+                }
+            )
+    if drift:
+        conn.execute(f'DELETE FROM "{TABLE_WRONG_NOTE_STATS}"')
+        conn.executemany(
+            f'INSERT INTO "{TABLE_WRONG_NOTE_STATS}" ({bucket}, "{COL_STATS_COUNT}") VALUES (?, ?, ?, ?, ?)',
+            [(*key, count) for key, count in actual.items()],
+        )
+    return drift
+
+
+def review_initial_days_sql(importance_expr: str) -> str:
+    cases = " ".join(f"WHEN '{level}' THEN {days}" for level, days in REVIEW_INITIAL_DAYS.items())
+    return f"CASE {importance_expr} {cases} ELSE {REVIEW_DEFAULT_INITIAL_DAYS} END"
+
+
+def ensure_wrong_note_review(conn: sqlite3.Connection) -> None:
+    """SM-2 schedule per note. Kept apart from 오답노트 so grading a review does not show up as a
+    note edit in the change feed; triggers create, tighten and drop schedules as notes change."""
+    exists = conn.execute(
+        "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?", (TABLE_WRONG_NOTE_REVIEW,)
+    ).fetchone()
+    conn.execute(
+        f"""
+        CREATE TABLE IF NOT EXISTS "{TABLE_WRONG_NOTE_REVIEW}" (
+            "{COL_REVIEW_NOTE_ID}" INTEGER PRIMARY KEY,
+            "{COL_NOTE_USER}" TEXT NOT NULL,
+            "{COL_REVIEW_DUE}" TEXT NOT NULL,
+            "{COL_REVIEW_INTERVAL}" INTEGER NOT NULL DEFAULT 0,
+            "{COL_REVIEW_EASE}" REAL NOT NULL DEFAULT {REVIEW_DEFAULT_EASE},
+            "{COL_REVIEW_REPS}" INTEGER NOT NULL DEFAULT 0,
+            "{COL_REVIEW_LAPSES}" INTEGER NOT NULL DEFAULT 0,
+            "{COL_REVIEW_REVIEWED}" TEXT NOT NULL DEFAULT ''
+        )
+        """
+    )
+    # note_id is the rowid, so this index also yields (due_at, note_id) order for the queue.
+    conn.execute(
+        f"""
+        CREATE INDEX IF NOT EXISTS "idx_{TABLE_WRONG_NOTE_REVIEW}_user_id_{COL_REVIEW_DUE}"
+        ON "{TABLE_WRONG_NOTE_REVIEW}" ("{COL_NOTE_USER}", "{COL_REVIEW_DUE}")
+        """
+    )
+    new_days = review_initial_days_sql(f'new."{COL_NOTE_IMPORTANCE}"')
+    first_due = f"datetime('now', 'localtime', '+' || ({new_days}) || ' days')"
+    conn.execute(
+        f"""
+        CREATE TRIGGER IF NOT EXISTS "{TABLE_WRONG_NOTE_REVIEW}_ai" AFTER INSERT ON "{TABLE_WRONG_NOTE}" BEGIN
+            INSERT OR REPLACE INTO "{TABLE_WRONG_NOTE_REVIEW}" ("{COL_REVIEW_NOTE_ID}", "{COL_NOTE_USER}", "{COL_REVIEW_DUE}")
+            VALUES (new."{COL_NOTE_ID}", new."{COL_NOTE_USER}", {first_due});
+        END
+        """
+    )
+    conn.execute(
+        f"""
+        CREATE TRIGGER IF NOT EXISTS "{TABLE_WRONG_NOTE_REVIEW}_ad" AFTER DELETE ON "{TABLE_WRONG_NOTE}" BEGIN
+            DELETE FROM "{TABLE_WRONG_NOTE_REVIEW}" WHERE "{COL_REVIEW_NOTE_ID}" = old."{COL_NOTE_ID}";
+        END
+        """
+    )
+    # Raising a note's importance pulls its next review forward; lowering it never pushes it back.
+    conn.execute(
+        f"""
+        CREATE TRIGGER IF NOT EXISTS "{TABLE_WRONG_NOTE_REVIEW}_au"
+        AFTER UPDATE OF "{COL_NOTE_IMPORTANCE}" ON "{TABLE_WRONG_NOTE}"
+        WHEN old."{COL_NOTE_IMPORTANCE}" IS NOT new."{COL_NOTE_IMPORTANCE}" BEGIN
+            UPDATE "{TABLE_WRONG_NOTE_REVIEW}" SET "{COL_REVIEW_DUE}" = MIN("{COL_REVIEW_DUE}", {first_due})
+            WHERE "{COL_REVIEW_NOTE_ID}" = new."{COL_NOTE_ID}";
+        END
+        """
+    )
+    if exists is None:
+        initial_days = review_initial_days_sql(f'"{COL_NOTE_IMPORTANCE}"')
+        conn.execute(
+            f"""
+            INSERT OR IGNORE INTO "{TABLE_WRONG_NOTE_REVIEW}" ("{COL_REVIEW_NOTE_ID}", "{COL_NOTE_USER}", "{COL_REVIEW_DUE}")
+            SELECT
+                "{COL_NOTE_ID}", "{COL_NOTE_USER}",
+                COALESCE(
+                    datetime("{COL_NOTE_UPDATED}", '+' || ({initial_days}) || ' days'),
+                    datetime('now', 'localtime', '+' || ({initial_days}) || ' days')
+                )
+            FROM "{TABLE_WRONG_NOTE}"
+            """
+        )
+
+
+def wrong_note_comment_filter(comment: str) -> tuple[str, object]:
+    """WHERE fragment for a substring search on n.코멘트.
+
+    Trigram phrases match any substring of 3+ characters through the index; shorter
+    input has no trigram to look up and stays a LIKE over the user's notes.
+    """
+    if len(comment) >= SEARCH_MIN_INDEXED_TERM:
+        phrase = '"' + comment.replace('"', '""') + '"'
+        return (
+            f'n."{COL_NOTE_ID}" IN (SELECT rowid FROM "{TABLE_WRONG_NOTE_SEARCH}" WHERE "{TABLE_WRONG_NOTE_SEARCH}" MATCH ?)',
+            phrase,
+        )
+    return f'n."{COL_NOTE_COMMENT}" LIKE ?', f"%{comment}%"
+
+
+def app_tables_signature(conn: sqlite3.Connection) -> tuple[str, tuple[int, int, int]] | None:
+    """Identify the database file and schema a connection sees; changes when the file is replaced or migrated."""
+    db_file = str(conn.execute("PRAGMA database_list").fetchone()[2] or "")
+    if not db_file:
+        return None
+    try:
+        stat = os.stat(db_file)
+    except OSError:
+        return None
+    schema_version = int(conn.execute("PRAGMA schema_version").fetchone()[0])
+    return db_file, (stat.st_dev, stat.st_ino, schema_version)
+
+
+def clean_wrong_note_importance(conn: sqlite3.Connection) -> None:
+    """Reset 중요도 values outside IMPORTANCE_LEVELS; the partial index keeps the common no-op case to a lookup."""
+    canonical = ", ".join(f"'{level}'" for level in (DEFAULT_IMPORTANCE, *IMPORTANCE_LEVELS))
+    noncanonical = f'"{COL_NOTE_IMPORTANCE}" NOT IN ({canonical})'
+    dirty = conn.execute(f'SELECT 1 FROM "{TABLE_WRONG_NOTE}" WHERE {noncanonical} LIMIT 1').fetchone()
+    if dirty is None:
+        return
+    placeholders = ", ".join("?" for _ in IMPORTANCE_LEVELS)
+    conn.execute(
+        f"""
+        UPDATE "{TABLE_WRONG_NOTE}"
+        SET "{COL_NOTE_IMPORTANCE}" = ?
+        WHERE {noncanonical}
+          AND (TRIM("{COL_NOTE_IMPORTANCE}") = '' OR LOWER(TRIM("{COL_NOTE_IMPORTANCE}")) NOT IN ({placeholders}))
+        """,
+        (DEFAULT_IMPORTANCE, *IMPORTANCE_LEVELS),
+    )
+    conn.commit()
+
+
+def ensure_question_stats_keys(conn: sqlite3.Connection) -> bool:
+    """Move ox_answer_log and question_stats from OX 문제번호 keys to stable_id keys.
+    Returns True when question_stats was dropped and has to be recounted from the logs."""
+    log_columns = {row[1] for row in conn.execute(f'PRAGMA table_info("{TABLE_OX_ANSWER_LOG}")')}
+    if COL_OX_STABLE_ID not in log_columns:
+        conn.execute(
+            f'ALTER TABLE "{TABLE_OX_ANSWER_LOG}" ADD COLUMN "{COL_OX_STABLE_ID}" TEXT NOT NULL DEFAULT \'\''
+        )
+        # Older rows only know the 문제번호 they were answered under; attach the statement it holds now.
+        conn.execute(
+            f"""
+            UPDATE "{TABLE_OX_ANSWER_LOG}" SET "{COL_OX_STABLE_ID}" = COALESCE(
+                (
+                    SELECT ox."{COL_OX_STABLE_ID}" FROM "{TABLE_OX}" ox
+                    WHERE ox."{COL_YEAR}" = "{TABLE_OX_ANSWER_LOG}"."{COL_YEAR}"
+                      AND ox."{COL_SUBJECT}" = "{TABLE_OX_ANSWER_LOG}"."{COL_SUBJECT}"
+                      AND ox."{COL_OX_QNO}" = "{TABLE_OX_ANSWER_LOG}"."{COL_QNO}"
+                ),
+                ''
+            )
+            """
+        )
+    stats_columns = {row[1] for row in conn.execute(f'PRAGMA table_info("{TABLE_QUESTION_STATS}")')}
+    if stats_columns and COL_OX_STABLE_ID not in stats_columns:
+        conn.execute(f'DROP TABLE "{TABLE_QUESTION_STATS}"')
+        return True
+    return False
+
+
 def ensure_app_tables(conn: sqlite3.Connection) -> None:
+    # Every request handler calls this. The DDL pass is skipped while the file and its schema are
+    # unchanged since the last pass; the importance cleanup still runs every time.
+    signature = app_tables_signature(conn)
+    if signature is not None and _APP_TABLES_READY.get(signature[0]) == signature[1]:
+        clean_wrong_note_importance(conn)
+        return
     conn.execute(
         f"""
         CREATE TABLE IF NOT EXISTS "{TABLE_OX}" (
@@ -310,6 +697,8 @@ def ensure_app_tables(conn: sqlite3.Connection) -> None:
             "{COL_YEAR}" INTEGER NOT NULL,
             "{COL_SUBJECT}" TEXT NOT NULL,
             "{COL_OX_QNO}" INTEGER NOT NULL,
+            "{COL_OX_SOURCE_QNO}" INTEGER NOT NULL DEFAULT 0,
+            "{COL_OX_STABLE_ID}" TEXT NOT NULL DEFAULT '',
             "{COL_OX_QUESTION}" TEXT NOT NULL,
             "{COL_OX_ANSWER}" TEXT NOT NULL,
             "{COL_OX_EXPLANATION}" TEXT NOT NULL,
@@ -334,6 +723,15 @@ def ensure_app_tables(conn: sqlite3.Connection) -> None:
         """
     )
     ensure_wrong_note_schema(conn)
+    ensure_wrong_note_search(conn)
+    ensure_wrong_note_changes(conn)
+    ensure_wrong_note_stats(conn)
+    ensure_wrong_note_review(conn)
+    # Filled offline by scripts/build_ox_similarity.py; created here so reads work before the first build.
+    ensure_ox_similar_table(conn)
+    # Filled at ingest by scripts/build_ox_links.py.
+    ensure_ox_link_table(conn)
+    ensure_answer_mask_triggers(conn)
     conn.execute(
         f"""
         CREATE TABLE IF NOT EXISTS "{TABLE_APP_META}" (
@@ -383,6 +781,95 @@ def ensure_app_tables(conn: sqlite3.Connection) -> None:
         )
         """
     )
+    # Read-path indexes, one per ORDER BY in the fetch_* queries; scripts/check_query_plans.py
+    # fails if any of those queries falls back to a table scan or a temp B-tree sort.
+    # The wrong-note list pages on (수정일시, 오답노트id) walked backwards; these replace the
+    # earlier (수정일시 DESC, 출제연도 DESC, ...) indexes, which could not serve that keyset.
+    conn.execute(f'DROP INDEX IF EXISTS "idx_{TABLE_WRONG_NOTE}_user_id_{COL_NOTE_UPDATED}"')
+    conn.execute(f'DROP INDEX IF EXISTS "idx_{TABLE_WRONG_NOTE}_user_id_{COL_SUBJECT}_{COL_NOTE_UPDATED}"')
+    conn.execute(
+        f"""
+        CREATE INDEX IF NOT EXISTS "idx_{TABLE_WRONG_NOTE}_user_id_{COL_NOTE_UPDATED}_{COL_NOTE_ID}"
+        ON "{TABLE_WRONG_NOTE}" ("{COL_NOTE_USER}", "{COL_NOTE_UPDATED}", "{COL_NOTE_ID}")
+        """
+    )
+    conn.execute(
+        f"""
+        CREATE INDEX IF NOT EXISTS "idx_{TABLE_WRONG_NOTE}_user_id_{COL_SUBJECT}_{COL_NOTE_UPDATED}_{COL_NOTE_ID}"
+        ON "{TABLE_WRONG_NOTE}" ("{COL_NOTE_USER}", "{COL_SUBJECT}", "{COL_NOTE_UPDATED}", "{COL_NOTE_ID}")
+        """
+    )
+    conn.execute(
+        f"""
+        CREATE INDEX IF NOT EXISTS "idx_{TABLE_NOTICE}_{COL_NOTICE_PUBLISHED}_{COL_NOTICE_CREATED}"
+        ON "{TABLE_NOTICE}" ("{COL_NOTICE_PUBLISHED}", "{COL_NOTICE_CREATED}")
+        """
+    )
+    conn.execute(
+        f'CREATE INDEX IF NOT EXISTS "idx_{TABLE_NOTICE}_{COL_NOTICE_CREATED}" ON "{TABLE_NOTICE}" ("{COL_NOTICE_CREATED}")'
+    )
+    conn.execute(f'CREATE INDEX IF NOT EXISTS "idx_{TABLE_QA_POST}_created_at" ON "{TABLE_QA_POST}" ("created_at")')
+    conn.execute(
+        f'CREATE INDEX IF NOT EXISTS "idx_{TABLE_QA_ANSWER}_post_id_created_at" ON "{TABLE_QA_ANSWER}" ("post_id", "created_at")'
+    )
+    # One row per graded mock exam: choices packed 4 bits per question, correctness 1 bit per question
+    # (position = 문제번호 - 1), so a 40-question attempt is 20 + 5 bytes.
+    conn.execute(
+        f"""
+        CREATE TABLE IF NOT EXISTS "{TABLE_EXAM_ATTEMPT}" (
+            "id" INTEGER PRIMARY KEY AUTOINCREMENT,
+            "{COL_NOTE_USER}" TEXT NOT NULL,
+            "{COL_YEAR}" INTEGER NOT NULL,
+            "{COL_SUBJECT}" TEXT NOT NULL,
+            "question_count" INTEGER NOT NULL,
+            "answers" BLOB NOT NULL,
+            "correct_bits" BLOB NOT NULL,
+            "correct_count" INTEGER NOT NULL,
+            "submitted_at" TEXT NOT NULL
+        )
+        """
+    )
+    conn.execute(
+        f'CREATE INDEX IF NOT EXISTS "idx_{TABLE_EXAM_ATTEMPT}_user_id" ON "{TABLE_EXAM_ATTEMPT}" ("{COL_NOTE_USER}")'
+    )
+    conn.execute(
+        f"""
+        CREATE TABLE IF NOT EXISTS "{TABLE_OX_ANSWER_LOG}" (
+            "id" INTEGER PRIMARY KEY AUTOINCREMENT,
+            "{COL_NOTE_USER}" TEXT NOT NULL,
+            "{COL_YEAR}" INTEGER NOT NULL,
+            "{COL_SUBJECT}" TEXT NOT NULL,
+            "{COL_QNO}" INTEGER NOT NULL,
+            "{COL_OX_STABLE_ID}" TEXT NOT NULL DEFAULT '',
+            "choice" INTEGER NOT NULL,
+            "correct" INTEGER NOT NULL,
+            "answered_at" TEXT NOT NULL
+        )
+        """
+    )
+    conn.execute(
+        f'CREATE INDEX IF NOT EXISTS "idx_{TABLE_OX_ANSWER_LOG}_user_id" ON "{TABLE_OX_ANSWER_LOG}" ("{COL_NOTE_USER}")'
+    )
+    stats_rebuild = ensure_question_stats_keys(conn)
+    # Derived from exam_attempts and ox_answer_log (rebuild_question_stats); updated by adding deltas.
+    # 문제 counters are keyed by 문제번호 (stable_id ''), OX counters by stable_id (문제번호 0) so that
+    # renumbering OX rows on re-import leaves each statement's counters with it.
+    counters = ",\n".join(f'"{column}" INTEGER NOT NULL DEFAULT 0' for column in STATS_COUNTER_COLUMNS)
+    conn.execute(
+        f"""
+        CREATE TABLE IF NOT EXISTS "{TABLE_QUESTION_STATS}" (
+            "{COL_NOTE_SOURCE}" TEXT NOT NULL,
+            "{COL_YEAR}" INTEGER NOT NULL,
+            "{COL_SUBJECT}" TEXT NOT NULL,
+            "{COL_QNO}" INTEGER NOT NULL,
+            "{COL_OX_STABLE_ID}" TEXT NOT NULL DEFAULT '',
+            {counters},
+            PRIMARY KEY ("{COL_NOTE_SOURCE}", "{COL_YEAR}", "{COL_SUBJECT}", "{COL_QNO}", "{COL_OX_STABLE_ID}")
+        ) WITHOUT ROWID
+        """
+    )
+    if stats_rebuild:
+        rebuild_question_stats(conn)
     notice_count = conn.execute(f'SELECT COUNT(*) FROM "{TABLE_NOTICE}"').fetchone()[0]
     if int(notice_count) == 0:
         now = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
@@ -412,17 +899,62 @@ def ensure_app_tables(conn: sqlite3.Connection) -> None:
             f'INSERT INTO "{TABLE_APP_META}" ("{COL_META_KEY}", "{COL_META_VALUE}") VALUES (?, ?)',
             (FIRST_RUN_INIT_KEY, datetime.now().strftime("%Y-%m-%d %H:%M:%S")),
         )
-    placeholders = ", ".join("?" for _ in IMPORTANCE_LEVELS)
+    canonical = ", ".join(f"'{level}'" for level in (DEFAULT_IMPORTANCE, *IMPORTANCE_LEVELS))
     conn.execute(
         f"""
-        UPDATE "{TABLE_WRONG_NOTE}"
-        SET "{COL_NOTE_IMPORTANCE}" = ?
-        WHERE TRIM(COALESCE("{COL_NOTE_IMPORTANCE}", '')) = ''
-           OR LOWER(TRIM("{COL_NOTE_IMPORTANCE}")) NOT IN ({placeholders})
-        """,
-        (DEFAULT_IMPORTANCE, *IMPORTANCE_LEVELS),
+        CREATE INDEX IF NOT EXISTS "idx_{TABLE_WRONG_NOTE}_{COL_NOTE_IMPORTANCE}_noncanonical"
+        ON "{TABLE_WRONG_NOTE}" ("{COL_NOTE_IMPORTANCE}")
+        WHERE "{COL_NOTE_IMPORTANCE}" NOT IN ({canonical})
+        """
     )
     conn.commit()
+    clean_wrong_note_importance(conn)
+    signature = app_tables_signature(conn)
+    if signature is not None:
+        _APP_TABLES_READY[signature[0]] = signature[1]
+
+
+def parse_list_param(params: dict[str, list[str]], name: str) -> list[str]:
+    """Values of a repeatable, comma-separable query parameter (?year=2024&year=2025 or ?year=2024,2025), deduplicated."""
+    values: list[str] = []
+    for raw in params.get(name) or []:
+        for value in raw.split(","):
+            value = value.strip()
+            if value and value not in values:
+                values.append(value)
+    return values
+
+
+def encode_wrong_note_cursor(updated_at: str, note_id: int) -> str:
+    return base64.urlsafe_b64encode(f"{updated_at}|{note_id}".encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def decode_wrong_note_cursor(cursor: str) -> tuple[str, int] | None:
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode("utf-8")
+        updated_at, separator, note_id = raw.rpartition("|")
+        if not separator:
+            return None
+        return updated_at, int(note_id)
+    except ValueError:
+        return None
+
+
+def encode_wrong_note_bundle_cursor(source: str, year: int, subject: str, question_no: int) -> str:
+    raw = f"{source}|{year}|{subject}|{question_no}"
+    return base64.urlsafe_b64encode(raw.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def decode_wrong_note_bundle_cursor(cursor: str) -> tuple[str, int, str, int] | None:
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode("utf-8")
+        parts = raw.split("|")
+        if len(parts) != 4:
+            return None
+        source, year, subject, question_no = parts
+        return source, int(year), subject, int(question_no)
+    except ValueError:
+        return None
 
 
 def make_json_response(handler: SimpleHTTPRequestHandler, payload: dict, status: int = 200) -> None:
@@ -442,148 +974,896 @@ def fetch_questions(year: int, subject: str) -> list[dict]:
     conn = sqlite3.connect(DB_PATH)
     try:
         ensure_app_tables(conn)
-        columns = {row[1] for row in conn.execute(f'PRAGMA table_info("{TABLE_QUESTIONS}")')}
-        has_render_markup = COL_RENDER in columns
-        select_cols = [
-            f'"{COL_QNO}"',
-            f'"{COL_STEM}"',
-            f'"{COL_OPT_1}"',
-            f'"{COL_OPT_2}"',
-            f'"{COL_OPT_3}"',
-            f'"{COL_OPT_4}"',
-            f'"{COL_OPT_5}"',
-            f'"{COL_ANSWER}"',
-            f'"{COL_DISTRIBUTED}"',
-            f'"{COL_EXPLANATION}"',
-        ]
-        if has_render_markup:
-            select_cols.append(f'"{COL_RENDER}"')
-        sql = f"""
-            SELECT {", ".join(select_cols)}
-            FROM "{TABLE_QUESTIONS}"
-            WHERE "{COL_YEAR}" = ? AND "{COL_SUBJECT}" = ?
-            ORDER BY "{COL_QNO}" ASC
-        """
-        rows = conn.execute(sql, (year, subject)).fetchall()
+        return query_questions(conn, year, subject)
     finally:
         conn.close()
 
+
+def question_stats_join(alias: str, source: str, *, qno_sql: str = "0", stable_id_sql: str = "''") -> str:
+    """LEFT JOIN of question_stats onto a 문제/OX row; the counters ride along in the same primary-key lookup.
+    문제 rows match on 문제번호, OX rows on stable_id (see ensure_app_tables)."""
+    return f"""
+        LEFT JOIN "{TABLE_QUESTION_STATS}" st
+          ON st."{COL_NOTE_SOURCE}" = '{source}'
+         AND st."{COL_YEAR}" = {alias}."{COL_YEAR}"
+         AND st."{COL_SUBJECT}" = {alias}."{COL_SUBJECT}"
+         AND st."{COL_QNO}" = {qno_sql}
+         AND st."{COL_OX_STABLE_ID}" = {stable_id_sql}
+    """
+
+
+def build_item_stats(counters: tuple, *, choices: int) -> dict:
+    attempts, correct = int(counters[0] or 0), int(counters[1] or 0)
+    return {
+        "attempts": attempts,
+        "correct": correct,
+        "correct_rate": round(correct * 100 / attempts, 1) if attempts else None,
+        "picks": [int(value or 0) for value in counters[2 : 2 + choices]],
+    }
+
+
+def query_questions(conn: sqlite3.Connection, year: int, subject: str) -> list[dict]:
+    columns = {row[1] for row in conn.execute(f'PRAGMA table_info("{TABLE_QUESTIONS}")')}
+    render_col = f'q."{COL_RENDER}"' if COL_RENDER in columns else "''"
+    select_cols = [
+        f'q."{COL_QNO}"',
+        f'q."{COL_STEM}"',
+        f'q."{COL_OPT_1}"',
+        f'q."{COL_OPT_2}"',
+        f'q."{COL_OPT_3}"',
+        f'q."{COL_OPT_4}"',
+        f'q."{COL_OPT_5}"',
+        f'q."{COL_ANSWER}"',
+        f'q."{COL_DISTRIBUTED}"',
+        f'q."{COL_EXPLANATION}"',
+        render_col,
+        *(f'st."{column}"' for column in STATS_COUNTER_COLUMNS),
+    ]
+    sql = f"""
+        SELECT {", ".join(select_cols)}
+        FROM "{TABLE_QUESTIONS}" q
+        {question_stats_join("q", NOTE_SOURCE_QUESTION, qno_sql=f'q."{COL_QNO}"')}
+        WHERE q."{COL_YEAR}" = ? AND q."{COL_SUBJECT}" = ?
+        ORDER BY q."{COL_QNO}" ASC
+    """
+    rows = conn.execute(sql, (year, subject)).fetchall()
+
     questions: list[dict] = []
     for row in rows:
-        if len(row) == 11:
-            original_no, stem, o1, o2, o3, o4, o5, answer, distributed, explanation, render_markup = row
-        else:
-            original_no, stem, o1, o2, o3, o4, o5, answer, distributed, explanation = row
-            render_markup = ""
-        normalized_stem = normalize_question_text(stem or "")
-        normalized_options = [
-            normalize_question_text(o1 or ""),
-            normalize_question_text(o2 or ""),
-            normalize_question_text(o3 or ""),
-            normalize_question_text(o4 or ""),
-            normalize_question_text(o5 or ""),
-        ]
-        normalized_stem, normalized_options = repair_known_artifacts(
+        original_no, stem, o1, o2, o3, o4, o5, answer, distributed, explanation, render_markup = row[:11]
+        payload = build_question_payload(
             year=year,
             subject=subject,
-            question_no=int(original_no),
-            stem=normalized_stem,
-            options=normalized_options,
-        )
-        render_payload = parse_render_markup(render_markup)
-        stem_html = str(render_payload.get("stem_html") or "").strip() or render_plain_text_html(normalized_stem)
-        raw_options_html = render_payload.get("options_html")
-        options_html: list[str] = []
-        for index in range(5):
-            candidate = ""
-            if isinstance(raw_options_html, list) and index < len(raw_options_html):
-                value = raw_options_html[index]
-                if isinstance(value, str):
-                    candidate = value.strip()
-            options_html.append(candidate if candidate else render_plain_text_html(normalized_options[index]))
-        questions.append(
-            {
-                "original_no": int(original_no),
-                "stem": normalized_stem,
-                "stem_html": stem_html,
-                "options": normalized_options,
-                "options_html": options_html,
-                "answer": normalize_question_text(answer or ""),
-                "distributed_answer": normalize_question_text(distributed or ""),
-                "explanation": normalize_question_text(explanation or ""),
-            }
+            original_no=int(original_no),
+            stem=stem,
+            options=[o1, o2, o3, o4, o5],
+            answer=answer,
+            distributed=distributed,
+            explanation=explanation,
+            render_markup=render_markup,
         )
+        payload["stats"] = build_item_stats(row[11:], choices=len(OPTION_COLUMNS))
+        questions.append(payload)
     return questions
 
 
+def build_question_payload(
+    *,
+    year: int,
+    subject: str,
+    original_no: int,
+    stem: str | None,
+    options: list[str | None],
+    answer: str | None,
+    distributed: str | None,
+    explanation: str | None,
+    render_markup: str | None,
+) -> dict:
+    normalized_stem = normalize_question_text(stem or "")
+    normalized_options = [normalize_question_text(option or "") for option in options]
+    normalized_stem, normalized_options = repair_known_artifacts(
+        year=year,
+        subject=subject,
+        question_no=original_no,
+        stem=normalized_stem,
+        options=normalized_options,
+    )
+    render_payload = parse_render_markup(render_markup or "")
+    stem_html = str(render_payload.get("stem_html") or "").strip() or render_plain_text_html(normalized_stem)
+    raw_options_html = render_payload.get("options_html")
+    options_html: list[str] = []
+    for index in range(5):
+        candidate = ""
+        if isinstance(raw_options_html, list) and index < len(raw_options_html):
+            value = raw_options_html[index]
+            if isinstance(value, str):
+                candidate = value.strip()
+        options_html.append(candidate if candidate else render_plain_text_html(normalized_options[index]))
+    return {
+        "original_no": original_no,
+        "stem": normalized_stem,
+        "stem_html": stem_html,
+        "options": normalized_options,
+        "options_html": options_html,
+        "answer": normalize_question_text(answer or ""),
+        "distributed_answer": normalize_question_text(distributed or ""),
+        "explanation": normalize_question_text(explanation or ""),
+    }
+
+
 def fetch_ox_questions(year: int, subject: str) -> list[dict]:
     if not DB_PATH.exists():
         return []
     conn = sqlite3.connect(DB_PATH)
     try:
         ensure_app_tables(conn)
-        columns = {row[1] for row in conn.execute(f'PRAGMA table_info("{TABLE_OX}")')}
-        has_source_qno = "\uc6d0\ubb38\ubc88\ud638" in columns
-        has_stable_id = "stable_id" in columns
-        source_col = '"\uc6d0\ubb38\ubc88\ud638"' if has_source_qno else f'"{COL_OX_QNO}"'
-        stable_col = '"stable_id"' if has_stable_id else "''"
-        sql = f"""
-            SELECT "{COL_OX_QNO}", {source_col}, {stable_col}, "{COL_OX_QUESTION}", "{COL_OX_ANSWER}", "{COL_OX_EXPLANATION}"
-            FROM "{TABLE_OX}"
-            WHERE "{COL_YEAR}" = ? AND "{COL_SUBJECT}" = ?
-            ORDER BY "{COL_OX_QNO}" ASC
-        """
-        rows = conn.execute(sql, (year, subject)).fetchall()
+        return query_ox_questions(conn, year, subject)
     finally:
         conn.close()
 
-    import hashlib
-
-    def build_stable_id(source_qno: int, question: str) -> str:
-        canonical = re.sub(r"[\W_]+", "", normalize_ox_question_text(question or "").casefold(), flags=re.UNICODE)
-        digest = hashlib.sha1(canonical.encode("utf-8")).hexdigest()[:16]
-        return f"ox-{int(source_qno)}-{digest}"
 
+def query_ox_questions(conn: sqlite3.Connection, year: int, subject: str) -> list[dict]:
+    columns = {row[1] for row in conn.execute(f'PRAGMA table_info("{TABLE_OX}")')}
+    source_col = f'ox."{COL_OX_SOURCE_QNO}"' if COL_OX_SOURCE_QNO in columns else f'ox."{COL_OX_QNO}"'
+    stable_col = f'ox."{COL_OX_STABLE_ID}"' if COL_OX_STABLE_ID in columns else "''"
+    sql = f"""
+        SELECT
+            ox."{COL_OX_QNO}", {source_col}, {stable_col},
+            ox."{COL_OX_QUESTION}", ox."{COL_OX_ANSWER}", ox."{COL_OX_EXPLANATION}",
+            s."cluster_id",
+            (
+                SELECT COUNT(*) FROM "{TABLE_OX_SIMILAR}" c
+                WHERE c."cluster_id" = s."cluster_id" AND c."kind" = '{OX_SIMILAR_KIND_OX}'
+            ),
+            {", ".join(f'st."{column}"' for column in STATS_COUNTER_COLUMNS[:2 + len(OX_CHOICES)])}
+        FROM "{TABLE_OX}" ox
+        LEFT JOIN "{TABLE_OX_SIMILAR}" s
+          ON s."kind" = '{OX_SIMILAR_KIND_OX}'
+         AND s."{COL_YEAR}" = ox."{COL_YEAR}"
+         AND s."{COL_SUBJECT}" = ox."{COL_SUBJECT}"
+         AND s."item_id" = {stable_col}
+        {question_stats_join("ox", NOTE_SOURCE_OX, stable_id_sql=stable_col)}
+        WHERE ox."{COL_YEAR}" = ? AND ox."{COL_SUBJECT}" = ?
+        ORDER BY ox."{COL_OX_QNO}" ASC
+    """
+    rows = conn.execute(sql, (year, subject)).fetchall()
+
+    # stable_id is backfilled and uniquely indexed at ingest (scripts/import_ox_text.ensure_ox_table).
     results = []
-    for qno, source_qno, stable_id, question, answer, explanation in rows:
-        source_no = int(source_qno or qno)
-        normalized_question = normalize_ox_question_text(question or "")
+    for row in rows:
+        qno, source_qno, stable_id, question, answer, explanation, cluster_id, cluster_ox_count = row[:8]
         results.append(
             {
                 "original_no": int(qno),
-                "source_no": source_no,
-                "stable_id": str(stable_id or "").strip() or build_stable_id(source_no, normalized_question),
-                "question": normalized_question,
+                "source_no": int(source_qno or qno),
+                "stable_id": str(stable_id or "").strip(),
+                "question": normalize_ox_question_text(question or ""),
                 "answer": normalize_question_text(answer or ""),
                 "explanation": normalize_question_text(explanation or ""),
+                "similar_group": int(cluster_id or 0),
+                "similar_count": max(int(cluster_ox_count or 0) - 1, 0),
+                "stats": build_item_stats(row[8:], choices=len(OX_CHOICES)),
             }
         )
     return results
 
 
-def fetch_notices(*, include_unpublished: bool = False) -> list[dict]:
+def fetch_ox_with_source(year: int, subject: str, stable_id: str) -> dict | None:
+    """One OX item plus the 문제 row it was written from, via the ox_source_link table."""
     if not DB_PATH.exists():
-        return []
+        return None
+    source_subject = question_subject_for_ox(subject)
     conn = sqlite3.connect(DB_PATH)
     try:
         ensure_app_tables(conn)
-        filters = []
-        params: list[object] = []
-        if not include_unpublished:
-            filters.append(f'"{COL_NOTICE_PUBLISHED}" = 1')
-        where_clause = f'WHERE {" AND ".join(filters)}' if filters else ""
+        columns = {row[1] for row in conn.execute(f'PRAGMA table_info("{TABLE_QUESTIONS}")')}
+        render_col = f'q."{COL_RENDER}"' if COL_RENDER in columns else "''"
+        option_cols = ", ".join(f'q."{column}"' for column in OPTION_COLUMNS)
         sql = f"""
             SELECT
-                "{COL_NOTICE_ID}",
-                "{COL_NOTICE_TITLE}",
-                "{COL_NOTICE_BODY}",
-                "{COL_NOTICE_AUTHOR}",
-                "{COL_NOTICE_PUBLISHED}",
-                "{COL_NOTICE_CREATED}",
-                "{COL_NOTICE_UPDATED}"
-            FROM "{TABLE_NOTICE}"
-            {where_clause}
-            ORDER BY "{COL_NOTICE_CREATED}" DESC, "{COL_NOTICE_ID}" DESC
+                ox."{COL_OX_QNO}", ox."{COL_OX_SOURCE_QNO}", ox."{COL_OX_QUESTION}", ox."{COL_OX_ANSWER}", ox."{COL_OX_EXPLANATION}",
+                l."{COL_OPTION_NO}",
+                q."{COL_QNO}", q."{COL_STEM}", {option_cols},
+                q."{COL_ANSWER}", q."{COL_DISTRIBUTED}", q."{COL_EXPLANATION}", {render_col}
+            FROM "{TABLE_OX}" ox
+            LEFT JOIN "{TABLE_OX_LINK}" l
+              ON l."{COL_YEAR}" = ox."{COL_YEAR}"
+             AND l."{COL_SUBJECT}" = ox."{COL_SUBJECT}"
+             AND l."{COL_OX_STABLE_ID}" = ox."{COL_OX_STABLE_ID}"
+            LEFT JOIN "{TABLE_QUESTIONS}" q
+              ON q."{COL_YEAR}" = ox."{COL_YEAR}"
+             AND q."{COL_SUBJECT}" = ?
+             AND q."{COL_QNO}" = COALESCE(l."{COL_QNO}", ox."{COL_OX_SOURCE_QNO}")
+            WHERE ox."{COL_YEAR}" = ? AND ox."{COL_SUBJECT}" = ? AND ox."{COL_OX_STABLE_ID}" = ?
+        """
+        row = conn.execute(sql, (source_subject, year, subject, stable_id)).fetchone()
+    finally:
+        conn.close()
+    if row is None:
+        return None
+
+    qno, source_qno, question, answer, explanation, option_no, source_no, stem = row[:8]
+    options = list(row[8:13])
+    source_answer, distributed, source_explanation, render_markup = row[13:17]
+    item = {
+        "original_no": int(qno),
+        "source_no": int(source_qno or qno),
+        "stable_id": stable_id,
+        "question": normalize_ox_question_text(question or ""),
+        "answer": normalize_question_text(answer or ""),
+        "explanation": normalize_question_text(explanation or ""),
+    }
+    source = None
+    if source_no is not None:
+        source = build_question_payload(
+            year=year,
+            subject=source_subject,
+            original_no=int(source_no),
+            stem=stem,
+            options=options,
+            answer=source_answer,
+            distributed=distributed,
+            explanation=source_explanation,
+            render_markup=render_markup,
+        )
+        source["subject"] = source_subject
+        source["option_no"] = int(option_no or 0)
+    return {"year": year, "subject": subject, "item": item, "source": source}
+
+
+def render_search_snippet(raw: str, short_terms: list[str]) -> str:
+    text = escape(raw).replace(SEARCH_MARK_OPEN, "<mark>").replace(SEARCH_MARK_CLOSE, "</mark>")
+    if not short_terms:
+        return text
+    pattern = re.compile(r"(<[^>]*>)|(" + "|".join(re.escape(escape(term)) for term in short_terms) + ")")
+    return pattern.sub(lambda m: m.group(1) or f"<mark>{m.group(2)}</mark>", text)
+
+
+def plain_search_snippet(fields: list[str], terms: list[str], width: int = 80) -> str:
+    for field in fields:
+        text = " ".join(str(field or "").split())
+        positions = [text.find(term) for term in terms if term in text]
+        if positions:
+            start = max(0, min(positions) - width // 3)
+            excerpt = text[start : start + width]
+            return ("…" if start > 0 else "") + excerpt + ("…" if start + width < len(text) else "")
+    return " ".join(str(fields[0] or "").split())[:width]
+
+
+def search_content(
+    query: str,
+    *,
+    subject: str = "",
+    year: int | None = None,
+    source: str = "",
+    page: int = 1,
+    page_size: int = SEARCH_PAGE_SIZE,
+) -> dict:
+    """Ranked full-text search over questions and OX using the trigram FTS5 index (scripts/build_search_index.py).
+
+    Terms shorter than a trigram (세율, 과세) cannot use the index. Next to an indexed term they only
+    filter its MATCH results; on their own they are LIKE-matched against at most SEARCH_SCAN_MAX_ROWS
+    rows of the year/subject/source subset, newest first, and the response says so with
+    "match": "like" and "partial": true when that cap cut the scan short.
+    """
+    terms = list(dict.fromkeys(query.split()))
+    indexed_terms = [term for term in terms if len(term) >= SEARCH_MIN_INDEXED_TERM]
+    short_terms = [term for term in terms if len(term) < SEARCH_MIN_INDEXED_TERM]
+    match_mode = "fts" if indexed_terms else "like"
+    empty = {"total": 0, "page": page, "page_size": page_size, "match": match_mode, "partial": False, "items": []}
+    if not terms or not DB_PATH.exists():
+        return empty
+
+    conn = sqlite3.connect(DB_PATH)
+    try:
+        exists = conn.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?", (TABLE_SEARCH,)
+        ).fetchone()
+        if exists is None:
+            return empty
+
+        scope_filters: list[str] = []
+        scope_params: list[object] = []
+        if year is not None:
+            scope_filters.append('"year" = ?')
+            scope_params.append(year)
+        if subject:
+            scope_filters.append('"subject" = ?')
+            scope_params.append(subject)
+        if source:
+            scope_filters.append('"source" = ?')
+            scope_params.append(source)
+        filters: list[str] = []
+        params: list[object] = []
+        for term in short_terms:
+            filters.append('("stem" LIKE ? OR "options" LIKE ? OR "explanation" LIKE ?)')
+            pattern = f"%{term}%"
+            params.extend([pattern, pattern, pattern])
+
+        partial = False
+        if indexed_terms:
+            from_clause = f'"{TABLE_SEARCH}"'
+            filters.insert(0, f'"{TABLE_SEARCH}" MATCH ?')
+            params.insert(0, " AND ".join('"' + term.replace('"', '""') + '"' for term in indexed_terms))
+            filters.extend(scope_filters)
+            params.extend(scope_params)
+            select_extra = (
+                f"snippet(\"{TABLE_SEARCH}\", -1, '{SEARCH_MARK_OPEN}', '{SEARCH_MARK_CLOSE}', '…', {SEARCH_SNIPPET_TOKENS}), "
+                '"rank"'
+            )
+            # rank is the bm25 weighting configured by build_search_index.py.
+            order_clause = '"rank"'
+        else:
+            scope_where = f"WHERE {' AND '.join(scope_filters)}" if scope_filters else ""
+            from_clause = f"""(
+                SELECT "source", "year", "subject", "qno", "stable_id", "stem", "options", "explanation"
+                FROM "{TABLE_SEARCH}" {scope_where}
+                ORDER BY rowid DESC
+                LIMIT ?
+            )"""
+            params = [*scope_params, SEARCH_SCAN_MAX_ROWS, *params]
+            partial = (
+                conn.execute(
+                    f'SELECT 1 FROM "{TABLE_SEARCH}" {scope_where} LIMIT 1 OFFSET ?',
+                    [*scope_params, SEARCH_SCAN_MAX_ROWS],
+                ).fetchone()
+                is not None
+            )
+            select_extra = '"stem", "options", "explanation", 0.0'
+            order_clause = '"year" DESC, "subject", "source", "qno"'
+        where_clause = " AND ".join(filters)
+
+        total = int(conn.execute(f"SELECT COUNT(*) FROM {from_clause} WHERE {where_clause}", params).fetchone()[0])
+        sql = f"""
+            SELECT "source", "year", "subject", "qno", "stable_id", {select_extra}
+            FROM {from_clause}
+            WHERE {where_clause}
+            ORDER BY {order_clause}
+            LIMIT ? OFFSET ?
+        """
+        rows = conn.execute(sql, [*params, page_size, (page - 1) * page_size]).fetchall()
+    finally:
+        conn.close()
+
+    items: list[dict] = []
+    for row in rows:
+        item_source, item_year, item_subject, qno, stable_id = row[:5]
+        if indexed_terms:
+            snippet_raw, rank = row[5], row[6]
+        else:
+            snippet_raw, rank = plain_search_snippet(list(row[5:8]), short_terms), row[8]
+        item = {
+            "source": item_source,
+            "year": int(item_year),
+            "subject": item_subject,
+            "question_no": int(qno),
+            "snippet_html": render_search_snippet(str(snippet_raw or ""), short_terms),
+            "score": round(abs(float(rank or 0.0)), 6),
+        }
+        if item_source == NOTE_SOURCE_OX:
+            item["stable_id"] = stable_id
+        items.append(item)
+    return {
+        "total": total,
+        "page": page,
+        "page_size": page_size,
+        "match": match_mode,
+        "partial": partial,
+        "items": items,
+    }
+
+
+def fetch_ox_similar(stable_id: str, *, year: int | None = None, subject: str = "") -> list[dict]:
+    """Other OX statements and 5-choice options in the same near-duplicate cluster(s) as stable_id."""
+    if not DB_PATH.exists():
+        return []
+    filters = [f'a."kind" = ?', f'a."item_id" = ?']
+    params: list[object] = [OX_SIMILAR_KIND_OX, stable_id]
+    if year is not None:
+        filters.append(f'a."{COL_YEAR}" = ?')
+        params.append(year)
+    if subject:
+        filters.append(f'a."{COL_SUBJECT}" = ?')
+        params.append(subject)
+    option_case = " ".join(
+        f'WHEN {index} THEN q."{column}"' for index, column in enumerate(OPTION_COLUMNS, start=1)
+    )
+    conn = sqlite3.connect(DB_PATH)
+    try:
+        ensure_app_tables(conn)
+        sql = f"""
+            SELECT
+                m."kind", m."{COL_YEAR}", m."{COL_SUBJECT}", m."item_id", m."{COL_QNO}", m."{COL_OPTION_NO}", m."similarity",
+                ox."{COL_OX_QNO}", ox."{COL_OX_QUESTION}", ox."{COL_OX_ANSWER}",
+                CASE m."{COL_OPTION_NO}" {option_case} ELSE NULL END
+            FROM "{TABLE_OX_SIMILAR}" a
+            JOIN "{TABLE_OX_SIMILAR}" m
+              ON m."cluster_id" = a."cluster_id"
+            LEFT JOIN "{TABLE_OX}" ox
+              ON m."kind" = '{OX_SIMILAR_KIND_OX}'
+             AND ox."{COL_YEAR}" = m."{COL_YEAR}"
+             AND ox."{COL_SUBJECT}" = m."{COL_SUBJECT}"
+             AND ox."{COL_OX_STABLE_ID}" = m."item_id"
+            LEFT JOIN "{TABLE_QUESTIONS}" q
+              ON m."kind" = '{OX_SIMILAR_KIND_OPTION}'
+             AND q."{COL_YEAR}" = m."{COL_YEAR}"
+             AND q."{COL_SUBJECT}" = m."{COL_SUBJECT}"
+             AND q."{COL_QNO}" = m."{COL_QNO}"
+            WHERE {" AND ".join(filters)}
+              AND NOT (m."kind" = a."kind" AND m."{COL_YEAR}" = a."{COL_YEAR}" AND m."{COL_SUBJECT}" = a."{COL_SUBJECT}" AND m."item_id" = a."item_id")
+            ORDER BY m."similarity" DESC, m."{COL_YEAR}" DESC, m."{COL_SUBJECT}", m."{COL_QNO}", m."{COL_OPTION_NO}"
+        """
+        rows = conn.execute(sql, params).fetchall()
+    finally:
+        conn.close()
+
+    items: list[dict] = []
+    for kind, item_year, item_subject, item_id, qno, option_no, similarity, ox_qno, ox_question, ox_answer, option_text in rows:
+        if kind == OX_SIMILAR_KIND_OX:
+            items.append(
+                {
+                    "kind": kind,
+                    "year": int(item_year),
+                    "subject": item_subject,
+                    "stable_id": item_id,
+                    "original_no": int(ox_qno or 0),
+                    "text": normalize_ox_question_text(ox_question or ""),
+                    "answer": normalize_question_text(ox_answer or ""),
+                    "similarity": float(similarity),
+                }
+            )
+        else:
+            items.append(
+                {
+                    "kind": kind,
+                    "year": int(item_year),
+                    "subject": item_subject,
+                    "question_no": int(qno),
+                    "option_no": int(option_no),
+                    "text": normalize_question_text(option_text or ""),
+                    "similarity": float(similarity),
+                }
+            )
+    return items
+
+
+def pack_choices(choices: list[int]) -> bytes:
+    packed = bytearray((len(choices) + 1) // 2)
+    for index, choice in enumerate(choices):
+        packed[index // 2] |= (choice & 0x0F) << (4 * (index % 2))
+    return bytes(packed)
+
+
+def unpack_choices(packed: bytes, count: int) -> list[int]:
+    return [(packed[index // 2] >> (4 * (index % 2))) & 0x0F for index in range(count)]
+
+
+def pack_bits(flags: list[bool]) -> bytes:
+    packed = bytearray((len(flags) + 7) // 8)
+    for index, flag in enumerate(flags):
+        if flag:
+            packed[index // 8] |= 1 << (index % 8)
+    return bytes(packed)
+
+
+def unpack_bits(packed: bytes, count: int) -> list[bool]:
+    return [bool(packed[index // 8] >> (index % 8) & 1) for index in range(count)]
+
+
+def grade_exam_submission(*, user_id: str, year: int, subject: str, answers: dict[int, int]) -> dict | None:
+    """Grade one mock exam against the stored answer bitmasks (정답_비트) and record the attempt; None if the exam has no questions."""
+    if not DB_PATH.exists():
+        return None
+    user_id = normalize_user_id(user_id)
+    conn = sqlite3.connect(DB_PATH)
+    try:
+        ensure_app_tables(conn)
+        rows = conn.execute(
+            f"""
+            SELECT "{COL_QNO}", "{COL_ANSWER_MASK}", "{COL_ANSWER}", "{COL_DISTRIBUTED}", "{COL_EXPLANATION}"
+            FROM "{TABLE_QUESTIONS}"
+            WHERE "{COL_YEAR}" = ? AND "{COL_SUBJECT}" = ?
+            ORDER BY "{COL_QNO}"
+            """,
+            (year, subject),
+        ).fetchall()
+        if not rows:
+            return None
+        question_count = max(int(row[0]) for row in rows)
+        choices = [0] * question_count
+        flags = [False] * question_count
+        results: list[dict] = []
+        for question_no, mask, answer, distributed, explanation in rows:
+            question_no = int(question_no)
+            # 정답_비트 is kept in step with 답/답_배포 by the 문제 triggers (ensure_answer_mask_triggers);
+            # the answer text is only read back for the results payload.
+            key = int(mask)
+            selected = answers.get(question_no, 0)
+            correct = bool(selected and key >> (selected - 1) & 1)
+            choices[question_no - 1] = selected
+            flags[question_no - 1] = correct
+            results.append(
+                {
+                    "question_no": question_no,
+                    "selected": selected,
+                    "correct": correct,
+                    "answer": normalize_question_text(answer or ""),
+                    "distributed_answer": normalize_question_text(distributed or ""),
+                    "explanation": normalize_question_text(explanation or ""),
+                }
+            )
+        correct_count = sum(1 for item in results if item["correct"])
+        submitted_at = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        attempt_id = conn.execute(
+            f"""
+            INSERT INTO "{TABLE_EXAM_ATTEMPT}"
+            ("{COL_NOTE_USER}", "{COL_YEAR}", "{COL_SUBJECT}", "question_count", "answers", "correct_bits", "correct_count", "submitted_at")
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+            """,
+            (user_id, year, subject, question_count, pack_choices(choices), pack_bits(flags), correct_count, submitted_at),
+        ).lastrowid
+        deltas: dict[tuple, list[int]] = {}
+        for item in results:
+            if item["selected"]:
+                add_stats_delta(
+                    deltas, (NOTE_SOURCE_QUESTION, year, subject, item["question_no"], ""), item["selected"], item["correct"]
+                )
+        apply_question_stats(conn, deltas)
+    finally:
+        conn.close()
+    total = len(results)
+    return {
+        "attempt_id": int(attempt_id),
+        "year": year,
+        "subject": subject,
+        "submitted_at": submitted_at,
+        "total": total,
+        "answered": sum(1 for item in results if item["selected"]),
+        "correct": correct_count,
+        "score": round(correct_count * 100 / total) if total else 0,
+        "ignored": sorted(question_no for question_no in answers if not 1 <= question_no <= question_count),
+        "results": results,
+    }
+
+
+def add_stats_delta(deltas: dict[tuple, list[int]], key: tuple, choice: int, correct: bool) -> None:
+    counters = deltas.setdefault(key, [0] * len(STATS_COUNTER_COLUMNS))
+    counters[0] += 1
+    counters[1] += int(correct)
+    counters[1 + choice] += 1
+
+
+def write_question_stats(conn: sqlite3.Connection, deltas: dict[tuple, list[int]]) -> None:
+    """Add per-question counter deltas keyed (source, year, subject, question_no, stable_id)."""
+    key_columns = f'"{COL_NOTE_SOURCE}", "{COL_YEAR}", "{COL_SUBJECT}", "{COL_QNO}", "{COL_OX_STABLE_ID}"'
+    columns = ", ".join(f'"{column}"' for column in STATS_COUNTER_COLUMNS)
+    increments = ", ".join(f'"{column}" = "{column}" + excluded."{column}"' for column in STATS_COUNTER_COLUMNS)
+    conn.executemany(
+        f"""
+        INSERT INTO "{TABLE_QUESTION_STATS}" ({key_columns}, {columns})
+        VALUES (?, ?, ?, ?, ?, {", ".join("?" for _ in STATS_COUNTER_COLUMNS)})
+        ON CONFLICT ({key_columns}) DO UPDATE SET {increments}
+        """,
+        [(*key, *counters) for key, counters in deltas.items()],
+    )
+
+
+def apply_question_stats(conn: sqlite3.Connection, deltas: dict[tuple, list[int]]) -> None:
+    """Commit the caller's history rows, with the counter deltas in the same transaction or handed to the buffer."""
+    if QUESTION_STATS_BUFFER is None:
+        write_question_stats(conn, deltas)
+        conn.commit()
+        return
+    conn.commit()
+    QUESTION_STATS_BUFFER.add(deltas)
+
+
+class QuestionStatsBuffer:
+    """Sums question_stats deltas in memory and adds them to SQLite in one transaction per interval.
+
+    Counters are derived data: if the process dies with deltas pending, scripts/rebuild_question_stats.py
+    recomputes them from exam_attempts and ox_answer_log. The history rows behind pending deltas are
+    already committed, so a rebuild while the buffer runs would count them twice; start() records the
+    server's pid under STATS_BUFFER_OWNER_KEY and the rebuild refuses to run while that process is alive.
+    """
+
+    def __init__(self, *, interval_seconds: float) -> None:
+        self.interval_seconds = interval_seconds
+        self._pending: dict[tuple, list[int]] = {}
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+        self.added = 0
+        self.written = 0
+        self.flushes = 0
+        self.flush_errors = 0
+        self.last_flush_ms = 0.0
+
+    def start(self) -> None:
+        self._set_owner(os.getpid())
+        self._thread = threading.Thread(target=self._run, name="question-stats-writer", daemon=True)
+        self._thread.start()
+
+    def _set_owner(self, pid: int | None) -> None:
+        conn = sqlite3.connect(DB_PATH)
+        try:
+            ensure_app_tables(conn)
+            if pid is None:
+                conn.execute(f'DELETE FROM "{TABLE_APP_META}" WHERE "{COL_META_KEY}" = ?', (STATS_BUFFER_OWNER_KEY,))
+            else:
+                conn.execute(
+                    f'INSERT OR REPLACE INTO "{TABLE_APP_META}" ("{COL_META_KEY}", "{COL_META_VALUE}") VALUES (?, ?)',
+                    (STATS_BUFFER_OWNER_KEY, str(pid)),
+                )
+            conn.commit()
+        finally:
+            conn.close()
+
+    def _run(self) -> None:
+        # Same contract as WrongNoteWriteBuffer._run: the thread must outlive any failed flush.
+        while not self._stop.wait(self.interval_seconds):
+            try:
+                self.flush()
+            except Exception as exc:
+                print(f"question-stats flush failed: {exc!r}")
+
+    def add(self, deltas: dict[tuple, list[int]]) -> None:
+        with self._lock:
+            for key, counters in deltas.items():
+                pending = self._pending.setdefault(key, [0] * len(STATS_COUNTER_COLUMNS))
+                for index, value in enumerate(counters):
+                    pending[index] += value
+            self.added += len(deltas)
+
+    def flush(self) -> int:
+        with self._flush_lock:
+            with self._lock:
+                batch, self._pending = self._pending, {}
+            if not batch:
+                return 0
+            started = time.perf_counter()
+            conn: sqlite3.Connection | None = None
+            try:
+                conn = sqlite3.connect(DB_PATH)
+                ensure_app_tables(conn)
+                write_question_stats(conn, batch)
+                conn.commit()
+            except Exception:
+                if conn is not None:
+                    conn.rollback()
+                with self._lock:
+                    self.flush_errors += 1
+                    for key, counters in batch.items():
+                        pending = self._pending.setdefault(key, [0] * len(STATS_COUNTER_COLUMNS))
+                        for index, value in enumerate(counters):
+                            pending[index] += value
+                raise
+            finally:
+                if conn is not None:
+                    conn.close()
+            with self._lock:
+                self.written += len(batch)
+                self.flushes += 1
+                self.last_flush_ms = round((time.perf_counter() - started) * 1000, 2)
+            return len(batch)
+
+    def close(self) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+        self.flush()
+        self._set_owner(None)
+
+    def metrics(self) -> dict:
+        with self._lock:
+            return {
+                "pending": len(self._pending),
+                "added": self.added,
+                "written": self.written,
+                "flushes": self.flushes,
+                "flush_errors": self.flush_errors,
+                "last_flush_ms": self.last_flush_ms,
+            }
+
+
+# Started by main() when --stats-flush-ms > 0; otherwise counters are written with each submission.
+QUESTION_STATS_BUFFER: QuestionStatsBuffer | None = None
+
+
+def record_ox_answers(*, user_id: str, year: int, subject: str, answers: list) -> dict:
+    """Log OX answers ({stable_id or question_no, choice "O"/"X"}) and count them into question_stats."""
+    user_id = normalize_user_id(user_id)
+    rejected: list[dict] = []
+    results: list[dict] = []
+    if not DB_PATH.exists():
+        return {"recorded": 0, "correct": 0, "rejected": rejected, "results": results}
+    conn = sqlite3.connect(DB_PATH)
+    try:
+        ensure_app_tables(conn)
+        keys: dict[str, tuple[int, str, str]] = {}
+        for qno, stable_id, answer in conn.execute(
+            f"""
+            SELECT "{COL_OX_QNO}", "{COL_OX_STABLE_ID}", "{COL_OX_ANSWER}" FROM "{TABLE_OX}"
+            WHERE "{COL_YEAR}" = ? AND "{COL_SUBJECT}" = ?
+            """,
+            (year, subject),
+        ):
+            key = (int(qno), str(stable_id or ""), normalize_question_text(answer or "").upper())
+            keys[f"n:{int(qno)}"] = key
+            if stable_id:
+                keys[f"s:{stable_id}"] = key
+        answered_at = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        log_rows: list[tuple] = []
+        deltas: dict[tuple, list[int]] = {}
+        for index, entry in enumerate(answers):
+            if not isinstance(entry, dict):
+                rejected.append({"index": index, "error": "not an object"})
+                continue
+            choice_text = str(entry.get("choice") or "").strip().upper()
+            if choice_text not in OX_CHOICES:
+                rejected.append({"index": index, "error": "choice must be O or X"})
+                continue
+            stable_id = str(entry.get("stable_id") or "").strip()
+            lookup = f"s:{stable_id}" if stable_id else f"n:{entry.get('question_no')}"
+            if lookup not in keys:
+                rejected.append({"index": index, "error": "unknown OX item"})
+                continue
+            question_no, item_id, answer = keys[lookup]
+            choice = OX_CHOICES.index(choice_text) + 1
+            correct = choice_text == answer
+            log_rows.append((user_id, year, subject, question_no, item_id, choice, int(correct), answered_at))
+            add_stats_delta(deltas, (NOTE_SOURCE_OX, year, subject, 0, item_id), choice, correct)
+            results.append(
+                {"question_no": question_no, "stable_id": item_id, "choice": choice_text, "correct": correct, "answer": answer}
+            )
+        conn.executemany(
+            f"""
+            INSERT INTO "{TABLE_OX_ANSWER_LOG}"
+            ("{COL_NOTE_USER}", "{COL_YEAR}", "{COL_SUBJECT}", "{COL_QNO}", "{COL_OX_STABLE_ID}", "choice", "correct", "answered_at")
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+            """,
+            log_rows,
+        )
+        apply_question_stats(conn, deltas)
+    finally:
+        conn.close()
+    return {
+        "recorded": len(results),
+        "correct": sum(1 for item in results if item["correct"]),
+        "rejected": rejected,
+        "results": results,
+    }
+
+
+def question_stats_buffer_owner(conn: sqlite3.Connection) -> int | None:
+    """Pid of a running server that may still hold question_stats deltas, or None."""
+    row = conn.execute(
+        f'SELECT "{COL_META_VALUE}" FROM "{TABLE_APP_META}" WHERE "{COL_META_KEY}" = ?', (STATS_BUFFER_OWNER_KEY,)
+    ).fetchone()
+    if row is None:
+        return None
+    pid = int(row[0])
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        # The server died without close(); its pending deltas are gone and the logs are the truth.
+        return None
+    except PermissionError:
+        pass
+    return pid
+
+
+def rebuild_question_stats(conn: sqlite3.Connection) -> list[dict]:
+    """Recount question_stats from exam_attempts and ox_answer_log, replace it, and return the drifted keys."""
+    actual: dict[tuple, list[int]] = {}
+    for year, subject, question_count, packed_answers, correct_bits in conn.execute(
+        f'SELECT "{COL_YEAR}", "{COL_SUBJECT}", "question_count", "answers", "correct_bits" FROM "{TABLE_EXAM_ATTEMPT}"'
+    ):
+        flags = unpack_bits(correct_bits, int(question_count))
+        for index, choice in enumerate(unpack_choices(packed_answers, int(question_count))):
+            if choice:
+                add_stats_delta(actual, (NOTE_SOURCE_QUESTION, int(year), subject, index + 1, ""), choice, flags[index])
+    for year, subject, stable_id, choice, correct in conn.execute(
+        f'SELECT "{COL_YEAR}", "{COL_SUBJECT}", "{COL_OX_STABLE_ID}", "choice", "correct" FROM "{TABLE_OX_ANSWER_LOG}"'
+    ):
+        add_stats_delta(actual, (NOTE_SOURCE_OX, int(year), subject, 0, stable_id), int(choice), bool(correct))
+    key_columns = f'"{COL_NOTE_SOURCE}", "{COL_YEAR}", "{COL_SUBJECT}", "{COL_QNO}", "{COL_OX_STABLE_ID}"'
+    columns = ", ".join(f'"{column}"' for column in STATS_COUNTER_COLUMNS)
+    stored = {
+        tuple(row[:5]): [int(value) for value in row[5:]]
+        for row in conn.execute(f'SELECT {key_columns}, {columns} FROM "{TABLE_QUESTION_STATS}"')
+    }
+    empty = [0] * len(STATS_COUNTER_COLUMNS)
+    drift: list[dict] = []
+    for key in sorted(set(stored) | set(actual)):
+        if stored.get(key, empty) != actual.get(key, empty):
+            source, year, subject, question_no, stable_id = key
+            drift.append(
+                {
+                    "source": source,
+                    "year": year,
+                    "subject": subject,
+                    "question_no": question_no,
+                    "stable_id": stable_id,
+                    "stored": stored.get(key, empty),
+                    "actual": actual.get(key, empty),
+                }
+            )
+    if drift:
+        conn.execute(f'DELETE FROM "{TABLE_QUESTION_STATS}"')
+        write_question_stats(conn, actual)
+    return drift
+
+
+def fetch_exam_attempts(
+    user_id: str, *, year: int | None = None, subject: str = "", limit: int = EXAM_ATTEMPTS_PAGE_SIZE
+) -> list[dict]:
+    if not DB_PATH.exists():
+        return []
+    filters = [f'"{COL_NOTE_USER}" = ?']
+    params: list[object] = [normalize_user_id(user_id)]
+    if year is not None:
+        filters.append(f'"{COL_YEAR}" = ?')
+        params.append(year)
+    if subject:
+        filters.append(f'"{COL_SUBJECT}" = ?')
+        params.append(subject)
+    conn = sqlite3.connect(DB_PATH)
+    try:
+        ensure_app_tables(conn)
+        rows = conn.execute(
+            f"""
+            SELECT "id", "{COL_YEAR}", "{COL_SUBJECT}", "question_count", "answers", "correct_bits", "correct_count", "submitted_at"
+            FROM "{TABLE_EXAM_ATTEMPT}"
+            WHERE {" AND ".join(filters)}
+            ORDER BY "id" DESC
+            LIMIT ?
+            """,
+            [*params, limit],
+        ).fetchall()
+    finally:
+        conn.close()
+    attempts: list[dict] = []
+    for attempt_id, attempt_year, attempt_subject, question_count, packed_answers, correct_bits, correct_count, submitted_at in rows:
+        attempts.append(
+            {
+                "attempt_id": int(attempt_id),
+                "year": int(attempt_year),
+                "subject": attempt_subject,
+                "submitted_at": submitted_at,
+                "total": int(question_count),
+                "correct": int(correct_count),
+                "answers": unpack_choices(packed_answers, int(question_count)),
+                "correct_flags": unpack_bits(correct_bits, int(question_count)),
+            }
+        )
+    return attempts
+
+
+def fetch_notices(*, include_unpublished: bool = False) -> list[dict]:
+    if not DB_PATH.exists():
+        return []
+    conn = sqlite3.connect(DB_PATH)
+    try:
+        ensure_app_tables(conn)
+        filters = []
+        params: list[object] = []
+        if not include_unpublished:
+            filters.append(f'"{COL_NOTICE_PUBLISHED}" = 1')
+        where_clause = f'WHERE {" AND ".join(filters)}' if filters else ""
+        sql = f"""
+            SELECT
+                "{COL_NOTICE_ID}",
+                "{COL_NOTICE_TITLE}",
+                "{COL_NOTICE_BODY}",
+                "{COL_NOTICE_AUTHOR}",
+                "{COL_NOTICE_PUBLISHED}",
+                "{COL_NOTICE_CREATED}",
+                "{COL_NOTICE_UPDATED}"
+            FROM "{TABLE_NOTICE}"
+            {where_clause}
+            ORDER BY "{COL_NOTICE_CREATED}" DESC, "{COL_NOTICE_ID}" DESC
         """
         rows = conn.execute(sql, params).fetchall()
     finally:
@@ -626,6 +1906,8 @@ def fetch_qa_posts(*, limit: int = 60) -> list[dict]:
             """,
             (int(limit),),
         ).fetchall()
+        post_ids = [int(row[0]) for row in post_rows]
+        placeholders = ", ".join("?" for _ in post_ids) or "NULL"
         answer_rows = conn.execute(
             f"""
             SELECT
@@ -636,8 +1918,10 @@ def fetch_qa_posts(*, limit: int = 60) -> list[dict]:
                 "created_at",
                 "updated_at"
             FROM "{TABLE_QA_ANSWER}"
-            ORDER BY "created_at" ASC, "{COL_QA_ANSWER_ID}" ASC
-            """
+            WHERE "post_id" IN ({placeholders})
+            ORDER BY "post_id", "created_at" ASC, "{COL_QA_ANSWER_ID}" ASC
+            """,
+            post_ids,
         ).fetchall()
     finally:
         conn.close()
@@ -812,29 +2096,68 @@ def upsert_notice(
 
 
 def fetch_wrong_note_map(year: int, subject: str, user_id: str, source: str = NOTE_SOURCE_QUESTION) -> dict[str, dict]:
+    nested = fetch_wrong_note_maps(user_id, years=[year], subjects=[subject], sources=[source])
+    return nested.get(source, {}).get(str(year), {}).get(subject, {})
+
+
+def fetch_wrong_note_maps(
+    user_id: str,
+    *,
+    years: list[int],
+    subjects: list[str],
+    sources: list[str],
+) -> dict[str, dict[str, dict[str, dict[str, dict]]]]:
+    """Notes as {source: {year: {subject: {question_no: note}}}} for every combination in one query.
+
+    An empty years/subjects/sources list means "all"; only combinations that have notes appear.
+    """
     if not DB_PATH.exists():
         return {}
+    normalized_user_id = normalize_user_id(user_id)
+    filters = [f'"{COL_NOTE_USER}" = ?']
+    params: list[object] = [normalized_user_id]
+    for column, values in ((COL_NOTE_SOURCE, sources), (COL_YEAR, years), (COL_SUBJECT, subjects)):
+        if values:
+            filters.append(f'"{column}" IN ({", ".join("?" for _ in values)})')
+            params.extend(values)
     conn = sqlite3.connect(DB_PATH)
     try:
         ensure_app_tables(conn)
         sql = f"""
-            SELECT "{COL_QNO}", "{COL_NOTE_IMPORTANCE}", "{COL_NOTE_COMMENT}", "{COL_NOTE_UPDATED}"
+            SELECT "{COL_NOTE_SOURCE}", "{COL_YEAR}", "{COL_SUBJECT}", "{COL_QNO}", "{COL_NOTE_IMPORTANCE}", "{COL_NOTE_COMMENT}", "{COL_NOTE_UPDATED}"
             FROM "{TABLE_WRONG_NOTE}"
-            WHERE "{COL_NOTE_USER}" = ? AND "{COL_NOTE_SOURCE}" = ? AND "{COL_YEAR}" = ? AND "{COL_SUBJECT}" = ?
+            WHERE {" AND ".join(filters)}
         """
-        rows = conn.execute(sql, (normalize_user_id(user_id), source, year, subject)).fetchall()
+        rows = conn.execute(sql, params).fetchall()
     finally:
         conn.close()
-    result: dict[str, dict] = {}
-    for qno, importance, comment, updated_at in rows:
+    notes: dict[tuple, dict] = {}
+    for note_source, note_year, note_subject, qno, importance, comment, updated_at in rows:
         normalized_importance = (importance or "").strip().lower()
         if normalized_importance not in IMPORTANCE_LEVELS:
             normalized_importance = DEFAULT_IMPORTANCE
-        result[str(int(qno))] = {
+        notes[(note_source, int(note_year), note_subject, int(qno))] = {
             "importance": normalized_importance,
             "comment": comment or "",
             "updated_at": updated_at or "",
         }
+    if WRONG_NOTE_BUFFER is not None:
+        for (_, note_source, note_year, note_subject, qno), state in WRONG_NOTE_BUFFER.pending_for(normalized_user_id).items():
+            if (
+                (sources and note_source not in sources)
+                or (years and note_year not in years)
+                or (subjects and note_subject not in subjects)
+            ):
+                continue
+            importance, comment, updated_at, deleted = state
+            key = (note_source, int(note_year), note_subject, int(qno))
+            if deleted:
+                notes.pop(key, None)
+            else:
+                notes[key] = {"importance": importance, "comment": comment, "updated_at": updated_at}
+    result: dict[str, dict[str, dict[str, dict[str, dict]]]] = {}
+    for (note_source, note_year, note_subject, qno), note in notes.items():
+        result.setdefault(note_source, {}).setdefault(str(note_year), {}).setdefault(note_subject, {})[str(qno)] = note
     return result
 
 
@@ -845,9 +2168,14 @@ def fetch_wrong_notes(
     subject: str = "",
     importance: str = "",
     comment: str = "",
-) -> list[dict]:
+    limit: int = WRONG_NOTE_PAGE_SIZE,
+    after: tuple[str, int] | None = None,
+) -> dict:
+    """One page of notes, newest first, keyed on (수정일시, 오답노트id); pass next_cursor back as `after`."""
+    empty = {"items": [], "next_cursor": "", "has_more": False}
     if not DB_PATH.exists():
-        return []
+        return empty
+    settle_wrong_note_writes(user_id)
     conn = sqlite3.connect(DB_PATH)
     try:
         ensure_app_tables(conn)
@@ -867,11 +2195,28 @@ def fetch_wrong_notes(
             )
             params.append(importance)
         if comment:
-            filters.append(f'n."{COL_NOTE_COMMENT}" LIKE ?')
-            params.append(f"%{comment}%")
+            comment_filter, comment_param = wrong_note_comment_filter(comment)
+            filters.append(comment_filter)
+            params.append(comment_param)
+        if after is not None:
+            filters.append(f'(n."{COL_NOTE_UPDATED}", n."{COL_NOTE_ID}") < (?, ?)')
+            params.extend(after)
         where_clause = f'WHERE {" AND ".join(filters)}' if filters else ""
+        # Previews are stored at ingest (scripts/build_previews.py); the stem is only read for rows
+        # that have not been through that step yet.
+        question_columns = {row[1] for row in conn.execute(f'PRAGMA table_info("{TABLE_QUESTIONS}")')}
+        ox_columns = {row[1] for row in conn.execute(f'PRAGMA table_info("{TABLE_OX}")')}
+        if COL_PREVIEW in question_columns:
+            question_preview = f'q."{COL_PREVIEW}", CASE WHEN q."{COL_PREVIEW}" = \'\' THEN q."{COL_STEM}" END'
+        else:
+            question_preview = f"'', q.\"{COL_STEM}\""
+        if COL_PREVIEW in ox_columns:
+            ox_preview = f'ox."{COL_PREVIEW}", CASE WHEN ox."{COL_PREVIEW}" = \'\' THEN ox."{COL_OX_QUESTION}" END'
+        else:
+            ox_preview = f"'', ox.\"{COL_OX_QUESTION}\""
         sql = f"""
             SELECT
+                n."{COL_NOTE_ID}",
                 n."{COL_YEAR}",
                 n."{COL_SUBJECT}",
                 n."{COL_QNO}",
@@ -879,10 +2224,9 @@ def fetch_wrong_notes(
                 n."{COL_NOTE_COMMENT}",
                 n."{COL_NOTE_UPDATED}",
                 n."{COL_NOTE_SOURCE}",
-                q."{COL_STEM}",
-                ox."{COL_OX_QUESTION}",
-                ox."{COL_OX_ANSWER}",
-                ox."{COL_OX_EXPLANATION}"
+                {question_preview},
+                {ox_preview},
+                ox."{COL_OX_ANSWER}"
             FROM "{TABLE_WRONG_NOTE}" n
             LEFT JOIN "{TABLE_QUESTIONS}" q
               ON n."{COL_NOTE_SOURCE}" = '{NOTE_SOURCE_QUESTION}'
@@ -895,13 +2239,16 @@ def fetch_wrong_notes(
              AND ox."{COL_SUBJECT}" = n."{COL_SUBJECT}"
              AND ox."{COL_OX_QNO}" = n."{COL_QNO}"
             {where_clause}
-            ORDER BY n."{COL_NOTE_UPDATED}" DESC, n."{COL_YEAR}" DESC, n."{COL_SUBJECT}" ASC, n."{COL_QNO}" ASC
+            ORDER BY n."{COL_NOTE_UPDATED}" DESC, n."{COL_NOTE_ID}" DESC
+            LIMIT ?
         """
-        rows = conn.execute(sql, params).fetchall()
+        rows = conn.execute(sql, [*params, limit + 1]).fetchall()
     finally:
         conn.close()
+    has_more = len(rows) > limit
     results: list[dict] = []
     for (
+        note_id,
         year,
         note_subject,
         question_no,
@@ -909,20 +2256,22 @@ def fetch_wrong_notes(
         note_comment,
         updated_at,
         note_source,
+        question_preview,
         stem,
+        ox_preview,
         ox_question,
         ox_answer,
-        ox_explanation,
-    ) in rows:
+    ) in rows[:limit]:
         normalized_importance = (note_importance or "").strip().lower()
         if normalized_importance not in IMPORTANCE_LEVELS:
             normalized_importance = DEFAULT_IMPORTANCE
-        preview_source = stem if note_source == NOTE_SOURCE_QUESTION else ox_question
-        preview = normalize_question_text(preview_source or "")
-        if len(preview) > 140:
-            preview = f"{preview[:140]}..."
+        if note_source == NOTE_SOURCE_OX:
+            preview = ox_preview or build_note_preview(ox_question or "")
+        else:
+            preview = question_preview or build_note_preview(stem or "")
         results.append(
             {
+                "note_id": int(note_id),
                 "year": int(year),
                 "subject": note_subject,
                 "question_no": int(question_no),
@@ -932,10 +2281,543 @@ def fetch_wrong_notes(
                 "updated_at": updated_at or "",
                 "question_preview": preview,
                 "answer": (ox_answer or "") if note_source == NOTE_SOURCE_OX else "",
-                "explanation": (ox_explanation or "") if note_source == NOTE_SOURCE_OX else "",
             }
         )
-    return results
+    next_cursor = ""
+    if has_more and results:
+        next_cursor = encode_wrong_note_cursor(results[-1]["updated_at"], results[-1]["note_id"])
+    return {"items": results, "next_cursor": next_cursor, "has_more": has_more}
+
+
+def wrong_note_content_sql(conn: sqlite3.Connection) -> tuple[str, str]:
+    """SELECT list and joins giving a note `n` its full 문제/OX content; rows go to build_wrong_note_item."""
+    question_columns = {row[1] for row in conn.execute(f'PRAGMA table_info("{TABLE_QUESTIONS}")')}
+    render_col = f'q."{COL_RENDER}"' if COL_RENDER in question_columns else "''"
+    option_cols = ", ".join(f'q."{column}"' for column in OPTION_COLUMNS)
+    select_sql = f"""
+        n."{COL_NOTE_ID}", n."{COL_NOTE_SOURCE}", n."{COL_YEAR}", n."{COL_SUBJECT}", n."{COL_QNO}",
+        n."{COL_NOTE_IMPORTANCE}", n."{COL_NOTE_COMMENT}", n."{COL_NOTE_UPDATED}",
+        q."{COL_QNO}", q."{COL_STEM}", {option_cols},
+        q."{COL_ANSWER}", q."{COL_DISTRIBUTED}", q."{COL_EXPLANATION}", {render_col},
+        ox."{COL_OX_QNO}", ox."{COL_OX_SOURCE_QNO}", ox."{COL_OX_STABLE_ID}",
+        ox."{COL_OX_QUESTION}", ox."{COL_OX_ANSWER}", ox."{COL_OX_EXPLANATION}"
+    """
+    join_sql = f"""
+        LEFT JOIN "{TABLE_QUESTIONS}" q
+          ON n."{COL_NOTE_SOURCE}" = '{NOTE_SOURCE_QUESTION}'
+         AND q."{COL_YEAR}" = n."{COL_YEAR}"
+         AND q."{COL_SUBJECT}" = n."{COL_SUBJECT}"
+         AND q."{COL_QNO}" = n."{COL_QNO}"
+        LEFT JOIN "{TABLE_OX}" ox
+          ON n."{COL_NOTE_SOURCE}" = '{NOTE_SOURCE_OX}'
+         AND ox."{COL_YEAR}" = n."{COL_YEAR}"
+         AND ox."{COL_SUBJECT}" = n."{COL_SUBJECT}"
+         AND ox."{COL_OX_QNO}" = n."{COL_QNO}"
+    """
+    return select_sql, join_sql
+
+
+def build_wrong_note_item(row: tuple) -> dict:
+    note_id, note_source, year, note_subject, question_no, importance, comment, updated_at = row[:8]
+    source_no, stem = row[8:10]
+    options = list(row[10:15])
+    answer, distributed, explanation, render_markup = row[15:19]
+    ox_qno, ox_source_qno, stable_id, ox_question, ox_answer, ox_explanation = row[19:25]
+    normalized_importance = (importance or "").strip().lower()
+    if normalized_importance not in IMPORTANCE_LEVELS:
+        normalized_importance = DEFAULT_IMPORTANCE
+    content = None
+    if note_source == NOTE_SOURCE_OX and ox_qno is not None:
+        content = {
+            "original_no": int(ox_qno),
+            "source_no": int(ox_source_qno or ox_qno),
+            "stable_id": str(stable_id or "").strip(),
+            "question": normalize_ox_question_text(ox_question or ""),
+            "answer": normalize_question_text(ox_answer or ""),
+            "explanation": normalize_question_text(ox_explanation or ""),
+        }
+    elif note_source != NOTE_SOURCE_OX and source_no is not None:
+        content = build_question_payload(
+            year=int(year),
+            subject=note_subject,
+            original_no=int(source_no),
+            stem=stem,
+            options=options,
+            answer=answer,
+            distributed=distributed,
+            explanation=explanation,
+            render_markup=render_markup,
+        )
+    return {
+        "note_id": int(note_id),
+        "source": note_source or NOTE_SOURCE_QUESTION,
+        "year": int(year),
+        "subject": note_subject,
+        "question_no": int(question_no),
+        "importance": normalized_importance,
+        "comment": comment or "",
+        "updated_at": updated_at or "",
+        "content": content,
+    }
+
+
+def fetch_wrong_note_bundle(
+    user_id: str,
+    *,
+    subjects: list[str],
+    importances: list[str],
+    sources: list[str],
+    limit: int = WRONG_NOTE_BUNDLE_MAX_ITEMS,
+    after: tuple[str, int, str, int] | None = None,
+) -> dict:
+    """Noted items with full render-ready content (the /api/questions or /api/ox/questions item shape),
+    in one query over the note key index. Empty filter lists mean all. Pages are keyed on
+    (source, 출제연도, 과목, 문제번호); pass next_cursor back as `after`."""
+    empty = {"items": [], "next_cursor": "", "has_more": False}
+    if not DB_PATH.exists():
+        return empty
+    settle_wrong_note_writes(user_id)
+    conn = sqlite3.connect(DB_PATH)
+    try:
+        ensure_app_tables(conn)
+        filters = [f'n."{COL_NOTE_USER}" = ?']
+        params: list[object] = [normalize_user_id(user_id)]
+        for column, values in (
+            (f'n."{COL_NOTE_SOURCE}"', sources),
+            (f'n."{COL_SUBJECT}"', subjects),
+            (f'COALESCE(NULLIF(n."{COL_NOTE_IMPORTANCE}", \'\'), \'{DEFAULT_IMPORTANCE}\')', importances),
+        ):
+            if values:
+                filters.append(f'{column} IN ({", ".join("?" for _ in values)})')
+                params.extend(values)
+        if after is not None:
+            filters.append(f'(n."{COL_NOTE_SOURCE}", n."{COL_YEAR}", n."{COL_SUBJECT}", n."{COL_QNO}") > (?, ?, ?, ?)')
+            params.extend(after)
+        select_sql, join_sql = wrong_note_content_sql(conn)
+        rows = conn.execute(
+            f"""
+            SELECT {select_sql}
+            FROM "{TABLE_WRONG_NOTE}" n
+            {join_sql}
+            WHERE {" AND ".join(filters)}
+            ORDER BY n."{COL_NOTE_SOURCE}", n."{COL_YEAR}", n."{COL_SUBJECT}", n."{COL_QNO}"
+            LIMIT ?
+            """,
+            [*params, limit + 1],
+        ).fetchall()
+    finally:
+        conn.close()
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+    next_cursor = encode_wrong_note_bundle_cursor(*rows[-1][1:5]) if has_more else ""
+    return {"items": [build_wrong_note_item(row) for row in rows], "next_cursor": next_cursor, "has_more": has_more}
+
+
+def fetch_wrong_note_stats(user_id: str) -> dict:
+    """Note counts as {source: {subject: {importance: count}}}, read from the trigger-maintained counters."""
+    if not DB_PATH.exists():
+        return {"total": 0, "items": {}}
+    settle_wrong_note_writes(user_id)
+    conn = sqlite3.connect(DB_PATH)
+    try:
+        ensure_app_tables(conn)
+        rows = conn.execute(
+            f"""
+            SELECT "{COL_NOTE_SOURCE}", "{COL_SUBJECT}", "{COL_NOTE_IMPORTANCE}", "{COL_STATS_COUNT}"
+            FROM "{TABLE_WRONG_NOTE_STATS}"
+            WHERE "{COL_NOTE_USER}" = ?
+            """,
+            (normalize_user_id(user_id),),
+        ).fetchall()
+    finally:
+        conn.close()
+    items: dict[str, dict[str, dict[str, int]]] = {}
+    total = 0
+    for source, subject, importance, count in rows:
+        items.setdefault(source, {}).setdefault(subject, {})[importance or DEFAULT_IMPORTANCE] = int(count)
+        total += int(count)
+    return {"total": total, "items": items}
+
+
+def schedule_review(
+    *, interval_days: int, ease: float, reps: int, lapses: int, grade: int, importance: str
+) -> dict:
+    """SM-2 step for a 0-5 recall grade; the interval is then scaled by the note's importance."""
+    if grade < REVIEW_PASS_GRADE:
+        reps = 0
+        lapses += 1
+        interval = 1
+    else:
+        reps += 1
+        if reps == 1:
+            interval = 1
+        elif reps == 2:
+            interval = 6
+        else:
+            interval = round(max(interval_days, 1) * ease)
+    miss = 5 - grade
+    ease = max(REVIEW_MIN_EASE, ease + 0.1 - miss * (0.08 + miss * 0.02))
+    interval = max(1, round(interval * REVIEW_INTERVAL_FACTOR.get(importance, 1.0)))
+    return {"interval_days": interval, "ease": round(ease, 4), "reps": reps, "lapses": lapses}
+
+
+def record_review(*, user_id: str, note_id: int, grade: int) -> dict | None:
+    """Apply one review result to a note's schedule; None if the user has no such note."""
+    if not DB_PATH.exists():
+        return None
+    user_id = normalize_user_id(user_id)
+    settle_wrong_note_writes(user_id, strict=True)
+    conn = sqlite3.connect(DB_PATH)
+    try:
+        ensure_app_tables(conn)
+        conn.execute("BEGIN IMMEDIATE")
+        row = conn.execute(
+            f"""
+            SELECT n."{COL_NOTE_IMPORTANCE}", r."{COL_REVIEW_INTERVAL}", r."{COL_REVIEW_EASE}", r."{COL_REVIEW_REPS}", r."{COL_REVIEW_LAPSES}"
+            FROM "{TABLE_WRONG_NOTE_REVIEW}" r
+            JOIN "{TABLE_WRONG_NOTE}" n ON n."{COL_NOTE_ID}" = r."{COL_REVIEW_NOTE_ID}"
+            WHERE r."{COL_REVIEW_NOTE_ID}" = ? AND r."{COL_NOTE_USER}" = ?
+            """,
+            (note_id, user_id),
+        ).fetchone()
+        if row is None:
+            conn.rollback()
+            return None
+        importance, interval_days, ease, reps, lapses = row
+        schedule = schedule_review(
+            interval_days=int(interval_days),
+            ease=float(ease),
+            reps=int(reps),
+            lapses=int(lapses),
+            grade=grade,
+            importance=(importance or "").strip().lower(),
+        )
+        now = datetime.now()
+        schedule["reviewed_at"] = now.strftime("%Y-%m-%d %H:%M:%S")
+        schedule["due_at"] = (now + timedelta(days=schedule["interval_days"])).strftime("%Y-%m-%d %H:%M:%S")
+        conn.execute(
+            f"""
+            UPDATE "{TABLE_WRONG_NOTE_REVIEW}"
+            SET "{COL_REVIEW_DUE}" = ?, "{COL_REVIEW_INTERVAL}" = ?, "{COL_REVIEW_EASE}" = ?,
+                "{COL_REVIEW_REPS}" = ?, "{COL_REVIEW_LAPSES}" = ?, "{COL_REVIEW_REVIEWED}" = ?
+            WHERE "{COL_REVIEW_NOTE_ID}" = ?
+            """,
+            (
+                schedule["due_at"],
+                schedule["interval_days"],
+                schedule["ease"],
+                schedule["reps"],
+                schedule["lapses"],
+                schedule["reviewed_at"],
+                note_id,
+            ),
+        )
+        conn.commit()
+    finally:
+        conn.close()
+    return {"note_id": note_id, "grade": grade, **schedule}
+
+
+def fetch_review_queue(user_id: str, *, limit: int = REVIEW_QUEUE_SIZE) -> dict:
+    """The user's next due notes, earliest first, with the same content as the review bundle."""
+    now = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+    empty = {"now": now, "due": 0, "items": []}
+    if not DB_PATH.exists():
+        return empty
+    user_id = normalize_user_id(user_id)
+    settle_wrong_note_writes(user_id)
+    conn = sqlite3.connect(DB_PATH)
+    try:
+        ensure_app_tables(conn)
+        select_sql, join_sql = wrong_note_content_sql(conn)
+        rows = conn.execute(
+            f"""
+            SELECT
+                {select_sql},
+                r."{COL_REVIEW_DUE}", r."{COL_REVIEW_INTERVAL}", r."{COL_REVIEW_EASE}",
+                r."{COL_REVIEW_REPS}", r."{COL_REVIEW_LAPSES}", r."{COL_REVIEW_REVIEWED}"
+            FROM "{TABLE_WRONG_NOTE_REVIEW}" r
+            JOIN "{TABLE_WRONG_NOTE}" n ON n."{COL_NOTE_ID}" = r."{COL_REVIEW_NOTE_ID}"
+            {join_sql}
+            WHERE r."{COL_NOTE_USER}" = ? AND r."{COL_REVIEW_DUE}" <= ?
+            ORDER BY r."{COL_REVIEW_DUE}", r."{COL_REVIEW_NOTE_ID}"
+            LIMIT ?
+            """,
+            (user_id, now, limit),
+        ).fetchall()
+        due = conn.execute(
+            f"""
+            SELECT COUNT(*) FROM "{TABLE_WRONG_NOTE_REVIEW}"
+            WHERE "{COL_NOTE_USER}" = ? AND "{COL_REVIEW_DUE}" <= ?
+            """,
+            (user_id, now),
+        ).fetchone()[0]
+    finally:
+        conn.close()
+    items: list[dict] = []
+    for row in rows:
+        item = build_wrong_note_item(row[:WRONG_NOTE_CONTENT_COLUMNS])
+        due_at, interval_days, ease, reps, lapses, reviewed_at = row[WRONG_NOTE_CONTENT_COLUMNS:]
+        item["review"] = {
+            "due_at": due_at,
+            "interval_days": int(interval_days),
+            "ease": float(ease),
+            "reps": int(reps),
+            "lapses": int(lapses),
+            "reviewed_at": reviewed_at or "",
+        }
+        items.append(item)
+    return {"now": now, "due": int(due), "items": items}
+
+
+def fetch_wrong_note_seq(user_id: str) -> int:
+    """Latest change-feed seq for the user; a full listing taken after this call is covered from here on."""
+    if not DB_PATH.exists():
+        return 0
+    settle_wrong_note_writes(user_id)
+    conn = sqlite3.connect(DB_PATH)
+    try:
+        ensure_app_tables(conn)
+        row = conn.execute(
+            f'SELECT MAX("{COL_CHANGE_SEQ}") FROM "{TABLE_WRONG_NOTE_CHANGES}" WHERE "{COL_NOTE_USER}" = ?',
+            (normalize_user_id(user_id),),
+        ).fetchone()
+    finally:
+        conn.close()
+    return int(row[0] or 0)
+
+
+def fetch_wrong_note_changes(user_id: str, *, since: int = 0, limit: int = WRONG_NOTE_CHANGES_PAGE_SIZE) -> dict:
+    """Changes after seq `since` in seq order. Applying them in order (tombstones delete) reproduces the server state."""
+    empty = {"changes": [], "next_since": since, "has_more": False}
+    if not DB_PATH.exists():
+        return empty
+    settle_wrong_note_writes(user_id)
+    conn = sqlite3.connect(DB_PATH)
+    try:
+        ensure_app_tables(conn)
+        rows = conn.execute(
+            f"""
+            SELECT
+                "{COL_CHANGE_SEQ}", "{COL_NOTE_SOURCE}", "{COL_YEAR}", "{COL_SUBJECT}", "{COL_QNO}",
+                "{COL_NOTE_IMPORTANCE}", "{COL_NOTE_COMMENT}", "{COL_NOTE_UPDATED}", "{COL_CHANGE_DELETED}"
+            FROM "{TABLE_WRONG_NOTE_CHANGES}"
+            WHERE "{COL_NOTE_USER}" = ? AND "{COL_CHANGE_SEQ}" > ?
+            ORDER BY "{COL_CHANGE_SEQ}"
+            LIMIT ?
+            """,
+            (normalize_user_id(user_id), since, limit + 1),
+        ).fetchall()
+    finally:
+        conn.close()
+    has_more = len(rows) > limit
+    changes: list[dict] = []
+    for seq, source, year, subject, question_no, importance, comment, updated_at, deleted in rows[:limit]:
+        normalized_importance = (importance or "").strip().lower()
+        if normalized_importance not in IMPORTANCE_LEVELS:
+            normalized_importance = DEFAULT_IMPORTANCE
+        changes.append(
+            {
+                "seq": int(seq),
+                "source": source or NOTE_SOURCE_QUESTION,
+                "year": int(year),
+                "subject": subject,
+                "question_no": int(question_no),
+                "deleted": bool(deleted),
+                "importance": "" if deleted else normalized_importance,
+                "comment": "" if deleted else (comment or ""),
+                "updated_at": updated_at or "",
+            }
+        )
+    next_since = changes[-1]["seq"] if changes else since
+    return {"changes": changes, "next_since": next_since, "has_more": has_more}
+
+
+def write_wrong_notes(conn: sqlite3.Connection, upserts: list[tuple], deletes: list[tuple]) -> None:
+    """upserts and deletes: (user_id, source, year, subject, question_no, importance, comment, updated_at) and
+    (user_id, source, year, subject, question_no, updated_at).
+
+    A delete's updated_at is the time the client deleted the note. It replaces the server clock on the
+    tombstone the delete trigger writes (or becomes a new tombstone when there was no row), so
+    merge_wrong_notes compares later edits against when the delete happened, not when it arrived.
+    """
+    key_filter = (
+        f'"{COL_NOTE_USER}" = ? AND "{COL_NOTE_SOURCE}" = ? AND "{COL_YEAR}" = ? AND "{COL_SUBJECT}" = ? AND "{COL_QNO}" = ?'
+    )
+    key_columns = f'"{COL_NOTE_USER}", "{COL_NOTE_SOURCE}", "{COL_YEAR}", "{COL_SUBJECT}", "{COL_QNO}"'
+    for *key, updated_at in deletes:
+        removed = conn.execute(f'DELETE FROM "{TABLE_WRONG_NOTE}" WHERE {key_filter}', key).rowcount
+        if removed:
+            conn.execute(
+                f"""
+                UPDATE "{TABLE_WRONG_NOTE_CHANGES}" SET "{COL_NOTE_UPDATED}" = ?
+                WHERE "{COL_CHANGE_SEQ}" = (
+                    SELECT MAX("{COL_CHANGE_SEQ}") FROM "{TABLE_WRONG_NOTE_CHANGES}"
+                    WHERE {key_filter} AND "{COL_CHANGE_DELETED}" = 1
+                )
+                """,
+                (updated_at, *key),
+            )
+        else:
+            conn.execute(
+                f"""
+                INSERT INTO "{TABLE_WRONG_NOTE_CHANGES}" ({key_columns}, "{COL_NOTE_UPDATED}", "{COL_CHANGE_DELETED}")
+                VALUES (?, ?, ?, ?, ?, ?, 1)
+                """,
+                (*key, updated_at),
+            )
+    conn.executemany(
+        f"""
+        INSERT INTO "{TABLE_WRONG_NOTE}"
+        ("{COL_NOTE_USER}", "{COL_NOTE_SOURCE}", "{COL_YEAR}", "{COL_SUBJECT}", "{COL_QNO}", "{COL_NOTE_IMPORTANCE}", "{COL_NOTE_COMMENT}", "{COL_NOTE_UPDATED}")
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+        ON CONFLICT("{COL_NOTE_USER}", "{COL_NOTE_SOURCE}", "{COL_YEAR}", "{COL_SUBJECT}", "{COL_QNO}")
+        DO UPDATE SET
+            "{COL_NOTE_IMPORTANCE}" = excluded."{COL_NOTE_IMPORTANCE}",
+            "{COL_NOTE_COMMENT}" = excluded."{COL_NOTE_COMMENT}",
+            "{COL_NOTE_UPDATED}" = excluded."{COL_NOTE_UPDATED}"
+        """,
+        upserts,
+    )
+
+
+class WrongNoteWriteBuffer:
+    """Write-behind buffer for upsert_wrong_note.
+
+    Rapid importance toggles on one question overwrite each other in memory (keyed by
+    user_id, source, year, subject, question_no) and reach SQLite as one row per key in a
+    batched transaction, on a timer, when max_pending keys are waiting, or on close().
+    Pending state is keyed the same way the table is, so reads either overlay it
+    (pending_for) or flush the user's keys first (flush(user_id=...)).
+    """
+
+    def __init__(self, *, interval_seconds: float, max_pending: int) -> None:
+        self.interval_seconds = interval_seconds
+        self.max_pending = max(1, max_pending)
+        self._pending: dict[tuple, tuple[str, str, str, bool]] = {}
+        self._lock = threading.Lock()
+        # Held for the whole write so a read that flushes first never races an in-flight batch.
+        self._flush_lock = threading.Lock()
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+        self.submitted = 0
+        self.coalesced = 0
+        self.written = 0
+        self.flushes = 0
+        self.flush_errors = 0
+        self.last_flush_ms = 0.0
+
+    def start(self) -> None:
+        self._thread = threading.Thread(target=self._run, name="wrong-note-writer", daemon=True)
+        self._thread.start()
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            self._wake.wait(self.interval_seconds)
+            self._wake.clear()
+            # Any failure is counted in flush() and the batch stays queued; the thread must outlive it,
+            # because submit() keeps accepting writes.
+            try:
+                self.flush()
+            except Exception as exc:
+                print(f"wrong-note flush failed: {exc!r}")
+
+    def submit(self, key: tuple, state: tuple[str, str, str, bool]) -> None:
+        with self._lock:
+            if key in self._pending:
+                self.coalesced += 1
+            self._pending[key] = state
+            self.submitted += 1
+            full = len(self._pending) >= self.max_pending
+        if full:
+            self._wake.set()
+
+    def pending_for(self, user_id: str) -> dict[tuple, tuple[str, str, str, bool]]:
+        with self._lock:
+            return {key: state for key, state in self._pending.items() if key[0] == user_id}
+
+    def flush(self, *, user_id: str | None = None) -> int:
+        with self._flush_lock:
+            with self._lock:
+                if user_id is None:
+                    batch, self._pending = self._pending, {}
+                else:
+                    batch = {key: state for key, state in self._pending.items() if key[0] == user_id}
+                    for key in batch:
+                        del self._pending[key]
+            if not batch:
+                return 0
+            started = time.perf_counter()
+            upserts = [
+                (*key, importance, comment, updated_at)
+                for key, (importance, comment, updated_at, deleted) in batch.items()
+                if not deleted
+            ]
+            deletes = [(*key, updated_at) for key, (_, _, updated_at, deleted) in batch.items() if deleted]
+            conn: sqlite3.Connection | None = None
+            try:
+                conn = sqlite3.connect(DB_PATH)
+                ensure_app_tables(conn)
+                write_wrong_notes(conn, upserts, deletes)
+                conn.commit()
+            except Exception:
+                if conn is not None:
+                    conn.rollback()
+                with self._lock:
+                    self.flush_errors += 1
+                    # Keep anything submitted while we were writing; it is newer than the failed batch.
+                    for key, state in batch.items():
+                        self._pending.setdefault(key, state)
+                raise
+            finally:
+                if conn is not None:
+                    conn.close()
+            with self._lock:
+                self.written += len(batch)
+                self.flushes += 1
+                self.last_flush_ms = round((time.perf_counter() - started) * 1000, 2)
+            return len(batch)
+
+    def close(self) -> None:
+        self._stop.set()
+        self._wake.set()
+        if self._thread is not None:
+            self._thread.join()
+        self.flush()
+
+    def metrics(self) -> dict:
+        with self._lock:
+            return {
+                "pending": len(self._pending),
+                "submitted": self.submitted,
+                "coalesced": self.coalesced,
+                "written": self.written,
+                "flushes": self.flushes,
+                "flush_errors": self.flush_errors,
+                "last_flush_ms": self.last_flush_ms,
+            }
+
+
+# Started by main() when --write-buffer-ms > 0 (opt-in); otherwise, and for library callers
+# (scripts/), every write is committed before the request returns.
+WRONG_NOTE_BUFFER: WrongNoteWriteBuffer | None = None
+
+
+def settle_wrong_note_writes(user_id: str, *, strict: bool = False) -> None:
+    """Flush the user's buffered writes before a read that cannot overlay them.
+
+    If the flush fails, reads log it and serve the last committed state; the batch stays queued
+    for the next flush. strict callers, which write on top of what they read, get the exception.
+    """
+    if WRONG_NOTE_BUFFER is None:
+        return
+    try:
+        WRONG_NOTE_BUFFER.flush(user_id=normalize_user_id(user_id))
+    except Exception as exc:
+        if strict:
+            raise
+        print(f"wrong-note flush before read failed: {exc!r}")
 
 
 def upsert_wrong_note(
@@ -947,51 +2829,207 @@ def upsert_wrong_note(
     question_no: int,
     importance: str,
     comment: str,
+    updated_at: str = "",
 ) -> None:
+    """updated_at is the client's edit time in 수정일시 format (parse_client_timestamp); defaults to now."""
     normalized_user_id = normalize_user_id(user_id)
     normalized_source = source if source in {NOTE_SOURCE_QUESTION, NOTE_SOURCE_OX} else NOTE_SOURCE_QUESTION
     raw_importance = (importance or "").strip().lower()
     normalized_importance = raw_importance if raw_importance in IMPORTANCE_LEVELS else DEFAULT_IMPORTANCE
     normalized_comment = normalize_question_text(comment or "")
-    updated_at = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+    updated_at = updated_at or datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+    key = (normalized_user_id, normalized_source, year, subject, question_no)
+    deleted = not raw_importance and not normalized_comment
+
+    if WRONG_NOTE_BUFFER is not None:
+        WRONG_NOTE_BUFFER.submit(key, (normalized_importance, normalized_comment, updated_at, deleted))
+        return
 
     conn = sqlite3.connect(DB_PATH)
     try:
         ensure_app_tables(conn)
-        if not raw_importance and not normalized_comment:
-            conn.execute(
+        if deleted:
+            write_wrong_notes(conn, [], [(*key, updated_at)])
+        else:
+            write_wrong_notes(conn, [(*key, normalized_importance, normalized_comment, updated_at)], [])
+        conn.commit()
+    finally:
+        conn.close()
+
+
+def parse_client_timestamp(value: object) -> str:
+    """Client ISO-8601 time (UTC 'Z' from Date.toISOString() or naive local) → 수정일시 format, capped at now."""
+    text = str(value or "").strip()
+    if not text:
+        return ""
+    try:
+        parsed = datetime.fromisoformat(text.replace("Z", "+00:00"))
+    except ValueError:
+        return ""
+    if parsed.tzinfo is not None:
+        parsed = parsed.astimezone().replace(tzinfo=None)
+    # A device with a fast clock must not win every later conflict.
+    return min(parsed, datetime.now()).strftime("%Y-%m-%d %H:%M:%S")
+
+
+def merge_wrong_notes(*, user_id: str, notes: list) -> dict:
+    """Last-writer-wins merge of a device's notes in one transaction.
+
+    A note key is (source, year, subject, question_no); OX notes may send stable_id instead of
+    question_no. An incoming note is applied only when its updated_at is newer than the server
+    row, or, when the server has no row, newer than the tombstone in the change log. Empty
+    importance and comment (or deleted=true) is a delete, as in upsert_wrong_note.
+    """
+    normalized_user_id = normalize_user_id(user_id)
+    rejected: list[dict] = []
+    incoming: dict[tuple, dict] = {}
+    pending_stable: list[tuple[int, dict]] = []
+    for index, note in enumerate(notes):
+        if not isinstance(note, dict):
+            rejected.append({"index": index, "error": "invalid note"})
+            continue
+        source = str(note.get("source") or NOTE_SOURCE_QUESTION).strip().lower()
+        subject = str(note.get("subject") or "")
+        updated_at = parse_client_timestamp(note.get("updated_at"))
+        try:
+            year = int(note.get("year"))
+        except (TypeError, ValueError):
+            rejected.append({"index": index, "error": "invalid year"})
+            continue
+        if source not in {NOTE_SOURCE_QUESTION, NOTE_SOURCE_OX}:
+            rejected.append({"index": index, "error": "invalid source"})
+            continue
+        if subject not in SUBJECTS:
+            rejected.append({"index": index, "error": "invalid subject"})
+            continue
+        if not updated_at:
+            rejected.append({"index": index, "error": "invalid updated_at"})
+            continue
+        raw_importance = str(note.get("importance") or "").strip().lower()
+        comment = normalize_question_text(str(note.get("comment") or ""))
+        entry = {
+            "source": source,
+            "year": year,
+            "subject": subject,
+            "question_no": 0,
+            "stable_id": str(note.get("stable_id") or "").strip(),
+            "importance": raw_importance if raw_importance in IMPORTANCE_LEVELS else DEFAULT_IMPORTANCE,
+            "comment": comment,
+            "updated_at": updated_at,
+            "deleted": bool(note.get("deleted")) or (not raw_importance and not comment),
+        }
+        try:
+            entry["question_no"] = int(note.get("question_no"))
+        except (TypeError, ValueError):
+            if source == NOTE_SOURCE_OX and entry["stable_id"]:
+                pending_stable.append((index, entry))
+                continue
+            rejected.append({"index": index, "error": "invalid question_no"})
+            continue
+        key = (source, year, subject, entry["question_no"])
+        if key not in incoming or incoming[key]["updated_at"] < updated_at:
+            incoming[key] = entry
+
+    settle_wrong_note_writes(normalized_user_id, strict=True)
+    conn = sqlite3.connect(DB_PATH)
+    try:
+        ensure_app_tables(conn)
+        # Read, decide and write under one write lock so concurrent merges cannot interleave.
+        conn.execute("BEGIN IMMEDIATE")
+        for index, entry in pending_stable:
+            row = conn.execute(
                 f"""
-                DELETE FROM "{TABLE_WRONG_NOTE}"
-                WHERE "{COL_NOTE_USER}" = ? AND "{COL_NOTE_SOURCE}" = ? AND "{COL_YEAR}" = ? AND "{COL_SUBJECT}" = ? AND "{COL_QNO}" = ?
+                SELECT "{COL_OX_QNO}" FROM "{TABLE_OX}"
+                WHERE "{COL_YEAR}" = ? AND "{COL_SUBJECT}" = ? AND "{COL_OX_STABLE_ID}" = ?
                 """,
-                (normalized_user_id, normalized_source, year, subject, question_no),
-            )
-        else:
-            conn.execute(
+                (entry["year"], entry["subject"], entry["stable_id"]),
+            ).fetchone()
+            if row is None:
+                rejected.append({"index": index, "error": "unknown stable_id"})
+                continue
+            entry["question_no"] = int(row[0])
+            key = (entry["source"], entry["year"], entry["subject"], entry["question_no"])
+            if key not in incoming or incoming[key]["updated_at"] < entry["updated_at"]:
+                incoming[key] = entry
+
+        # Point lookups on the (user_id, source, year, subject, question_no) keys of both tables.
+        current: dict[tuple, tuple[str, str, str]] = {}
+        tombstones: dict[tuple, str] = {}
+        key_filter = (
+            f'"{COL_NOTE_USER}" = ? AND "{COL_NOTE_SOURCE}" = ? AND "{COL_YEAR}" = ? AND "{COL_SUBJECT}" = ? AND "{COL_QNO}" = ?'
+        )
+        for key in incoming:
+            row = conn.execute(
                 f"""
-                INSERT INTO "{TABLE_WRONG_NOTE}"
-                ("{COL_NOTE_USER}", "{COL_NOTE_SOURCE}", "{COL_YEAR}", "{COL_SUBJECT}", "{COL_QNO}", "{COL_NOTE_IMPORTANCE}", "{COL_NOTE_COMMENT}", "{COL_NOTE_UPDATED}")
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?)
-                ON CONFLICT("{COL_NOTE_USER}", "{COL_NOTE_SOURCE}", "{COL_YEAR}", "{COL_SUBJECT}", "{COL_QNO}")
-                DO UPDATE SET
-                    "{COL_NOTE_IMPORTANCE}" = excluded."{COL_NOTE_IMPORTANCE}",
-                    "{COL_NOTE_COMMENT}" = excluded."{COL_NOTE_COMMENT}",
-                    "{COL_NOTE_UPDATED}" = excluded."{COL_NOTE_UPDATED}"
+                SELECT "{COL_NOTE_IMPORTANCE}", "{COL_NOTE_COMMENT}", "{COL_NOTE_UPDATED}"
+                FROM "{TABLE_WRONG_NOTE}"
+                WHERE {key_filter}
                 """,
-                (
-                    normalized_user_id,
-                    normalized_source,
-                    year,
-                    subject,
-                    question_no,
-                    normalized_importance,
-                    normalized_comment,
-                    updated_at,
-                ),
-            )
+                (normalized_user_id, *key),
+            ).fetchone()
+            if row is not None:
+                current[key] = (row[0] or "", row[1] or "", row[2] or "")
+                continue
+            row = conn.execute(
+                f"""
+                SELECT "{COL_NOTE_UPDATED}"
+                FROM "{TABLE_WRONG_NOTE_CHANGES}"
+                WHERE {key_filter} AND "{COL_CHANGE_DELETED}" = 1
+                ORDER BY "{COL_CHANGE_SEQ}" DESC
+                LIMIT 1
+                """,
+                (normalized_user_id, *key),
+            ).fetchone()
+            if row is not None:
+                tombstones[key] = row[0] or ""
+
+        upserts: list[tuple] = []
+        deletes: list[tuple] = []
+        items: list[dict] = []
+        for key, entry in incoming.items():
+            server_row = current.get(key)
+            server_updated = server_row[2] if server_row is not None else tombstones.get(key, "")
+            applied = entry["updated_at"] > server_updated
+            if applied and entry["deleted"]:
+                deletes.append((normalized_user_id, *key, entry["updated_at"]))
+                server_row = None
+            elif applied:
+                upserts.append((normalized_user_id, *key, entry["importance"], entry["comment"], entry["updated_at"]))
+                server_row = (entry["importance"], entry["comment"], entry["updated_at"])
+            item = {
+                "source": key[0],
+                "year": key[1],
+                "subject": key[2],
+                "question_no": key[3],
+                "applied": applied,
+                "deleted": server_row is None,
+                "importance": "",
+                "comment": "",
+                "updated_at": server_updated if server_row is None and not applied else entry["updated_at"],
+            }
+            if server_row is not None:
+                importance = (server_row[0] or "").strip().lower()
+                item["importance"] = importance if importance in IMPORTANCE_LEVELS else DEFAULT_IMPORTANCE
+                item["comment"] = server_row[1]
+                item["updated_at"] = server_row[2]
+            if entry["stable_id"]:
+                item["stable_id"] = entry["stable_id"]
+            items.append(item)
+
+        write_wrong_notes(conn, upserts, deletes)
         conn.commit()
+    except Exception:
+        conn.rollback()
+        raise
     finally:
         conn.close()
+    rejected.sort(key=lambda item: item["index"])
+    return {
+        "applied": len(upserts) + len(deletes),
+        "skipped": len(items) - sum(1 for item in items if item["applied"]),
+        "rejected": rejected,
+        "items": items,
+    }
 
 
 class AppHandler(SimpleHTTPRequestHandler):
@@ -1017,12 +3055,36 @@ class AppHandler(SimpleHTTPRequestHandler):
         if parsed.path == "/api/ox/questions":
             self.handle_ox_questions_api(parsed.query)
             return
+        if parsed.path == "/api/ox/similar":
+            self.handle_ox_similar_api(parsed.query)
+            return
+        if parsed.path == "/api/search":
+            self.handle_search_api(parsed.query)
+            return
+        if parsed.path == "/api/ox/source":
+            self.handle_ox_source_api(parsed.query)
+            return
         if parsed.path == "/api/wrong-notes":
             self.handle_wrong_notes_api(parsed.query)
             return
+        if parsed.path == "/api/wrong-notes/changes":
+            self.handle_wrong_note_changes_api(parsed.query)
+            return
         if parsed.path == "/api/wrong-notes/map":
             self.handle_wrong_notes_map_api(parsed.query)
             return
+        if parsed.path == "/api/wrong-notes/bundle":
+            self.handle_wrong_notes_bundle_api(parsed.query)
+            return
+        if parsed.path == "/api/wrong-notes/stats":
+            self.handle_wrong_note_stats_api(parsed.query)
+            return
+        if parsed.path == "/api/review/next":
+            self.handle_review_next_api(parsed.query)
+            return
+        if parsed.path == "/api/exams/attempts":
+            self.handle_exam_attempts_api(parsed.query)
+            return
         if parsed.path == "/api/notices":
             self.handle_notices_api(parsed.query)
             return
@@ -1033,7 +3095,12 @@ class AppHandler(SimpleHTTPRequestHandler):
             self.handle_contact_api()
             return
         if parsed.path == "/api/health":
-            make_json_response(self, {"ok": True})
+            health: dict = {"ok": True}
+            if WRONG_NOTE_BUFFER is not None:
+                health["wrong_note_buffer"] = WRONG_NOTE_BUFFER.metrics()
+            if QUESTION_STATS_BUFFER is not None:
+                health["question_stats_buffer"] = QUESTION_STATS_BUFFER.metrics()
+            make_json_response(self, health)
             return
         if parsed.path == "/":
             self.path = "/index.html"
@@ -1044,6 +3111,18 @@ class AppHandler(SimpleHTTPRequestHandler):
         if parsed.path == "/api/wrong-notes":
             self.handle_wrong_note_upsert_api()
             return
+        if parsed.path == "/api/review/result":
+            self.handle_review_result_api()
+            return
+        if parsed.path == "/api/exams/submit":
+            self.handle_exam_submit_api()
+            return
+        if parsed.path == "/api/ox/answers":
+            self.handle_ox_answers_api()
+            return
+        if parsed.path == "/api/wrong-notes/merge":
+            self.handle_wrong_note_merge_api()
+            return
         if parsed.path == "/api/notices":
             self.handle_notice_upsert_api()
             return
@@ -1068,6 +3147,11 @@ class AppHandler(SimpleHTTPRequestHandler):
             make_json_response(self, {"error": "invalid subject"}, status=HTTPStatus.BAD_REQUEST)
             return
         questions = fetch_questions(year, subject)
+        if (params.get("answers") or ["1"])[0].strip().lower() in {"0", "false", "no"}:
+            # Answer key withheld until /api/exams/submit returns it with the grading.
+            for question in questions:
+                for key in ("answer", "distributed_answer", "explanation"):
+                    question.pop(key, None)
         make_json_response(self, {"year": year, "subject": subject, "count": len(questions), "questions": questions})
 
     def handle_ox_questions_api(self, query: str) -> None:
@@ -1082,6 +3166,79 @@ class AppHandler(SimpleHTTPRequestHandler):
         questions = fetch_ox_questions(year, subject)
         make_json_response(self, {"year": year, "subject": subject, "count": len(questions), "questions": questions})
 
+    def handle_search_api(self, query: str) -> None:
+        params = parse_qs(query)
+        text = " ".join((params.get("q") or [""])[0].split())
+        subject = (params.get("subject") or [""])[0]
+        source = (params.get("source") or [""])[0].strip().lower()
+        year_text = (params.get("year") or [""])[0]
+        if not text:
+            make_json_response(self, {"error": "q required"}, status=HTTPStatus.BAD_REQUEST)
+            return
+        if len(text) > 100:
+            make_json_response(self, {"error": "q too long"}, status=HTTPStatus.BAD_REQUEST)
+            return
+        year: int | None = None
+        try:
+            if year_text:
+                year = int(year_text)
+            page = max(1, int((params.get("page") or ["1"])[0]))
+            page_size = max(1, min(SEARCH_MAX_PAGE_SIZE, int((params.get("page_size") or [str(SEARCH_PAGE_SIZE)])[0])))
+        except ValueError:
+            make_json_response(self, {"error": "invalid paging or year"}, status=HTTPStatus.BAD_REQUEST)
+            return
+        if subject and subject not in SUBJECTS:
+            make_json_response(self, {"error": "invalid subject"}, status=HTTPStatus.BAD_REQUEST)
+            return
+        if source and source not in {NOTE_SOURCE_QUESTION, NOTE_SOURCE_OX}:
+            make_json_response(self, {"error": "invalid source"}, status=HTTPStatus.BAD_REQUEST)
+            return
+        result = search_content(text, subject=subject, year=year, source=source, page=page, page_size=page_size)
+        make_json_response(self, {"q": text, **result})
+
+    def handle_ox_source_api(self, query: str) -> None:
+        params = parse_qs(query)
+        year_text = (params.get("year") or [""])[0]
+        subject = (params.get("subject") or [""])[0]
+        stable_id = (params.get("stable_id") or [""])[0].strip()
+        try:
+            year = int(year_text)
+        except ValueError:
+            make_json_response(self, {"error": "invalid year"}, status=HTTPStatus.BAD_REQUEST)
+            return
+        if subject not in SUBJECTS:
+            make_json_response(self, {"error": "invalid subject"}, status=HTTPStatus.BAD_REQUEST)
+            return
+        if not stable_id:
+            make_json_response(self, {"error": "stable_id required"}, status=HTTPStatus.BAD_REQUEST)
+            return
+        payload = fetch_ox_with_source(year, subject, stable_id)
+        if payload is None:
+            make_json_response(self, {"error": "not found"}, status=HTTPStatus.NOT_FOUND)
+            return
+        make_json_response(self, payload)
+
+    def handle_ox_similar_api(self, query: str) -> None:
+        params = parse_qs(query)
+        stable_id = (params.get("stable_id") or [""])[0].strip()
+        year_text = (params.get("year") or [""])[0]
+        subject = (params.get("subject") or [""])[0]
+        if not stable_id:
+            make_json_response(self, {"error": "stable_id required"}, status=HTTPStatus.BAD_REQUEST)
+            return
+        year: int | None = None
+        if year_text:
+            try:
+                year = int(year_text)
+            except ValueError:
+                make_json_response(self, {"error": "invalid year"}, status=HTTPStatus.BAD_REQUEST)
+                return
+        if subject and subject not in SUBJECTS:
+            make_json_response(self, {"error": "invalid subject"}, status=HTTPStatus.BAD_REQUEST)
+            return
+        items = fetch_ox_similar(stable_id, year=year, subject=subject)
+        make_json_response(self, {"stable_id": stable_id, "count": len(items), "items": items})
+
     def handle_wrong_notes_api(self, query: str) -> None:
         params = parse_qs(query)
         user_id = normalize_user_id((params.get("user_id") or [""])[0])
@@ -1098,37 +3255,268 @@ class AppHandler(SimpleHTTPRequestHandler):
         if importance and importance not in IMPORTANCE_LEVELS:
             make_json_response(self, {"error": "invalid importance"}, status=HTTPStatus.BAD_REQUEST)
             return
-        notes = fetch_wrong_notes(
+        try:
+            limit = int((params.get("limit") or [str(WRONG_NOTE_PAGE_SIZE)])[0] or WRONG_NOTE_PAGE_SIZE)
+        except ValueError:
+            make_json_response(self, {"error": "invalid limit"}, status=HTTPStatus.BAD_REQUEST)
+            return
+        if limit < 1:
+            make_json_response(self, {"error": "invalid limit"}, status=HTTPStatus.BAD_REQUEST)
+            return
+        cursor = (params.get("cursor") or [""])[0].strip()
+        after = None
+        if cursor:
+            after = decode_wrong_note_cursor(cursor)
+            if after is None:
+                make_json_response(self, {"error": "invalid cursor"}, status=HTTPStatus.BAD_REQUEST)
+                return
+        seq = fetch_wrong_note_seq(user_id)
+        page = fetch_wrong_notes(
             user_id=user_id,
             source=source,
             subject=subject,
             importance=importance,
             comment=comment,
+            limit=min(limit, WRONG_NOTE_MAX_PAGE_SIZE),
+            after=after,
         )
-        make_json_response(self, {"user_id": user_id, "count": len(notes), "items": notes})
+        make_json_response(self, {"user_id": user_id, "seq": seq, "count": len(page["items"]), **page})
+
+    def handle_wrong_note_changes_api(self, query: str) -> None:
+        params = parse_qs(query)
+        user_id = normalize_user_id((params.get("user_id") or [""])[0])
+        try:
+            since = int((params.get("since") or ["0"])[0] or 0)
+            limit = int((params.get("limit") or [str(WRONG_NOTE_CHANGES_PAGE_SIZE)])[0] or WRONG_NOTE_CHANGES_PAGE_SIZE)
+        except ValueError:
+            make_json_response(self, {"error": "invalid since/limit"}, status=HTTPStatus.BAD_REQUEST)
+            return
+        if since < 0 or limit < 1:
+            make_json_response(self, {"error": "invalid since/limit"}, status=HTTPStatus.BAD_REQUEST)
+            return
+        feed = fetch_wrong_note_changes(user_id, since=since, limit=min(limit, WRONG_NOTE_CHANGES_MAX_PAGE_SIZE))
+        make_json_response(self, {"user_id": user_id, "since": since, **feed})
 
     def handle_wrong_notes_map_api(self, query: str) -> None:
         params = parse_qs(query)
         user_id = normalize_user_id((params.get("user_id") or [""])[0])
-        source = (params.get("source") or [NOTE_SOURCE_QUESTION])[0].strip().lower() or NOTE_SOURCE_QUESTION
-        year_text = (params.get("year") or [""])[0]
-        subject = (params.get("subject") or [""])[0]
+        sources = [value.lower() for value in parse_list_param(params, "source")]
+        subjects = parse_list_param(params, "subject")
         try:
-            year = int(year_text)
+            years = [int(value) for value in parse_list_param(params, "year")]
         except ValueError:
             make_json_response(self, {"error": "invalid year"}, status=HTTPStatus.BAD_REQUEST)
             return
-        if source not in {NOTE_SOURCE_QUESTION, NOTE_SOURCE_OX}:
+        if any(source not in {NOTE_SOURCE_QUESTION, NOTE_SOURCE_OX} for source in sources):
             make_json_response(self, {"error": "invalid source"}, status=HTTPStatus.BAD_REQUEST)
             return
-        if subject not in SUBJECTS:
+        if any(subject not in SUBJECTS for subject in subjects):
             make_json_response(self, {"error": "invalid subject"}, status=HTTPStatus.BAD_REQUEST)
             return
-        note_map = fetch_wrong_note_map(year, subject, user_id, source)
+        if len(years) > WRONG_NOTE_MAP_MAX_YEARS:
+            make_json_response(self, {"error": "too many years"}, status=HTTPStatus.BAD_REQUEST)
+            return
+        if len(years) == 1 and len(subjects) == 1 and len(sources) <= 1:
+            # Single (year, subject, source): the original flat {question_no: note} response.
+            source = sources[0] if sources else NOTE_SOURCE_QUESTION
+            note_map = fetch_wrong_note_map(years[0], subjects[0], user_id, source)
+            make_json_response(
+                self,
+                {"user_id": user_id, "year": years[0], "subject": subjects[0], "source": source, "items": note_map},
+            )
+            return
+        nested = fetch_wrong_note_maps(user_id, years=years, subjects=subjects, sources=sources)
         make_json_response(
             self,
-            {"user_id": user_id, "year": year, "subject": subject, "source": source, "items": note_map},
+            {"user_id": user_id, "years": years, "subjects": subjects, "sources": sources, "nested": True, "items": nested},
+        )
+
+    def handle_wrong_notes_bundle_api(self, query: str) -> None:
+        params = parse_qs(query)
+        user_id = normalize_user_id((params.get("user_id") or [""])[0])
+        sources = [value.lower() for value in parse_list_param(params, "source")]
+        subjects = parse_list_param(params, "subject")
+        importances = [value.lower() for value in parse_list_param(params, "importance")]
+        try:
+            limit = int((params.get("limit") or [str(WRONG_NOTE_BUNDLE_MAX_ITEMS)])[0] or WRONG_NOTE_BUNDLE_MAX_ITEMS)
+        except ValueError:
+            make_json_response(self, {"error": "invalid limit"}, status=HTTPStatus.BAD_REQUEST)
+            return
+        if limit < 1:
+            make_json_response(self, {"error": "invalid limit"}, status=HTTPStatus.BAD_REQUEST)
+            return
+        if any(source not in {NOTE_SOURCE_QUESTION, NOTE_SOURCE_OX} for source in sources):
+            make_json_response(self, {"error": "invalid source"}, status=HTTPStatus.BAD_REQUEST)
+            return
+        if any(subject not in SUBJECTS for subject in subjects):
+            make_json_response(self, {"error": "invalid subject"}, status=HTTPStatus.BAD_REQUEST)
+            return
+        if any(importance not in IMPORTANCE_LEVELS for importance in importances):
+            make_json_response(self, {"error": "invalid importance"}, status=HTTPStatus.BAD_REQUEST)
+            return
+        cursor = (params.get("cursor") or [""])[0].strip()
+        after = None
+        if cursor:
+            after = decode_wrong_note_bundle_cursor(cursor)
+            if after is None:
+                make_json_response(self, {"error": "invalid cursor"}, status=HTTPStatus.BAD_REQUEST)
+                return
+        bundle = fetch_wrong_note_bundle(
+            user_id,
+            subjects=subjects,
+            importances=importances,
+            sources=sources,
+            limit=min(limit, WRONG_NOTE_BUNDLE_MAX_ITEMS),
+            after=after,
         )
+        make_json_response(self, {"user_id": user_id, "count": len(bundle["items"]), **bundle})
+
+    def handle_wrong_note_stats_api(self, query: str) -> None:
+        params = parse_qs(query)
+        user_id = normalize_user_id((params.get("user_id") or [""])[0])
+        make_json_response(self, {"user_id": user_id, **fetch_wrong_note_stats(user_id)})
+
+    def handle_review_next_api(self, query: str) -> None:
+        params = parse_qs(query)
+        user_id = normalize_user_id((params.get("user_id") or [""])[0])
+        try:
+            limit = int((params.get("n") or [str(REVIEW_QUEUE_SIZE)])[0] or REVIEW_QUEUE_SIZE)
+        except ValueError:
+            make_json_response(self, {"error": "invalid n"}, status=HTTPStatus.BAD_REQUEST)
+            return
+        if limit < 1:
+            make_json_response(self, {"error": "invalid n"}, status=HTTPStatus.BAD_REQUEST)
+            return
+        queue = fetch_review_queue(user_id, limit=min(limit, REVIEW_QUEUE_MAX_SIZE))
+        make_json_response(self, {"user_id": user_id, "count": len(queue["items"]), **queue})
+
+    def handle_review_result_api(self) -> None:
+        try:
+            content_length = int(self.headers.get("Content-Length") or "0")
+        except ValueError:
+            make_json_response(self, {"error": "invalid content length"}, status=HTTPStatus.BAD_REQUEST)
+            return
+        raw = self.rfile.read(content_length) if content_length > 0 else b"{}"
+        try:
+            payload = json.loads(raw.decode("utf-8"))
+        except (ValueError, UnicodeDecodeError):
+            make_json_response(self, {"error": "invalid json"}, status=HTTPStatus.BAD_REQUEST)
+            return
+        try:
+            note_id = int(payload.get("note_id"))
+            grade = int(payload.get("grade"))
+        except (TypeError, ValueError):
+            make_json_response(self, {"error": "invalid note_id/grade"}, status=HTTPStatus.BAD_REQUEST)
+            return
+        if not 0 <= grade <= 5:
+            make_json_response(self, {"error": "grade must be 0-5"}, status=HTTPStatus.BAD_REQUEST)
+            return
+        user_id = normalize_user_id(str(payload.get("user_id") or ""))
+        result = record_review(user_id=user_id, note_id=note_id, grade=grade)
+        if result is None:
+            make_json_response(self, {"error": "note not found"}, status=HTTPStatus.NOT_FOUND)
+            return
+        make_json_response(self, {"ok": True, "user_id": user_id, **result})
+
+    def handle_exam_submit_api(self) -> None:
+        try:
+            content_length = int(self.headers.get("Content-Length") or "0")
+        except ValueError:
+            make_json_response(self, {"error": "invalid content length"}, status=HTTPStatus.BAD_REQUEST)
+            return
+        raw = self.rfile.read(content_length) if content_length > 0 else b"{}"
+        try:
+            payload = json.loads(raw.decode("utf-8"))
+        except (ValueError, UnicodeDecodeError):
+            make_json_response(self, {"error": "invalid json"}, status=HTTPStatus.BAD_REQUEST)
+            return
+        try:
+            year = int(payload.get("year"))
+        except (TypeError, ValueError):
+            make_json_response(self, {"error": "invalid year"}, status=HTTPStatus.BAD_REQUEST)
+            return
+        subject = str(payload.get("subject") or "")
+        if subject not in SUBJECTS:
+            make_json_response(self, {"error": "invalid subject"}, status=HTTPStatus.BAD_REQUEST)
+            return
+        # {"1": 3, "2": 5, ...} keyed by question number, or a list where index 0 is question 1; 0/null = unanswered.
+        raw_answers = payload.get("answers")
+        if isinstance(raw_answers, list):
+            raw_answers = {str(index + 1): value for index, value in enumerate(raw_answers)}
+        if not isinstance(raw_answers, dict):
+            make_json_response(self, {"error": "answers must be an object or a list"}, status=HTTPStatus.BAD_REQUEST)
+            return
+        answers: dict[int, int] = {}
+        try:
+            for question_no, choice in raw_answers.items():
+                choice = int(choice or 0)
+                if not 0 <= choice <= len(OPTION_COLUMNS):
+                    raise ValueError(choice)
+                if choice:
+                    answers[int(question_no)] = choice
+        except (TypeError, ValueError):
+            make_json_response(self, {"error": "answers must map question numbers to choices 1-5"}, status=HTTPStatus.BAD_REQUEST)
+            return
+        user_id = normalize_user_id(str(payload.get("user_id") or ""))
+        result = grade_exam_submission(user_id=user_id, year=year, subject=subject, answers=answers)
+        if result is None:
+            make_json_response(self, {"error": "exam not found"}, status=HTTPStatus.NOT_FOUND)
+            return
+        make_json_response(self, {"ok": True, "user_id": user_id, **result})
+
+    def handle_ox_answers_api(self) -> None:
+        try:
+            content_length = int(self.headers.get("Content-Length") or "0")
+        except ValueError:
+            make_json_response(self, {"error": "invalid content length"}, status=HTTPStatus.BAD_REQUEST)
+            return
+        raw = self.rfile.read(content_length) if content_length > 0 else b"{}"
+        try:
+            payload = json.loads(raw.decode("utf-8"))
+        except (ValueError, UnicodeDecodeError):
+            make_json_response(self, {"error": "invalid json"}, status=HTTPStatus.BAD_REQUEST)
+            return
+        try:
+            year = int(payload.get("year"))
+        except (TypeError, ValueError):
+            make_json_response(self, {"error": "invalid year"}, status=HTTPStatus.BAD_REQUEST)
+            return
+        subject = str(payload.get("subject") or "")
+        if subject not in SUBJECTS:
+            make_json_response(self, {"error": "invalid subject"}, status=HTTPStatus.BAD_REQUEST)
+            return
+        answers = payload.get("answers")
+        if not isinstance(answers, list):
+            make_json_response(self, {"error": "answers must be a list"}, status=HTTPStatus.BAD_REQUEST)
+            return
+        if len(answers) > OX_ANSWER_MAX_ITEMS:
+            make_json_response(
+                self, {"error": f"at most {OX_ANSWER_MAX_ITEMS} answers per request"}, status=HTTPStatus.BAD_REQUEST
+            )
+            return
+        user_id = normalize_user_id(str(payload.get("user_id") or ""))
+        result = record_ox_answers(user_id=user_id, year=year, subject=subject, answers=answers)
+        make_json_response(self, {"ok": True, "user_id": user_id, **result})
+
+    def handle_exam_attempts_api(self, query: str) -> None:
+        params = parse_qs(query)
+        user_id = normalize_user_id((params.get("user_id") or [""])[0])
+        subject = (params.get("subject") or [""])[0]
+        try:
+            year_text = (params.get("year") or [""])[0]
+            year = int(year_text) if year_text else None
+            limit = int((params.get("limit") or [str(EXAM_ATTEMPTS_PAGE_SIZE)])[0] or EXAM_ATTEMPTS_PAGE_SIZE)
+        except ValueError:
+            make_json_response(self, {"error": "invalid year/limit"}, status=HTTPStatus.BAD_REQUEST)
+            return
+        if subject and subject not in SUBJECTS:
+            make_json_response(self, {"error": "invalid subject"}, status=HTTPStatus.BAD_REQUEST)
+            return
+        if limit < 1:
+            make_json_response(self, {"error": "invalid year/limit"}, status=HTTPStatus.BAD_REQUEST)
+            return
+        attempts = fetch_exam_attempts(user_id, year=year, subject=subject, limit=min(limit, EXAM_ATTEMPTS_MAX_PAGE_SIZE))
+        make_json_response(self, {"user_id": user_id, "count": len(attempts), "items": attempts})
 
     def handle_wrong_note_upsert_api(self) -> None:
         try:
@@ -1156,6 +3544,12 @@ class AppHandler(SimpleHTTPRequestHandler):
         source = str(payload.get("source") or NOTE_SOURCE_QUESTION)
         importance = str(payload.get("importance") or "")
         comment = str(payload.get("comment") or "")
+        updated_at = ""
+        if payload.get("updated_at"):
+            updated_at = parse_client_timestamp(payload.get("updated_at"))
+            if not updated_at:
+                make_json_response(self, {"error": "invalid updated_at"}, status=HTTPStatus.BAD_REQUEST)
+                return
         upsert_wrong_note(
             user_id=user_id,
             source=source,
@@ -1164,9 +3558,35 @@ class AppHandler(SimpleHTTPRequestHandler):
             question_no=question_no,
             importance=importance,
             comment=comment,
+            updated_at=updated_at,
         )
         make_json_response(self, {"ok": True, "user_id": user_id})
 
+    def handle_wrong_note_merge_api(self) -> None:
+        try:
+            content_length = int(self.headers.get("Content-Length") or "0")
+        except ValueError:
+            make_json_response(self, {"error": "invalid content length"}, status=HTTPStatus.BAD_REQUEST)
+            return
+        raw = self.rfile.read(content_length) if content_length > 0 else b"{}"
+        try:
+            payload = json.loads(raw.decode("utf-8"))
+        except (ValueError, UnicodeDecodeError):
+            make_json_response(self, {"error": "invalid json"}, status=HTTPStatus.BAD_REQUEST)
+            return
+        notes = payload.get("notes") if isinstance(payload, dict) else None
+        if not isinstance(notes, list):
+            make_json_response(self, {"error": "notes must be a list"}, status=HTTPStatus.BAD_REQUEST)
+            return
+        if len(notes) > WRONG_NOTE_MERGE_MAX_ITEMS:
+            make_json_response(
+                self, {"error": f"at most {WRONG_NOTE_MERGE_MAX_ITEMS} notes per request"}, status=HTTPStatus.BAD_REQUEST
+            )
+            return
+        user_id = normalize_user_id(str(payload.get("user_id") or ""))
+        result = merge_wrong_notes(user_id=user_id, notes=notes)
+        make_json_response(self, {"ok": True, "user_id": user_id, **result})
+
     def handle_notices_api(self, query: str) -> None:
         params = parse_qs(query)
         admin_mode = str((params.get("admin") or [""])[0]).strip() in {"1", "true", "yes"}
@@ -1310,12 +3730,23 @@ class AppHandler(SimpleHTTPRequestHandler):
         make_json_response(self, {"ok": True, **saved})
 
 
+def stop_on_sigterm(signum, frame) -> None:
+    raise KeyboardInterrupt
+
+
 def main() -> None:
-    global NOTICE_ADMIN_KEY
+    global NOTICE_ADMIN_KEY, WRONG_NOTE_BUFFER, QUESTION_STATS_BUFFER
     parser = argparse.ArgumentParser(description="Tax exam local web server")
     parser.add_argument("--host", default="127.0.0.1")
     parser.add_argument("--port", type=int, default=8000)
     parser.add_argument("--notice-admin-key", default="", help="Admin key for posting notices")
+    parser.add_argument(
+        "--write-buffer-ms", type=int, default=0, help="오답노트 쓰기를 모아 저장하는 주기 (기본 0: 요청마다 바로 저장)"
+    )
+    parser.add_argument("--write-buffer-max", type=int, default=200, help="이 개수의 노트가 쌓이면 주기 전에 저장")
+    parser.add_argument(
+        "--stats-flush-ms", type=int, default=2000, help="문항별 정답률 카운터를 모아 저장하는 주기 (0이면 제출마다 바로 저장)"
+    )
     args = parser.parse_args()
     if str(args.notice_admin_key or "").strip():
         NOTICE_ADMIN_KEY = str(args.notice_admin_key).strip()
@@ -1323,6 +3754,16 @@ def main() -> None:
     with sqlite3.connect(DB_PATH) as conn:
         ensure_app_tables(conn)
 
+    if args.write_buffer_ms > 0:
+        WRONG_NOTE_BUFFER = WrongNoteWriteBuffer(
+            interval_seconds=args.write_buffer_ms / 1000, max_pending=args.write_buffer_max
+        )
+        WRONG_NOTE_BUFFER.start()
+    if args.stats_flush_ms > 0:
+        QUESTION_STATS_BUFFER = QuestionStatsBuffer(interval_seconds=args.stats_flush_ms / 1000)
+        QUESTION_STATS_BUFFER.start()
+    signal.signal(signal.SIGTERM, stop_on_sigterm)
+
     server = ThreadingHTTPServer((args.host, args.port), AppHandler)
     print(f"Serving on http://{args.host}:{args.port}")
     try:
@@ -1331,6 +3772,12 @@ def main() -> None:
         pass
     finally:
         server.server_close()
+        if WRONG_NOTE_BUFFER is not None:
+            WRONG_NOTE_BUFFER.close()
+            print(f"wrong-note buffer: {WRONG_NOTE_BUFFER.metrics()}")
+        if QUESTION_STATS_BUFFER is not None:
+            QUESTION_STATS_BUFFER.close()
+            print(f"question-stats buffer: {QUESTION_STATS_BUFFER.metrics()}")
 
 
 if __name__ == "__main__":